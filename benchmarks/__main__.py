@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import argparse
+import sys
+
+from .cases import CASES, MEMORY_CASES, Fixture
+from .harness import BenchmarkResult, MemoryResult, compare, load_results, save_results
+
+DEFAULT_SHAPES = ["10x20", "25x50", "50x100", "100x200", "200x400"]
+
+
+def parse_shape(value: str) -> tuple[int, int]:
+    """Parses a shape in the form of HxW."""
+    try:
+        height, width = (int(part) for part in value.lower().split("x"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Shape must be in the form HxW: {value}")
+    return height, width
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks",
+        description="Benchmarks of the pacman engine hot paths.",
+    )
+    parser.add_argument(
+        "--shapes",
+        nargs="+",
+        type=parse_shape,
+        default=[parse_shape(shape) for shape in DEFAULT_SHAPES],
+        help="Maze shapes to run the benchmarks on, in the form HxW.",
+    )
+    parser.add_argument(
+        "--cases",
+        nargs="+",
+        choices=sorted(CASES),
+        default=list(CASES),
+        help="Benchmarks to run. All of them are run by default.",
+    )
+    parser.add_argument(
+        "--memory",
+        action="store_true",
+        help="Measure memory footprints instead of timings.",
+    )
+    parser.add_argument(
+        "--min-time",
+        type=float,
+        default=0.5,
+        help="Time in seconds to keep sampling every benchmark for.",
+    )
+    parser.add_argument(
+        "--seed", type=int, default=0, help="Seed of the random generators."
+    )
+    parser.add_argument("--output", help="Path to write the results to as JSON.")
+    parser.add_argument(
+        "--baseline", help="Path to the results to compare the current run with."
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.2,
+        help="Relative slowdown against the baseline considered a regression.",
+    )
+    return parser.parse_args(argv)
+
+
+def format_result(result: BenchmarkResult) -> str:
+    return (
+        f"{result.key:<40} median {result.median * 1e3:>11.3f} ms  "
+        f"min {result.min * 1e3:>11.3f} ms  "
+        f"{result.throughput:>14.1f} ops/s  (n={result.repeat})"
+    )
+
+
+def format_memory(result: MemoryResult) -> str:
+    return (
+        f"{result.key:<40} {result.bytes / 2**20:>11.3f} MiB  "
+        f"{result.bytes_per_unit:>11.1f} bytes/cell"
+    )
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+
+    if args.memory:
+        for shape in args.shapes:
+            fixture = Fixture(shape=shape, seed=args.seed)
+            for case in MEMORY_CASES.values():
+                print(format_memory(case(fixture)), flush=True)
+        return 0
+
+    results: list[BenchmarkResult] = []
+    for shape in args.shapes:
+        fixture = Fixture(shape=shape, seed=args.seed)
+        for name in args.cases:
+            result = CASES[name](fixture, min_time=args.min_time)
+            if result is None:
+                continue
+            print(format_result(result), flush=True)
+            results.append(result)
+
+    if args.output:
+        save_results(args.output, results)
+
+    if args.baseline:
+        comparisons = compare(results, load_results(args.baseline), args.tolerance)
+        print()
+        for comparison in comparisons:
+            status = "REGRESSION" if comparison.regression else "ok"
+            print(
+                f"{comparison.key:<40} {comparison.baseline * 1e3:>11.3f} ms -> "
+                f"{comparison.current * 1e3:>11.3f} ms  "
+                f"x{comparison.ratio:.2f}  {status}"
+            )
+        if any(comparison.regression for comparison in comparisons):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,411 @@
+from __future__ import annotations
+
+import tempfile
+from functools import cached_property
+from typing import Callable
+
+import numpy as np
+from pacmanengine import Environment, MazeCorpus, MazeCorpusWriter, VectorEnvironment
+from pacmanengine.algorithms.agent.agent import Agent
+from pacmanengine.algorithms.agent.ghost.a_star import a_star
+from pacmanengine.algorithms.agent.ghost.navigation import NavigationTable
+from pacmanengine.algorithms.maze import (
+    MAZE_ALGORITHMS,
+    CompactLayout,
+    generate_pacmanlike_maze,
+    generate_pacmanlike_mazes,
+    strave_maze,
+)
+from pacmanengine.algorithms.maze.generate import generate_maze
+from pacmanengine.types import Maze, MazeState, Simulation
+from pacmanengine.types.mobs import Action
+from pacmanengine.types.structure import WallType
+
+from .harness import BenchmarkResult, MemoryResult, measure, measure_memory
+
+
+class IdleAgent(Agent):
+    """Pacman agent that never moves, so mazes can be built without
+    hooking the keyboard.
+    """
+
+    def action(self, starting_position: int, maze_state: MazeState) -> Action:
+        return Action.STAY
+
+
+class Fixture:
+    """Mazes and helpers shared by the benchmarks of a single shape.
+    Everything is generated outside of the timed calls.
+
+    Parameters
+    ----------
+    shape : tuple[int, int]
+        Shape of the maze.
+    seed : int
+        Seed of the random generator used to generate mazes and to pick
+        positions and actions.
+    """
+
+    def __init__(self, shape: tuple[int, int], seed: int) -> None:
+        self.shape = shape
+        self.rng = np.random.default_rng(seed)
+        self.layout = generate_pacmanlike_maze(shape, rng=self.rng)
+
+    @cached_property
+    def maze(self) -> np.ndarray:
+        """Maze before the strave pass."""
+        return generate_maze(self.shape, rng=self.rng)
+
+    @cached_property
+    def navigation(self) -> NavigationTable:
+        """Navigation table of the layout."""
+        return Simulation(layout=self.layout).navigation
+
+    @cached_property
+    def floor(self) -> np.ndarray:
+        """Flat indices of the floor cells of the layout."""
+        return np.flatnonzero(self.layout != 1)
+
+    @cached_property
+    def corpus(self) -> MazeCorpus:
+        """Corpus holding the layout as its only maze, written to a
+        temporary directory removed along with the fixture."""
+        self._corpus_directory = tempfile.TemporaryDirectory()
+        with MazeCorpusWriter(self._corpus_directory.name) as writer:
+            writer.add_layout(self.layout, shape=self.shape, seed=0)
+        return MazeCorpus(self._corpus_directory.name)
+
+    def simulation(self) -> Simulation:
+        """Fresh simulation of the layout sharing its navigation table."""
+        return Simulation(layout=self.layout, navigation=self.navigation)
+
+    def random_cells(self, count: int) -> list[int]:
+        """Picks flat indices of random floor cells."""
+        indices = self.rng.integers(len(self.floor), size=count)
+        return self.floor[indices].tolist()
+
+
+def _bench_generate_maze(algorithm: str) -> Callable[..., BenchmarkResult]:
+    def bench(fixture: Fixture, **kwargs) -> BenchmarkResult:
+        return measure(
+            f"generate_maze_{algorithm}",
+            fixture.shape,
+            lambda: generate_maze(fixture.shape, rng=fixture.rng, algorithm=algorithm),
+            **kwargs,
+        )
+
+    return bench
+
+
+def bench_generate_pacmanlike_maze(fixture: Fixture, **kwargs) -> BenchmarkResult:
+    return measure(
+        "generate_pacmanlike_maze",
+        fixture.shape,
+        lambda: generate_pacmanlike_maze(fixture.shape, rng=fixture.rng),
+        **kwargs,
+    )
+
+
+def bench_generate_pacmanlike_mazes(
+    fixture: Fixture, n_mazes: int = 16, **kwargs
+) -> BenchmarkResult:
+    return measure(
+        "generate_pacmanlike_mazes",
+        fixture.shape,
+        lambda: generate_pacmanlike_mazes(n_mazes, fixture.shape, rng=fixture.rng),
+        ops=n_mazes,
+        **kwargs,
+    )
+
+
+def bench_strave_maze(fixture: Fixture, **kwargs) -> BenchmarkResult:
+    buffer = fixture.maze.copy()
+
+    def setup() -> None:
+        np.copyto(buffer, fixture.maze)
+
+    return measure(
+        "strave_maze",
+        fixture.shape,
+        lambda: strave_maze(buffer, rng=fixture.rng),
+        setup,
+        **kwargs,
+    )
+
+
+def bench_compact_layout(fixture: Fixture, **kwargs) -> BenchmarkResult:
+    return measure(
+        "compact_layout",
+        fixture.shape,
+        lambda: CompactLayout.from_layout(fixture.layout),
+        **kwargs,
+    )
+
+
+def bench_wall_type_infer(fixture: Fixture, **kwargs) -> BenchmarkResult:
+    layout = fixture.layout
+    walls = np.argwhere(layout == 1).tolist()
+
+    def call() -> None:
+        for y, x in walls:
+            WallType.infer(layout=layout, x=x, y=y)
+
+    return measure("wall_type_infer", fixture.shape, call, ops=len(walls), **kwargs)
+
+
+def bench_wall_type_infer_grid(fixture: Fixture, **kwargs) -> BenchmarkResult:
+    return measure(
+        "wall_type_infer_grid",
+        fixture.shape,
+        lambda: WallType.infer_grid(fixture.layout),
+        **kwargs,
+    )
+
+
+def bench_maze_init(fixture: Fixture, **kwargs) -> BenchmarkResult:
+    agent = IdleAgent()
+    simulations: list[Simulation] = []
+
+    def setup() -> None:
+        simulations.append(fixture.simulation())
+
+    return measure(
+        "maze_init",
+        fixture.shape,
+        lambda: Maze(
+            shape=fixture.shape, simulation=simulations.pop(), pacman_agent=agent
+        ),
+        setup,
+        **kwargs,
+    )
+
+
+def memory_maze(fixture: Fixture) -> MemoryResult:
+    simulation = fixture.simulation()
+    wall_types = WallType.infer_grid(fixture.layout)
+    return measure_memory(
+        "maze",
+        fixture.shape,
+        lambda: Maze(
+            shape=fixture.shape,
+            simulation=simulation,
+            wall_types=wall_types,
+            pacman_agent=IdleAgent(),
+        ),
+        units=fixture.layout.size,
+    )
+
+
+def bench_corpus_compact_layout(fixture: Fixture, **kwargs) -> BenchmarkResult:
+    corpus = fixture.corpus
+    return measure(
+        "corpus_compact_layout",
+        fixture.shape,
+        lambda: corpus.compact_layout(0),
+        **kwargs,
+    )
+
+
+def bench_navigation_table(fixture: Fixture, **kwargs) -> BenchmarkResult:
+    return measure(
+        "navigation_table",
+        fixture.shape,
+        lambda: NavigationTable(layout=fixture.layout),
+        **kwargs,
+    )
+
+
+def bench_navigation_table_compact(fixture: Fixture, **kwargs) -> BenchmarkResult:
+    return measure(
+        "navigation_table_compact",
+        fixture.shape,
+        lambda: NavigationTable(layout=fixture.layout, compact=True),
+        **kwargs,
+    )
+
+
+def memory_navigation_table(fixture: Fixture, n_pairs: int = 256) -> MemoryResult:
+    pairs = list(zip(fixture.random_cells(n_pairs), fixture.random_cells(n_pairs)))
+
+    def call() -> NavigationTable:
+        table = NavigationTable(layout=fixture.layout, compact=True)
+        for source, target in pairs:
+            table.next_cell(source, target)
+        return table
+
+    return measure_memory(
+        "navigation_table", fixture.shape, call, units=fixture.layout.size
+    )
+
+
+def bench_a_star(fixture: Fixture, n_pairs: int = 16, **kwargs) -> BenchmarkResult:
+    pairs = list(zip(fixture.random_cells(n_pairs), fixture.random_cells(n_pairs)))
+    grid = fixture.layout
+
+    def call() -> None:
+        for start, goal in pairs:
+            a_star(start=start, goal=goal, grid=grid)
+
+    return measure("a_star", fixture.shape, call, ops=n_pairs, **kwargs)
+
+
+def _bench_ghost_action(
+    name: str, fixture: Fixture, navigation: bool, **kwargs
+) -> BenchmarkResult:
+    simulation = fixture.simulation()
+    maze_state = simulation.state()
+    if not navigation:
+        maze_state.navigation = None
+    positions = maze_state.ghost_cells
+
+    def call() -> None:
+        for agent, position in zip(simulation.ghost_agents, positions):
+            agent.action(starting_position=position, maze_state=maze_state)
+
+    return measure(name, fixture.shape, call, ops=len(positions), **kwargs)
+
+
+def bench_ghost_action(fixture: Fixture, **kwargs) -> BenchmarkResult:
+    return _bench_ghost_action("ghost_action", fixture, navigation=True, **kwargs)
+
+
+def bench_ghost_action_a_star(fixture: Fixture, **kwargs) -> BenchmarkResult:
+    return _bench_ghost_action(
+        "ghost_action_a_star", fixture, navigation=False, **kwargs
+    )
+
+
+def bench_environment_step(
+    fixture: Fixture, n_steps: int = 20, **kwargs
+) -> BenchmarkResult:
+    environment = Environment(shape=fixture.shape)
+    actions = [Action(action) for action in fixture.rng.integers(1, 5, size=n_steps)]
+
+    def setup() -> None:
+        environment.simulation = fixture.simulation()
+
+    def call() -> None:
+        for action in actions:
+            environment.step(action)
+
+    return measure(
+        "environment_step", fixture.shape, call, setup, ops=n_steps, **kwargs
+    )
+
+
+def bench_vector_environment_step(
+    fixture: Fixture, num_envs: int = 64, n_steps: int = 20, **kwargs
+) -> BenchmarkResult | None:
+    # Episodes end every few dozen steps and every reset generates a fresh
+    # maze, which takes seconds from 50x100 on, so larger shapes are skipped.
+    if fixture.shape[0] * fixture.shape[1] > 20 * 40:
+        return None
+    environment = VectorEnvironment(num_envs=num_envs, shape=fixture.shape)
+    actions = fixture.rng.integers(1, 6, size=(n_steps, num_envs))
+
+    def call() -> None:
+        for step_actions in actions:
+            environment.step(step_actions)
+
+    result = measure(
+        "vector_environment_step",
+        fixture.shape,
+        call,
+        ops=num_envs * n_steps,
+        **kwargs,
+    )
+    environment.close()
+    return result
+
+
+def bench_simulation_run(
+    fixture: Fixture, n_steps: int = 200, **kwargs
+) -> BenchmarkResult:
+    actions = [Action(action) for action in fixture.rng.integers(1, 6, size=n_steps)]
+    simulations: list[Simulation] = []
+
+    def setup() -> None:
+        simulation = fixture.simulation()
+        # Enough hearts for the game not to be over while it is measured.
+        simulation.hearts = n_steps * len(simulation.ghost_agents) + 1
+        simulations.append(simulation)
+
+    return measure(
+        "simulation_run",
+        fixture.shape,
+        lambda: simulations.pop().run(actions),
+        setup,
+        ops=n_steps,
+        **kwargs,
+    )
+
+
+def bench_observation(fixture: Fixture, **kwargs) -> BenchmarkResult:
+    simulation = fixture.simulation()
+    previous = simulation.state()
+    simulation.step(Action.STAY)
+    maze_state = simulation.state()
+    buffer = np.empty(maze_state.observation_shape, dtype=np.float32)
+    maze_state.observation(out=buffer)
+
+    return measure(
+        "observation",
+        fixture.shape,
+        lambda: maze_state.observation(out=buffer, previous=previous),
+        **kwargs,
+    )
+
+
+def bench_environment_restore(fixture: Fixture, **kwargs) -> BenchmarkResult:
+    environment = Environment(shape=fixture.shape)
+    environment.simulation = fixture.simulation()
+    snapshot = environment.snapshot()
+    return measure(
+        "environment_restore",
+        fixture.shape,
+        lambda: environment.restore(snapshot),
+        **kwargs,
+    )
+
+
+def bench_environment_reset(fixture: Fixture, **kwargs) -> BenchmarkResult:
+    environment = Environment(shape=fixture.shape)
+    return measure("environment_reset", fixture.shape, environment.reset, **kwargs)
+
+
+CASES: dict[str, Callable[..., BenchmarkResult | None]] = {
+    **{
+        f"generate_maze_{algorithm}": _bench_generate_maze(algorithm)
+        for algorithm in MAZE_ALGORITHMS
+    },
+    "generate_pacmanlike_maze": bench_generate_pacmanlike_maze,
+    "generate_pacmanlike_mazes": bench_generate_pacmanlike_mazes,
+    "strave_maze": bench_strave_maze,
+    "compact_layout": bench_compact_layout,
+    "corpus_compact_layout": bench_corpus_compact_layout,
+    "wall_type_infer": bench_wall_type_infer,
+    "wall_type_infer_grid": bench_wall_type_infer_grid,
+    "maze_init": bench_maze_init,
+    "navigation_table": bench_navigation_table,
+    "navigation_table_compact": bench_navigation_table_compact,
+    "a_star": bench_a_star,
+    "ghost_action": bench_ghost_action,
+    "ghost_action_a_star": bench_ghost_action_a_star,
+    "environment_step": bench_environment_step,
+    "simulation_run": bench_simulation_run,
+    "vector_environment_step": bench_vector_environment_step,
+    "observation": bench_observation,
+    "environment_reset": bench_environment_reset,
+    "environment_restore": bench_environment_restore,
+}
+"""Benchmarks by name. Every benchmark takes a fixture of the maze shape
+along with keyword arguments of `measure` and returns its result, or None
+if it does not apply to the shape."""
+
+MEMORY_CASES: dict[str, Callable[[Fixture], MemoryResult]] = {
+    "maze": memory_maze,
+    "navigation_table": memory_navigation_table,
+}
+"""Memory benchmarks by name. Every benchmark takes a fixture of the maze
+shape and returns the memory retained by the object it builds. The
+simulation and other inputs are built beforehand and are not counted."""
@@ -0,0 +1,293 @@
+from __future__ import annotations
+
+import gc
+import json
+import platform
+import statistics
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable
+
+import numpy as np
+
+
+@dataclass
+class BenchmarkResult:
+    """Timings of a single benchmark on a single maze shape.
+
+    Attributes
+    ----------
+    name : str
+        Name of the benchmark.
+    shape : tuple[int, int]
+        Shape of the maze in the form of (H, W).
+    repeat : int
+        Number of timed calls.
+    ops : int
+        Number of operations done by a single call, e.g. steps of the
+        environment. Used to calculate the throughput.
+    min, median, mean, stdev : float
+        Statistics of the call time in seconds.
+    """
+
+    name: str
+    shape: tuple[int, int]
+    repeat: int
+    ops: int
+    min: float
+    median: float
+    mean: float
+    stdev: float
+
+    @property
+    def key(self) -> str:
+        """Identifier of the result used to match it with the baseline."""
+        return f"{self.name}[{self.shape[0]}x{self.shape[1]}]"
+
+    @property
+    def throughput(self) -> float:
+        """Operations per second based on the median call time."""
+        return self.ops / self.median if self.median > 0 else float("inf")
+
+
+@dataclass
+class MemoryResult:
+    """Memory retained by an object built on a single maze shape.
+
+    Attributes
+    ----------
+    name : str
+        Name of the benchmark.
+    shape : tuple[int, int]
+        Shape of the maze in the form of (H, W).
+    bytes : int
+        Number of bytes allocated by the call and still alive after it.
+    units : int
+        Number of units the object consists of, e.g. tiles of the maze.
+    """
+
+    name: str
+    shape: tuple[int, int]
+    bytes: int
+    units: int
+
+    @property
+    def key(self) -> str:
+        """Identifier of the result."""
+        return f"{self.name}[{self.shape[0]}x{self.shape[1]}]"
+
+    @property
+    def bytes_per_unit(self) -> float:
+        """Retained bytes per unit of the object."""
+        return self.bytes / self.units if self.units else float("inf")
+
+
+@dataclass
+class Comparison:
+    """Result compared against the baseline.
+
+    Attributes
+    ----------
+    key : str
+        Identifier of the result, see `BenchmarkResult.key`.
+    baseline : float
+        Median call time of the baseline in seconds.
+    current : float
+        Median call time of the current run in seconds.
+    ratio : float
+        Ratio of the current time to the baseline time.
+    regression : bool
+        Whether the ratio exceeds the tolerance.
+    """
+
+    key: str
+    baseline: float
+    current: float
+    ratio: float
+    regression: bool
+
+
+def measure(
+    name: str,
+    shape: tuple[int, int],
+    call: Callable[[], object],
+    setup: Callable[[], object] | None = None,
+    ops: int = 1,
+    min_time: float = 0.5,
+    min_repeat: int = 3,
+    max_repeat: int = 1000,
+) -> BenchmarkResult:
+    """Times the call until enough samples are collected.
+
+    Parameters
+    ----------
+    name : str
+        Name of the benchmark.
+    shape : tuple[int, int]
+        Shape of the maze.
+    call : Callable[[], object]
+        Function to time.
+    setup : Callable[[], object], optional
+        Function run before every call, excluded from the timings.
+    ops : int, default=1
+        Number of operations done by a single call.
+    min_time : float, default=0.5
+        Total time in seconds to keep sampling for.
+    min_repeat : int, default=3
+        Minimum number of timed calls. Calls that alone take longer than
+        `min_time` are timed once.
+    max_repeat : int, default=1000
+        Maximum number of timed calls.
+
+    Returns
+    -------
+    BenchmarkResult
+        Timings of the call.
+    """
+    samples: list[float] = []
+    while len(samples) < max_repeat:
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        call()
+        samples.append(time.perf_counter() - start)
+        if sum(samples) >= min_time and (
+            len(samples) >= min_repeat or samples[0] >= min_time
+        ):
+            break
+    return BenchmarkResult(
+        name=name,
+        shape=shape,
+        repeat=len(samples),
+        ops=ops,
+        min=min(samples),
+        median=statistics.median(samples),
+        mean=statistics.fmean(samples),
+        stdev=statistics.stdev(samples) if len(samples) > 1 else 0.0,
+    )
+
+
+def measure_memory(
+    name: str,
+    shape: tuple[int, int],
+    call: Callable[[], object],
+    units: int = 1,
+) -> MemoryResult:
+    """Measures the memory retained by the object returned from the call.
+
+    Parameters
+    ----------
+    name : str
+        Name of the benchmark.
+    shape : tuple[int, int]
+        Shape of the maze.
+    call : Callable[[], object]
+        Function that builds the object. Anything it allocates and does not
+        keep reachable from the returned object is not counted. It is called
+        once beforehand, so lazily filled caches are not counted either.
+    units : int, default=1
+        Number of units the object consists of.
+
+    Returns
+    -------
+    MemoryResult
+        Retained memory of the object.
+    """
+    call()
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        result = call()
+        gc.collect()
+        retained = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+    del result
+    return MemoryResult(name=name, shape=shape, bytes=retained, units=units)
+
+
+def save_results(path: str | Path, results: list[BenchmarkResult]) -> None:
+    """Writes results along with the information about the machine.
+
+    Parameters
+    ----------
+    path : str | Path
+        Path to the JSON file.
+    results : list[BenchmarkResult]
+        Results of the benchmarks.
+    """
+    document = {
+        "created": datetime.now(timezone.utc).isoformat(),
+        "machine": {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "processor": platform.processor(),
+        },
+        "results": [asdict(result) for result in results],
+    }
+    Path(path).write_text(json.dumps(document, indent=2))
+
+
+def load_results(path: str | Path) -> list[BenchmarkResult]:
+    """Reads results written by `save_results`.
+
+    Parameters
+    ----------
+    path : str | Path
+        Path to the JSON file.
+
+    Returns
+    -------
+    list[BenchmarkResult]
+        Results of the benchmarks.
+    """
+    document = json.loads(Path(path).read_text())
+    return [
+        BenchmarkResult(**{**result, "shape": tuple(result["shape"])})
+        for result in document["results"]
+    ]
+
+
+def compare(
+    results: list[BenchmarkResult],
+    baseline: list[BenchmarkResult],
+    tolerance: float = 0.2,
+) -> list[Comparison]:
+    """Compares median times of the results against the baseline.
+
+    Parameters
+    ----------
+    results : list[BenchmarkResult]
+        Results of the current run.
+    baseline : list[BenchmarkResult]
+        Results of the baseline run.
+    tolerance : float, default=0.2
+        Relative slowdown considered to be a regression.
+
+    Returns
+    -------
+    list[Comparison]
+        Comparisons of the results present in both runs.
+    """
+    baseline_by_key = {result.key: result for result in baseline}
+    comparisons = []
+    for result in results:
+        reference = baseline_by_key.get(result.key)
+        if reference is None:
+            continue
+        ratio = result.median / reference.median if reference.median > 0 else 1.0
+        comparisons.append(
+            Comparison(
+                key=result.key,
+                baseline=reference.median,
+                current=result.median,
+                ratio=ratio,
+                regression=ratio > 1 + tolerance,
+            )
+        )
+    return comparisons
@@ -2,7 +2,6 @@ import keyboard
 from pacmanengine.algorithms.agent.agent import Agent
 from pacmanengine.types.maze_state import MazeState
 from pacmanengine.types.mobs import Action
-from pacmanengine.types.position import Position
 
 
 class PacmanAgent(Agent):
@@ -22,5 +21,5 @@ class PacmanAgent(Agent):
     def set_next_action(self, action: Action) -> None:
         self.next_action = action
 
-    def action(self, starting_position: Position, maze_state: MazeState) -> Action:
+    def action(self, starting_position: int, maze_state: MazeState) -> Action:
         return self.get_next_action()
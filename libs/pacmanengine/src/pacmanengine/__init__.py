@@ -1,3 +1,27 @@
+from pacmanengine.async_vector_environment import AsyncVectorEnvironment
 from pacmanengine.environment import Environment, EnvironmentStep
+from pacmanengine.episode_replay import EpisodeReplay
+from pacmanengine.events import EventBus, EventType
+from pacmanengine.instrumentation import Instrumentation, instrumentation
+from pacmanengine.maze_corpus import MazeCorpus, MazeCorpusWriter
+from pacmanengine.maze_pool import MazePool
+from pacmanengine.replay_buffer import ReplayBatch, ReplayBuffer
+from pacmanengine.vector_environment import VectorEnvironment, VectorEnvironmentStep
 
-__all__ = [EnvironmentStep, Environment]
+__all__ = [
+    AsyncVectorEnvironment,
+    EnvironmentStep,
+    Environment,
+    EpisodeReplay,
+    EventBus,
+    EventType,
+    Instrumentation,
+    instrumentation,
+    MazeCorpus,
+    MazeCorpusWriter,
+    MazePool,
+    ReplayBatch,
+    ReplayBuffer,
+    VectorEnvironment,
+    VectorEnvironmentStep,
+]
@@ -1,8 +1,12 @@
+from __future__ import annotations
+
 from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING
 
 from pacmanengine.types.maze_state import MazeState
-from pacmanengine.types.mobs import Action
-from pacmanengine.types.position import Position
+
+if TYPE_CHECKING:
+    from pacmanengine.types.mobs import Action
 
 
 class Agent(ABC):
@@ -11,14 +15,15 @@ class Agent(ABC):
     """
 
     @abstractmethod
-    def action(self, starting_position: Position, maze_state: MazeState) -> Action:
+    def action(self, starting_position: int, maze_state: MazeState) -> Action:
         """Predict the next action of the mob to miximize its
         reward.
 
         Parameters
         ----------
-        starting_position : Position
-            Position where agent currently resides.
+        starting_position : int
+            Flat index `y * ncols + x` of the cell where agent currently
+            resides, see `Position.cell`.
         maze_state : MazeState
             State of the maze on the current step of prediction.
 
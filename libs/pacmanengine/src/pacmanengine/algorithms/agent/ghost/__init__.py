@@ -1,6 +1,7 @@
 from pacmanengine.algorithms.agent.ghost.blinky import BlinkyAgent
 from pacmanengine.algorithms.agent.ghost.clyde import ClydeAgent
 from pacmanengine.algorithms.agent.ghost.inky import InkyAgent
+from pacmanengine.algorithms.agent.ghost.navigation import NavigationTable
 from pacmanengine.algorithms.agent.ghost.pinky import PinkyAgent
 
-__all__ = [BlinkyAgent, ClydeAgent, InkyAgent, PinkyAgent]
+__all__ = [BlinkyAgent, ClydeAgent, InkyAgent, NavigationTable, PinkyAgent]
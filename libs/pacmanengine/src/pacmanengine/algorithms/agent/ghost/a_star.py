@@ -3,47 +3,56 @@ from heapq import heappop, heappush
 import numpy as np
 
 
-def manhattan_distance(point_A: tuple[int, int], point_B: tuple[int, int]) -> int:
-    """Calculates Manhattan distance from the point_A to the point_B.
+def manhattan_distance(cell_A: int, cell_B: int, ncols: int) -> int:
+    """Calculates Manhattan distance from the cell_A to the cell_B.
 
     Parameters
     ----------
-    point_A, point_B : tuple[int, int]
-        Points between which to calculate the distance.
+    cell_A, cell_B : int
+        Flat indices `y * ncols + x` of the cells between which to calculate
+        the distance.
+    ncols : int
+        Number of columns of the grid.
 
     Returns
     -------
     int
         Distance.
     """
-    return abs(point_A[0] - point_B[0]) + abs(point_A[1] - point_B[1])
+    y_A, x_A = divmod(cell_A, ncols)
+    y_B, x_B = divmod(cell_B, ncols)
+    return abs(y_A - y_B) + abs(x_A - x_B)
 
 
-def a_star(
-    start: tuple[int, int], goal: tuple[int, int], grid: np.ndarray
-) -> list[tuple[int, int]] | None:
+def a_star(start: int, goal: int, grid: np.ndarray) -> list[int] | None:
     """
     A* algorithm to find the shortest path in a 2D grid with obstacles.
 
     Parameters
     ----------
-    start : tuple[int, int]
-        Start point in the format (y, x).
-    goal : tuple[int, int]
-        Point where you want to go in the format (y, x).
+    start : int
+        Flat index `y * ncols + x` of the start cell.
+    goal : int
+        Flat index of the cell where you want to go.
     grid : np.ndarray
         Layout of the maze, where 1 is a wall.
 
     Returns
     -------
-    list[tuple[int, int]] | None
-        The shortest path from start to goal (as a list of points),
-        or None if no path exists. Points are in the format (y, x).
+    list[int] | None
+        The shortest path from start to goal (as a list of flat cell
+        indices), or None if no path exists.
+
+    Notes
+    -----
+    Cells are plain integers, so the search hashes and compares them
+    without building coordinate tuples. Ordering cells by index is the same
+    as ordering (y, x) points, so ties are broken as on the points.
     """
-    directions = [(0, 1), (0, -1), (1, 0), (-1, 0)]
+    cols = grid.shape[1]
+    walls = (grid.ravel() == 1).tolist()
+    goal_y, goal_x = divmod(goal, cols)
 
-    rows = len(grid)
-    cols = len(grid[0])
     open_set = []
     heappush(open_set, (0, start))
     g_score = {start: 0}
@@ -57,41 +66,51 @@ def a_star(
             return reconstruct_path(came_from, current)
 
         visited.add(current)
-        for direction in directions:
-            neighbor = (current[0] + direction[0], current[1] + direction[1])
-            if (
-                0 <= neighbor[0] < rows
-                and 0 <= neighbor[1] < cols
-                and grid[neighbor[0]][neighbor[1]] != 1
-                and neighbor not in visited
-            ):
-                tentative_g_score = g_score[current] + 1
-                if neighbor not in g_score or tentative_g_score < g_score[neighbor]:
-                    came_from[neighbor] = current
-                    g_score[neighbor] = tentative_g_score
-                    f_cost = tentative_g_score + manhattan_distance(neighbor, goal)
-                    heappush(open_set, (f_cost, neighbor))
+        current_y, current_x = divmod(current, cols)
+        # Same order as (0, 1), (0, -1), (1, 0), (-1, 0) in (dY, dX).
+        neighbors = []
+        if current_x < cols - 1:
+            neighbors.append(current + 1)
+        if current_x > 0:
+            neighbors.append(current - 1)
+        if current + cols < len(walls):
+            neighbors.append(current + cols)
+        if current_y > 0:
+            neighbors.append(current - cols)
+
+        tentative_g_score = g_score[current] + 1
+        for neighbor in neighbors:
+            if walls[neighbor] or neighbor in visited:
+                continue
+            if neighbor not in g_score or tentative_g_score < g_score[neighbor]:
+                came_from[neighbor] = current
+                g_score[neighbor] = tentative_g_score
+                neighbor_y, neighbor_x = divmod(neighbor, cols)
+                f_cost = (
+                    tentative_g_score
+                    + abs(neighbor_y - goal_y)
+                    + abs(neighbor_x - goal_x)
+                )
+                heappush(open_set, (f_cost, neighbor))
 
     return None
 
 
-def reconstruct_path(
-    came_from: dict, current: tuple[int, int]
-) -> list[tuple[int, int]]:
+def reconstruct_path(came_from: dict[int, int], current: int) -> list[int]:
     """
     Reconstruct the path from start to goal.
 
     Parameters
     ----------
-    came_from : dict
-        A dictionary with the backtrace from each point to the previous point.
-    current : tuple[int, int]
-        The current point (goal) to start backtracking from.
+    came_from : dict[int, int]
+        A dictionary with the backtrace from each cell to the previous cell.
+    current : int
+        The current cell (goal) to start backtracking from.
 
     Returns
     -------
-    list
-        The shortest path as a list of points.
+    list[int]
+        The shortest path as a list of cells.
     """
     path = [current]
     while current in came_from:
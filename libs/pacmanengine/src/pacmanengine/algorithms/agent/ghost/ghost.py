@@ -3,7 +3,9 @@ from abc import abstractmethod
 import numpy as np
 from pacmanengine.algorithms.agent.agent import Agent
 from pacmanengine.algorithms.agent.ghost.a_star import a_star
+from pacmanengine.algorithms.agent.ghost.navigation import NavigationTable
 from pacmanengine.algorithms.agent.ghost.state import GhostState
+from pacmanengine.instrumentation import instrumentation
 from pacmanengine.types.maze_state import MazeState
 from pacmanengine.types.mobs import Action
 from pacmanengine.types.position import Position
@@ -12,8 +14,17 @@ from pacmanengine.types.position import Position
 class GhostAgent(Agent):
     """Base class for all ghost agents. Provides realization of
     pathfinding algorithm.
+
+    Attributes
+    ----------
+    scatter_intervals : tuple[tuple[int, int], ...]
+        Half-open `[start, stop)` ranges of the step counter during
+        which the ghost scatters to its home position. Outside of them
+        the ghost chases Pacman.
     """
 
+    scatter_intervals: tuple[tuple[int, int], ...] = ()
+
     def __init__(self, state: GhostState, counter: int = 0) -> None:
         super(GhostAgent, self).__init__()
         self.state = state
@@ -30,114 +41,135 @@ class GhostAgent(Agent):
     @property
     @abstractmethod
     def home_position(self) -> Position:
-        """Home position of the ghost."""
+        """Home position of the ghost. Subclasses usually define it as a
+        class attribute, so it is not rebuilt on every step."""
         raise NotImplementedError(
             "This property needs to be implemented in the child class."
         )
 
-    @abstractmethod
-    def choose_ending_position(
-        self, ghost_position: Position, maze_state: MazeState
-    ) -> Position:
+    def is_scattering(self) -> bool:
+        """Checks whether the ghost scatters to its home position on the
+        current step.
+
+        Returns
+        -------
+        bool
+            True if the step counter lies within one of the
+            `scatter_intervals`, otherwise False.
+        """
+        return any(
+            start <= self.counter < stop for start, stop in self.scatter_intervals
+        )
+
+    def choose_ending_position(self, ghost_position: int, maze_state: MazeState) -> int:
         """Decides which tile the ghost will target based on the
         movement of other ghosts and pacman position.
 
         Parameters
         ----------
-        layout : np.ndarray
-            Layout of the maze.
-        ghost_position : Position
-            Current position of the agent's ghost.
+        ghost_position : int
+            Flat index of the cell of the agent's ghost.
         maze_state : MazeState
             State of the Maze, along with positions of individual
             ghosts and Pacman.
 
         Returns
         -------
-        Position
-            Position in which ghost needs to be in.
+        int
+            Flat index of the cell in which ghost needs to be in.
+
+        Notes
+        -----
+        By default ghost scatters to its home position while
+        `is_scattering` holds and chases Pacman otherwise. Override
+        this method to implement a different targeting strategy.
         """
-        raise NotImplementedError(
-            "This method needs to be implemented in the child class."
-        )
+        if self.is_scattering():
+            self.setGhostState(state=GhostState.SCATTER)
+            return self.home_position.cell(maze_state.ncols)
+        self.setGhostState(state=GhostState.CHASE)
+        return maze_state.pacman_cell
 
     def _find_probable_positions(
-        self, current_position: Position, layout: np.ndarray
-    ) -> list[Position]:
+        self, current_position: int, layout: np.ndarray
+    ) -> list[int]:
         """Algorithm for extract all possible ways to go from the current position.
 
         Parameters
         ----------
-        current_position : Position
-            Current cell where ghost resides.
+        current_position : int
+            Flat index of the cell where ghost resides.
         layout : np.ndarray
             Layout of the maze.
 
         Returns
         -------
-        list[Position]
-            List of positions where a Ghost can go.
+        list[int]
+            Flat indices of the cells where a Ghost can go.
         """
-        min_x, max_x = 0, layout.shape[1] - 1
-        min_y, max_y = 0, layout.shape[0] - 1
-        probable_positions: list[Position] = []
-
-        if current_position.pos_x > min_x:
-            probable_positions.append(
-                Position(pos_x=current_position.pos_x - 1, pos_y=current_position.pos_y)
-            )
-        if current_position.pos_x < max_x:
-            probable_positions.append(
-                Position(pos_x=current_position.pos_x + 1, pos_y=current_position.pos_y)
-            )
-        if current_position.pos_y > min_y:
-            probable_positions.append(
-                Position(pos_x=current_position.pos_x, pos_y=current_position.pos_y - 1)
-            )
-        if current_position.pos_y < max_y:
-            probable_positions.append(
-                Position(pos_x=current_position.pos_x, pos_y=current_position.pos_y + 1)
-            )
+        nrows, ncols = layout.shape
+        pos_y, pos_x = divmod(current_position, ncols)
+        probable_positions: list[int] = []
+
+        if pos_x > 0:
+            probable_positions.append(current_position - 1)
+        if pos_x < ncols - 1:
+            probable_positions.append(current_position + 1)
+        if pos_y > 0:
+            probable_positions.append(current_position - ncols)
+        if pos_y < nrows - 1:
+            probable_positions.append(current_position + ncols)
 
         return probable_positions
 
     def choose_next_position(
-        self, current_position: Position, ending_position: Position, layout: np.ndarray
-    ) -> Position:
+        self,
+        current_position: int,
+        ending_position: int,
+        layout: np.ndarray,
+        navigation: NavigationTable | None = None,
+    ) -> int:
         """Choses the next position to go into based on provided score matrix.
 
         Parameters
         ----------
-        current_position : Position
-            Current position where the ghost resides.
-        ending_position : Position
-            Ending position where ghost is heading.
+        current_position : int
+            Flat index of the cell where the ghost resides.
+        ending_position : int
+            Flat index of the cell where ghost is heading.
         layout : np.ndarray
             Layout of the maze
+        navigation : NavigationTable, optional
+            Precomputed shortest paths of the maze. If provided, the next
+            position is looked up in it instead of searching the path.
 
         Returns
         -------
-        Position
-            Next position to go into.
+        int
+            Flat index of the next cell to go into. Ghost stays in place if
+            the ending position is unreachable.
         """
-        next_y, next_x = a_star(
-            start=(current_position.pos_y, current_position.pos_x),
-            goal=(ending_position.pos_y, ending_position.pos_x),
-            layout=layout,
-        )
-        return Position(pos_x=next_x, pos_y=next_y)
+        if navigation is not None:
+            return navigation.next_cell(source=current_position, target=ending_position)
+
+        path = a_star(start=current_position, goal=ending_position, grid=layout)
+        if path is None or len(path) < 2:
+            return current_position
+        return path[1]
 
     def position_to_action(
-        self, current_position: Position, next_position: Position
+        self, current_position: int, next_position: int, ncols: int
     ) -> Action:
         """Converts transition from one position to another into the action.
 
         Parameters
         ----------
-        current_position : Position
-            Where ghost resides now.
-        next_position : Position
-            Where ghost needs to go.
+        current_position : int
+            Flat index of the cell where ghost resides now.
+        next_position : int
+            Flat index of the cell where ghost needs to go.
+        ncols : int
+            Number of columns of the maze.
 
         Returns
         -------
@@ -145,26 +177,32 @@ class GhostAgent(Agent):
             Action that needs to be taken by the ghost to move from
             current position to the next position.
         """
-        if current_position.pos_x - next_position.pos_x == -1:
+        delta = next_position - current_position
+        if delta == 1:
             return Action.MOVE_RIGHT
-        if current_position.pos_x - next_position.pos_x == 1:
+        if delta == -1:
             return Action.MOVE_LEFT
-        if current_position.pos_y - next_position.pos_y == -1:
+        if delta == ncols:
             return Action.MOVE_DOWN
-        if current_position.pos_y - next_position.pos_y == 1:
+        if delta == -ncols:
             return Action.MOVE_UP
         return Action.STAY
 
-    def action(self, starting_position: Position, maze_state: MazeState) -> Action:
-        ending_position = self.choose_ending_position(
-            ghost_position=starting_position, maze_state=maze_state
-        )
-        next_position = self.choose_next_position(
-            current_position=starting_position,
-            ending_position=ending_position,
-            layout=maze_state.layout,
-        )
-        self.increment_counter()
-        return self.position_to_action(
-            current_position=starting_position, next_position=next_position
-        )
+    def action(self, starting_position: int, maze_state: MazeState) -> Action:
+        with instrumentation.phase("ghost_agent.action"):
+            ending_position = self.choose_ending_position(
+                ghost_position=starting_position, maze_state=maze_state
+            )
+            with instrumentation.phase("ghost_agent.pathfinding"):
+                next_position = self.choose_next_position(
+                    current_position=starting_position,
+                    ending_position=ending_position,
+                    layout=maze_state.walls,
+                    navigation=maze_state.navigation,
+                )
+            self.increment_counter()
+            return self.position_to_action(
+                current_position=starting_position,
+                next_position=next_position,
+                ncols=maze_state.ncols,
+            )
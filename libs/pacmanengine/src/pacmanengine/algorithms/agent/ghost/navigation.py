@@ -0,0 +1,523 @@
+from __future__ import annotations
+
+from array import array
+from collections import OrderedDict
+from heapq import heappop, heappush
+
+import numpy as np
+
+UNREACHABLE: int = np.iinfo(np.int32).max // 4
+"""Distance between cells that are not connected."""
+
+# Neighbour deltas in the format (dY, dX): up, down, left, right.
+_neighbour_deltas = np.array([(-1, 0), (1, 0), (0, -1), (0, 1)], dtype=np.int64)
+_neighbour_steps: list[list[int]] = _neighbour_deltas.tolist()
+
+
+def _all_pairs_distances(
+    n_nodes: int, sources: np.ndarray, targets: np.ndarray, weights: np.ndarray
+) -> np.ndarray:
+    """Calculates shortest distances between all nodes of a graph with
+    positive integer edge weights.
+
+    Parameters
+    ----------
+    n_nodes : int
+        Number of nodes in the graph.
+    sources, targets : np.ndarray
+        Ends of the directed edges, shape (E,).
+    weights : np.ndarray
+        Lengths of the edges, shape (E,).
+
+    Returns
+    -------
+    np.ndarray
+        Matrix of distances of shape (n_nodes, n_nodes). Unreachable pairs
+        are equal to `UNREACHABLE`.
+
+    Notes
+    -----
+    Runs Bellman-Ford from all nodes at once. Only the (source, node) pairs
+    whose distance improved in the previous round are relaxed, so the total
+    work stays close to a breadth-first search from every node.
+    """
+    distances = np.full((n_nodes, n_nodes), UNREACHABLE, dtype=np.int32)
+    np.fill_diagonal(distances, 0)
+    flat_distances = distances.reshape(-1)
+
+    order = np.argsort(sources, kind="stable")
+    targets, weights = targets[order], weights[order]
+    degrees = np.bincount(sources, minlength=n_nodes)
+    first_edges = np.concatenate([[0], np.cumsum(degrees)[:-1]])
+
+    # Last writer of every pair, used to drop duplicates without sorting.
+    writers = np.empty(n_nodes * n_nodes, dtype=np.int64)
+    frontier = np.arange(n_nodes, dtype=np.int64) * (n_nodes + 1)
+    while len(frontier):
+        frontier_sources, frontier_nodes = np.divmod(frontier, n_nodes)
+        counts = degrees[frontier_nodes]
+        total = counts.sum()
+        if total == 0:
+            break
+        repeated = np.repeat(np.arange(len(frontier)), counts)
+        edges = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+        edges += first_edges[frontier_nodes[repeated]]
+
+        pairs = frontier_sources[repeated] * n_nodes + targets[edges]
+        candidates = flat_distances[frontier[repeated]] + weights[edges]
+        improved = candidates < flat_distances[pairs]
+        pairs, candidates = pairs[improved], candidates[improved]
+        np.minimum.at(flat_distances, pairs, candidates)
+        writers[pairs] = np.arange(len(pairs))
+        frontier = pairs[writers[pairs] == np.arange(len(pairs))]
+    return distances
+
+
+class NavigationTable:
+    """Precomputed shortest paths between all floor cells of a maze.
+
+    Parameters
+    ----------
+    layout : np.ndarray
+        Layout of the maze, where 1 is a wall.
+    compact : bool, optional
+        Whether to keep only the graph of junctions instead of the tables
+        of all pairs of cells. If not passed, compact table is used when the
+        maze has more than `max_dense_cells` floor cells.
+    max_dense_cells : int, default=1024
+        Maximum number of floor cells for which a dense table is built.
+    max_searches : int, default=16
+        Maximum number of junction searches a compact table keeps, see
+        Notes.
+
+    Notes
+    -----
+    Junctions are floor cells with more than two floor neighbours. Every
+    other floor cell lies on a corridor between two junctions, or on a dead
+    end hanging off a single junction, and is described by its offsets to
+    both ends of the corridor. Corridors make up the sparse graph of J
+    junctions, stored as adjacency lists, so a compact table takes memory
+    linear in the number F of floor cells.
+
+    Distances between junctions are searched on demand: a query runs
+    Dijkstra from the junctions at the ends of the target over the junction
+    graph, just until the junctions at the ends of the source are reached.
+    Searches are kept, and resumed by later queries of the same target, for
+    the `max_searches` most recently used targets, so ghosts chasing the
+    same cell share them. A compact table thus stays within
+    O(F + max_searches * J) memory.
+
+    The dense table additionally expands distances and the direction of the
+    first step to every pair of F floor cells (F^2 * 5 bytes), so a query is
+    a single lookup.
+    """
+
+    def __init__(
+        self,
+        layout: np.ndarray,
+        compact: bool | None = None,
+        max_dense_cells: int = 1024,
+        max_searches: int = 16,
+    ) -> None:
+        floor = layout != 1
+        self.shape = layout.shape
+        self.cells = np.argwhere(floor)
+        self.cell_index = np.full(self.shape, -1, dtype=np.int32)
+        self.cell_index[floor] = np.arange(len(self.cells), dtype=np.int32)
+
+        neighbours = self.cells[:, None, :] + _neighbour_deltas[None, :, :]
+        inside = (
+            (neighbours[..., 0] >= 0)
+            & (neighbours[..., 0] < self.shape[0])
+            & (neighbours[..., 1] >= 0)
+            & (neighbours[..., 1] < self.shape[1])
+        )
+        self.neighbours = np.where(
+            inside,
+            self.cell_index[
+                np.clip(neighbours[..., 0], 0, self.shape[0] - 1),
+                np.clip(neighbours[..., 1], 0, self.shape[1] - 1),
+            ],
+            -1,
+        ).astype(np.int32)
+
+        self.compact = len(self.cells) > max_dense_cells if compact is None else compact
+        self.max_searches = max_searches
+        self._build_junctions()
+
+        self.cell_distances: np.ndarray | None = None
+        self.directions: np.ndarray | None = None
+        if not self.compact:
+            self._build_dense()
+        self._reset_searches()
+
+    @property
+    def n_junctions(self) -> int:
+        """Number of junctions J."""
+        return len(self.junction_offsets) - 1
+
+    @property
+    def nbytes(self) -> int:
+        """Memory taken by the arrays of the table in bytes. Searches kept
+        by a compact table are not included."""
+        return sum(values.nbytes for values in self.arrays().values())
+
+    def arrays(self) -> dict[str, np.ndarray]:
+        """Arrays that fully describe the table.
+
+        Returns
+        -------
+        dict[str, np.ndarray]
+            Arrays of the table by name, see `from_arrays`. Dense tables
+            also include "cell_distances" and "directions".
+        """
+        arrays = {
+            "cells": self.cells,
+            "cell_index": self.cell_index,
+            "neighbours": self.neighbours,
+            "ends": self.ends,
+            "offsets": self.offsets,
+            "corridor": self.corridor,
+            "junction_offsets": self.junction_offsets,
+            "junction_neighbours": self.junction_neighbours,
+            "junction_weights": self.junction_weights,
+        }
+        if not self.compact:
+            arrays["cell_distances"] = self.cell_distances
+            arrays["directions"] = self.directions
+        return arrays
+
+    @classmethod
+    def from_arrays(
+        cls, arrays: dict[str, np.ndarray], max_searches: int = 16
+    ) -> NavigationTable:
+        """Restores the table from its arrays without copying them.
+
+        Parameters
+        ----------
+        arrays : dict[str, np.ndarray]
+            Arrays of the table as returned by `arrays`.
+        max_searches : int, default=16
+            Maximum number of junction searches a compact table keeps.
+
+        Returns
+        -------
+        NavigationTable
+            Table that refers to the passed arrays.
+        """
+        table = cls.__new__(cls)
+        table.shape = arrays["cell_index"].shape
+        table.compact = "directions" not in arrays
+        table.max_searches = max_searches
+        table.cell_distances = arrays.get("cell_distances")
+        table.directions = arrays.get("directions")
+        table.cells = arrays["cells"]
+        table.cell_index = arrays["cell_index"]
+        table.neighbours = arrays["neighbours"]
+        table.ends = arrays["ends"]
+        table.offsets = arrays["offsets"]
+        table.corridor = arrays["corridor"]
+        table.junction_offsets = arrays["junction_offsets"]
+        table.junction_neighbours = arrays["junction_neighbours"]
+        table.junction_weights = arrays["junction_weights"]
+        table._reset_searches()
+        return table
+
+    def _build_junctions(self) -> None:
+        """Splits floor cells into junctions and corridors between them and
+        builds the graph of junctions connected by the corridors.
+        """
+        n_cells = len(self.cells)
+        neighbours = self.neighbours.tolist()
+        is_junction = (self.neighbours >= 0).sum(axis=1) > 2
+        assigned = is_junction.copy()
+        junctions: list[int] = np.flatnonzero(is_junction).tolist()
+
+        ends = np.zeros((n_cells, 2), dtype=np.int32)
+        offsets = np.zeros((n_cells, 2), dtype=np.int32)
+        corridor = np.full(n_cells, -1, dtype=np.int32)
+        edges: dict[tuple[int, int], int] = {}
+        n_corridors = 0
+        walked = 0
+        next_unassigned = 0
+
+        while True:
+            while walked < len(junctions):
+                start = junctions[walked]
+                walked += 1
+                for first in neighbours[start]:
+                    if first < 0 or (not is_junction[first] and assigned[first]):
+                        continue
+                    chain = []
+                    previous, current = start, first
+                    while not is_junction[current]:
+                        chain.append(current)
+                        assigned[current] = True
+                        following = [
+                            cell
+                            for cell in neighbours[current]
+                            if cell >= 0 and cell != previous
+                        ]
+                        if not following:
+                            break
+                        previous, current = current, following[0]
+
+                    positions = np.arange(1, len(chain) + 1)
+                    if is_junction[current]:
+                        length = len(chain) + 1
+                        edges[start, current] = min(
+                            edges.get((start, current), length), length
+                        )
+                        edges[current, start] = edges[start, current]
+                        offsets[chain, 1] = length - positions
+                    else:
+                        # Dead end is reachable only through the start.
+                        current = start
+                        offsets[chain, 1] = positions
+                    if chain:
+                        corridor[chain] = n_corridors
+                        ends[chain] = start, current
+                        offsets[chain, 0] = positions
+                        n_corridors += 1
+
+            # Rings and paths without branches have no junctions, so one of
+            # their cells becomes a junction.
+            while next_unassigned < n_cells and assigned[next_unassigned]:
+                next_unassigned += 1
+            if next_unassigned == n_cells:
+                break
+            is_junction[next_unassigned] = True
+            assigned[next_unassigned] = True
+            junctions.append(next_unassigned)
+
+        junction_index = np.full(n_cells, -1, dtype=np.int32)
+        junction_index[junctions] = np.arange(len(junctions), dtype=np.int32)
+        ends[junctions] = np.asarray(junctions, dtype=np.int32)[:, None]
+        self.ends = junction_index[ends]
+        self.offsets = offsets
+        self.corridor = corridor
+
+        # Adjacency lists of the junction graph in the compressed sparse row
+        # layout: neighbours of junction j lie in [offsets[j], offsets[j + 1]).
+        edge_cells = np.array(list(edges.keys()), dtype=np.int64).reshape(-1, 2)
+        sources = junction_index[edge_cells[:, 0]]
+        order = np.argsort(sources, kind="stable")
+        self.junction_offsets = np.zeros(len(junctions) + 1, dtype=np.int32)
+        np.cumsum(
+            np.bincount(sources, minlength=len(junctions)),
+            out=self.junction_offsets[1:],
+        )
+        self.junction_neighbours = junction_index[edge_cells[order, 1]]
+        self.junction_weights = np.array(list(edges.values()), dtype=np.int32)[order]
+
+    def _build_dense(self) -> None:
+        """Expands distances between all junctions to all pairs of floor
+        cells and builds the table of the first step on the shortest path
+        between them.
+        """
+        junction_distances = _all_pairs_distances(
+            self.n_junctions,
+            np.repeat(np.arange(self.n_junctions), np.diff(self.junction_offsets)),
+            self.junction_neighbours,
+            self.junction_weights,
+        )
+        distances = np.full(
+            (len(self.cells), len(self.cells)), UNREACHABLE, dtype=np.int32
+        )
+        for source_end in range(2):
+            for target_end in range(2):
+                candidate = junction_distances[
+                    np.ix_(self.ends[:, source_end], self.ends[:, target_end])
+                ]
+                candidate += self.offsets[:, source_end, None]
+                candidate += self.offsets[None, :, target_end]
+                np.minimum(distances, candidate, out=distances)
+        same_corridor = (self.corridor[:, None] == self.corridor[None, :]) & (
+            self.corridor[:, None] >= 0
+        )
+        along_corridor = np.abs(self.offsets[:, None, 0] - self.offsets[None, :, 0])
+        distances[same_corridor] = np.minimum(
+            distances[same_corridor], along_corridor[same_corridor]
+        )
+        self.cell_distances = np.minimum(distances, UNREACHABLE)
+
+        best = self.cell_distances.copy()
+        self.directions = np.full(best.shape, -1, dtype=np.int8)
+        for direction in range(len(_neighbour_deltas)):
+            neighbour = self.neighbours[:, direction]
+            has_neighbour = neighbour >= 0
+            candidate = np.full_like(best, UNREACHABLE)
+            candidate[has_neighbour] = self.cell_distances[neighbour[has_neighbour]]
+            closer = candidate < best
+            best[closer] = candidate[closer]
+            self.directions[closer] = direction
+
+    def _reset_searches(self) -> None:
+        """Drops the searches of the junction graph, which are only built
+        for compact tables by the queries."""
+        self._searches: OrderedDict[int, tuple[array, list]] = OrderedDict()
+        self._flat: dict[str, array] | None = None
+
+    def _prepare_searches(self) -> None:
+        """Copies the arrays queried by the searches into flat typed arrays,
+        which are cheaper to index one element at a time than NumPy arrays
+        and take far less memory than nested lists."""
+        self._flat = {
+            name: array("i", np.ascontiguousarray(values, dtype=np.int32).tobytes())
+            for name, values in (
+                ("ends", self.ends),
+                ("offsets", self.offsets),
+                ("corridor", self.corridor),
+                ("neighbours", self.neighbours),
+                ("junction_offsets", self.junction_offsets),
+                ("junction_neighbours", self.junction_neighbours),
+                ("junction_weights", self.junction_weights),
+            )
+        }
+
+    def _junction_distance(self, target: int, source: int) -> int:
+        """Distance between two junctions, found by resuming Dijkstra from
+        the target until the source is reached."""
+        search = self._searches.get(target)
+        if search is None:
+            # Settled distances take 4 bytes per junction, -1 until settled.
+            settled = array("i", [-1]) * self.n_junctions
+            search = self._searches[target] = (settled, [(0, target)])
+            if len(self._searches) > self.max_searches:
+                self._searches.popitem(last=False)
+        else:
+            self._searches.move_to_end(target)
+        settled, heap = search
+        distance = settled[source]
+        if distance >= 0:
+            return distance
+
+        bounds = self._flat["junction_offsets"]
+        neighbours = self._flat["junction_neighbours"]
+        weights = self._flat["junction_weights"]
+        while heap:
+            distance, junction = heappop(heap)
+            if settled[junction] >= 0:
+                continue
+            settled[junction] = distance
+            for edge in range(bounds[junction], bounds[junction + 1]):
+                neighbour = neighbours[edge]
+                if settled[neighbour] < 0:
+                    heappush(heap, (distance + weights[edge], neighbour))
+            if junction == source:
+                return distance
+        return UNREACHABLE
+
+    def _cell_distance(self, source: int, target: int) -> int:
+        """Distance between two floor cells given by their indices."""
+        if self.cell_distances is not None:
+            return int(self.cell_distances[source, target])
+        if self._flat is None:
+            self._prepare_searches()
+        ends, offsets = self._flat["ends"], self._flat["offsets"]
+
+        result = UNREACHABLE
+        corridor = self._flat["corridor"][source]
+        if corridor >= 0 and corridor == self._flat["corridor"][target]:
+            result = abs(offsets[2 * source] - offsets[2 * target])
+        for source_end in (2 * source, 2 * source + 1):
+            for target_end in (2 * target, 2 * target + 1):
+                result = min(
+                    result,
+                    offsets[source_end]
+                    + self._junction_distance(ends[target_end], ends[source_end])
+                    + offsets[target_end],
+                )
+        return min(result, UNREACHABLE)
+
+    def distance(self, source: tuple[int, int], target: tuple[int, int]) -> int | None:
+        """Length of the shortest path between two cells.
+
+        Parameters
+        ----------
+        source : tuple[int, int]
+            Starting point in the format (y, x).
+        target : tuple[int, int]
+            Ending point in the format (y, x).
+
+        Returns
+        -------
+        int | None
+            Number of steps between the cells, or None if there is no path.
+        """
+        source_cell = self.cell_index[source]
+        target_cell = self.cell_index[target]
+        if source_cell < 0 or target_cell < 0:
+            return None
+        result = self._cell_distance(source_cell, target_cell)
+        return None if result == UNREACHABLE else result
+
+    def _next_direction(self, source_cell: int, target_cell: int) -> int:
+        """Index of the neighbour delta of the first step between two floor
+        cells given by their indices, or -1 if there is no step to take."""
+        if source_cell < 0 or target_cell < 0 or source_cell == target_cell:
+            return -1
+        if self.directions is not None:
+            return int(self.directions[source_cell, target_cell])
+
+        direction = -1
+        best = self._cell_distance(source_cell, target_cell)
+        neighbours = self._flat["neighbours"]
+        for index in range(4):
+            neighbour = neighbours[4 * source_cell + index]
+            if neighbour >= 0:
+                distance = self._cell_distance(neighbour, target_cell)
+                if distance < best:
+                    best, direction = distance, index
+        return direction
+
+    def next_position(
+        self, source: tuple[int, int], target: tuple[int, int]
+    ) -> tuple[int, int]:
+        """Next cell on the shortest path between two cells.
+
+        Parameters
+        ----------
+        source : tuple[int, int]
+            Starting point in the format (y, x).
+        target : tuple[int, int]
+            Ending point in the format (y, x).
+
+        Returns
+        -------
+        tuple[int, int]
+            Next point in the format (y, x). Equals to the source if the
+            target is reached or unreachable.
+        """
+        direction = self._next_direction(
+            int(self.cell_index[source]), int(self.cell_index[target])
+        )
+        if direction < 0:
+            return source
+        delta_y, delta_x = _neighbour_steps[direction]
+        return source[0] + delta_y, source[1] + delta_x
+
+    def next_cell(self, source: int, target: int) -> int:
+        """Next cell on the shortest path between two cells given by their
+        flat indices, see `next_position`.
+
+        Parameters
+        ----------
+        source : int
+            Flat index `y * ncols + x` of the starting cell.
+        target : int
+            Flat index of the ending cell.
+
+        Returns
+        -------
+        int
+            Flat index of the next cell. Equals to the source if the target
+            is reached or unreachable.
+        """
+        direction = self._next_direction(
+            self.cell_index.item(source), self.cell_index.item(target)
+        )
+        if direction < 0:
+            return source
+        delta_y, delta_x = _neighbour_steps[direction]
+        return source + delta_y * self.shape[1] + delta_x
@@ -1,2 +1,10 @@
-from .generate import generate_pacmanlike_maze
+from .generate import (
+    DEFAULT_MAZE_ALGORITHM,
+    MAZE_ALGORITHMS,
+    generate_pacmanlike_maze,
+    generate_pacmanlike_mazes,
+    layout_shape,
+    register_maze_algorithm,
+)
 from .strave import strave_maze
+from .types import CompactLayout
@@ -1,41 +1,232 @@
+from typing import Callable, Sequence
+
 import numpy as np
 from mazelib.generate.AldousBroder import AldousBroder
 from pacmanengine.algorithms.maze.strave import strave_maze
 from pacmanengine.algorithms.maze.types import EntityWeight
 
 
-def generate_maze(shape: tuple[int, int]) -> np.ndarray:
-    """Generates maze following AldousBroder algorithm.
+def layout_shape(shape: tuple[int, int]) -> tuple[int, int]:
+    """Calculates the shape of the layout generated for the maze.
+
+    Parameters
+    ----------
+    shape : tuple[int, int]
+        Shape of the desired maze in the form of (H, W).
+
+    Returns
+    -------
+    tuple[int, int]
+        Shape of the layout, which includes walls between the cells
+        and around the border, in the form of (2H + 1, 2W + 1).
+    """
+    return 2 * shape[0] + 1, 2 * shape[1] + 1
+
+
+class SeededAldousBroder(AldousBroder):
+    """AldousBroder algorithm that draws random numbers from the provided
+    generator instead of the global state of `random` and `np.random`.
+
+    Parameters
+    ----------
+    h : int
+        Height of the maze in cells.
+    w : int
+        Width of the maze in cells.
+    rng : np.random.Generator
+        Random generator of the maze.
+    """
+
+    def __init__(self, h: int, w: int, rng: np.random.Generator) -> None:
+        super(SeededAldousBroder, self).__init__(h, w)
+        self.rng = rng
+
+    def generate(self) -> np.ndarray:
+        grid = np.ones((self.H, self.W), dtype=np.int8)
+        random = self.rng.random
+
+        crow = 2 * int(self.rng.integers(self.h)) + 1
+        ccol = 2 * int(self.rng.integers(self.w)) + 1
+        grid[crow, ccol] = 0
+        num_visited = 1
+
+        while num_visited < self.h * self.w:
+            neighbors = []
+            if crow > 1:
+                neighbors.append((crow - 2, ccol))
+            if crow < self.H - 2:
+                neighbors.append((crow + 2, ccol))
+            if ccol > 1:
+                neighbors.append((crow, ccol - 2))
+            if ccol < self.W - 2:
+                neighbors.append((crow, ccol + 2))
+            unvisited = [(nrow, ncol) for nrow, ncol in neighbors if grid[nrow, ncol]]
+
+            # Same as mazelib: carve into a random unvisited neighbour, or
+            # walk to a random visited one if there are none.
+            if unvisited:
+                nrow, ncol = unvisited[int(random() * len(unvisited))]
+                grid[(nrow + crow) // 2, (ncol + ccol) // 2] = 0
+                grid[nrow, ncol] = 0
+                num_visited += 1
+            else:
+                nrow, ncol = neighbors[int(random() * len(neighbors))]
+            crow, ccol = nrow, ncol
+
+        return grid
+
+
+MazeAlgorithm = Callable[[tuple[int, int], np.random.Generator], np.ndarray]
+"""Function that carves a perfect maze of the shape (H, W) using the random
+generator. It returns an int8 grid of shape (2H + 1, 2W + 1), where 1 means
+wall and 0 means path."""
+
+MAZE_ALGORITHMS: dict[str, MazeAlgorithm] = {}
+"""Maze generation algorithms by name, see `register_maze_algorithm`."""
+
+DEFAULT_MAZE_ALGORITHM: str = "aldous_broder"
+"""Name of the algorithm used unless another one is requested."""
+
+
+def register_maze_algorithm(
+    name: str,
+) -> Callable[[MazeAlgorithm], MazeAlgorithm]:
+    """Registers a maze generation algorithm under the name, so it can be
+    selected with the `algorithm` argument of the generators.
+
+    Parameters
+    ----------
+    name : str
+        Name of the algorithm.
+
+    Returns
+    -------
+    Callable[[MazeAlgorithm], MazeAlgorithm]
+        Decorator that registers the algorithm and returns it unchanged.
+    """
+
+    def register(algorithm: MazeAlgorithm) -> MazeAlgorithm:
+        MAZE_ALGORITHMS[name] = algorithm
+        return algorithm
+
+    return register
+
+
+@register_maze_algorithm("aldous_broder")
+def aldous_broder(shape: tuple[int, int], rng: np.random.Generator) -> np.ndarray:
+    """Carves a maze with the mazelib AldousBroder algorithm, a random walk
+    that slows down considerably on large mazes."""
+    return SeededAldousBroder(*shape, rng=rng).generate()
+
+
+@register_maze_algorithm("backtracker")
+def backtracker(shape: tuple[int, int], rng: np.random.Generator) -> np.ndarray:
+    """Carves a maze with the iterative recursive backtracker.
+
+    Every cell is pushed to and popped from the stack once, so the maze is
+    carved in linear time. Passages are collected first and opened in the
+    grid with a single vectorized assignment.
+    """
+    height, width = shape
+    n_cells = height * width
+    visited = [False] * n_cells
+    draws = rng.random(n_cells).tolist()
+    sources: list[int] = []
+    targets: list[int] = []
+
+    start = int(rng.integers(n_cells))
+    visited[start] = True
+    stack = [start]
+    while stack:
+        cell = stack[-1]
+        y, x = divmod(cell, width)
+        options = []
+        if y > 0 and not visited[cell - width]:
+            options.append(cell - width)
+        if y < height - 1 and not visited[cell + width]:
+            options.append(cell + width)
+        if x > 0 and not visited[cell - 1]:
+            options.append(cell - 1)
+        if x < width - 1 and not visited[cell + 1]:
+            options.append(cell + 1)
+        if not options:
+            stack.pop()
+            continue
+        next_cell = options[int(draws[len(sources)] * len(options))]
+        visited[next_cell] = True
+        sources.append(cell)
+        targets.append(next_cell)
+        stack.append(next_cell)
+
+    grid = np.ones(layout_shape(shape), dtype=np.int8)
+    grid[1::2, 1::2] = 0
+    source_y, source_x = np.divmod(np.array(sources, dtype=np.int64), width)
+    target_y, target_x = np.divmod(np.array(targets, dtype=np.int64), width)
+    # Wall between two neighbouring cells lies halfway between them.
+    grid[source_y + target_y + 1, source_x + target_x + 1] = 0
+    return grid
+
+
+def _maze_algorithm(algorithm: str) -> MazeAlgorithm:
+    """Looks up a registered maze generation algorithm."""
+    if algorithm not in MAZE_ALGORITHMS:
+        raise ValueError(
+            f"Unknown maze algorithm {algorithm!r}: "
+            f"expected one of {sorted(MAZE_ALGORITHMS)}"
+        )
+    return MAZE_ALGORITHMS[algorithm]
+
+
+def generate_maze(
+    shape: tuple[int, int],
+    rng: np.random.Generator | None = None,
+    algorithm: str = DEFAULT_MAZE_ALGORITHM,
+) -> np.ndarray:
+    """Generates maze following the selected algorithm.
 
     Parameters
     ----------
     shape : tuple[int, int]
         Shape of the desired maze in the form of (H, W).
+    rng : np.random.Generator, optional
+        Random generator of the maze. A freshly seeded one is used if not
+        provided.
+    algorithm : str, default="aldous_broder"
+        Name of the generation algorithm, see `MAZE_ALGORITHMS`.
 
     Returns
     -------
     np.ndarray
         Maze representation.
     """
-    generator = AldousBroder(*shape)
-    return generator.generate()
+    return _maze_algorithm(algorithm)(shape, np.random.default_rng(rng))
 
 
-def generate_straved_maze(shape: tuple[int, int]) -> np.ndarray:
+def generate_straved_maze(
+    shape: tuple[int, int],
+    rng: np.random.Generator | None = None,
+    algorithm: str = DEFAULT_MAZE_ALGORITHM,
+) -> np.ndarray:
     """Generates straved maze.
 
     Parameters
     ----------
     shape : tuple[int, int]
         Shape of the desired maze in the form of (H, W).
+    rng : np.random.Generator, optional
+        Random generator of the maze. A freshly seeded one is used if not
+        provided.
+    algorithm : str, default="aldous_broder"
+        Name of the generation algorithm, see `MAZE_ALGORITHMS`.
 
     Returns
     -------
     np.ndarray
         Maze with little to no dead ends.
     """
-    maze = generate_maze(shape)
-    return strave_maze(maze)
+    rng = np.random.default_rng(rng)
+    maze = generate_maze(shape, rng=rng, algorithm=algorithm)
+    return strave_maze(maze, rng=rng)
 
 
 def _put_ghost_home(maze: np.ndarray) -> np.ndarray:
@@ -44,18 +235,19 @@ def _put_ghost_home(maze: np.ndarray) -> np.ndarray:
     Parameters
     ----------
     maze : np.ndarray
-        A pacman-like representation of a maze.
+        A pacman-like representation of a maze, or a batch of mazes of
+        shape (N, H, W).
 
     Returns
     -------
     np.ndarray
         Maze with home for ghosts in the middle.
     """
-    center_y, center_x = [value // 2 for value in maze.shape[:2]]
+    center_y, center_x = [value // 2 for value in maze.shape[-2:]]
 
-    maze[center_y - 1 : center_y + 4, center_x - 3 : center_x + 2] = 0
-    maze[center_y : center_y + 3, center_x - 2 : center_x + 1] = 1
-    maze[center_y : center_y + 2, center_x - 1 : center_x] = 0
+    maze[..., center_y - 1 : center_y + 4, center_x - 3 : center_x + 2] = 0
+    maze[..., center_y : center_y + 3, center_x - 2 : center_x + 1] = 1
+    maze[..., center_y : center_y + 2, center_x - 1 : center_x] = 0
 
     return maze
 
@@ -66,13 +258,12 @@ def _spawn_coins(layout: np.ndarray) -> np.ndarray:
 
 
 def _spawn_pacman(layout: np.ndarray) -> np.ndarray:
-    layout[1, layout.shape[1] // 2 - 1] = EntityWeight.PACMAN_WEIGHT
+    layout[..., 1, layout.shape[-1] // 2 - 1] = EntityWeight.PACMAN_WEIGHT
     return layout
 
 
 def _spawn_ghosts(layout: np.ndarray, n_ghosts: int = 4) -> np.ndarray:
-    layout[layout.shape[0] // 2 + 1, layout.shape[1] // 2 - 1] = 0
-    layout[layout.shape[0] // 2 + 1, layout.shape[1] // 2 - 1] = (
+    layout[..., layout.shape[-2] // 2 + 1, layout.shape[-1] // 2 - 1] = (
         n_ghosts * EntityWeight.GHOST_WEIGHT
     )
     return layout
@@ -84,7 +275,11 @@ def _populate_maze(layout: np.ndarray, n_ghosts: int = 4) -> np.ndarray:
     return _spawn_pacman(layout_with_ghosts)
 
 
-def generate_pacmanlike_maze(shape: tuple[int, int]) -> np.ndarray:
+def generate_pacmanlike_maze(
+    shape: tuple[int, int],
+    rng: np.random.Generator | None = None,
+    algorithm: str = DEFAULT_MAZE_ALGORITHM,
+) -> np.ndarray:
     """Generates a maze that looks like a maze in pacman.
     Therefore it has little to no dead ends and most of
     paths are one tile wide.
@@ -94,12 +289,68 @@ def generate_pacmanlike_maze(shape: tuple[int, int]) -> np.ndarray:
     ----------
     shape : tuple[int, int]
         Shape of the desired maze in the form of (H, W).
+    rng : np.random.Generator, optional
+        Random generator of the maze. A freshly seeded one is used if not
+        provided. Pass generators spawned from a `np.random.SeedSequence`
+        to generate independent and reproducible mazes in parallel.
+    algorithm : str, default="aldous_broder"
+        Name of the generation algorithm, see `MAZE_ALGORITHMS`.
 
     Returns
     -------
     np.ndarray
         Pacman maze representation.
     """
-    straved_maze = generate_straved_maze(shape=shape)
+    straved_maze = generate_straved_maze(shape=shape, rng=rng, algorithm=algorithm)
     straved_maze_with_home = _put_ghost_home(straved_maze)
     return _populate_maze(straved_maze_with_home)
+
+
+def generate_pacmanlike_mazes(
+    n_mazes: int,
+    shape: tuple[int, int],
+    rng: np.random.Generator | Sequence[np.random.Generator] | None = None,
+    algorithm: str = DEFAULT_MAZE_ALGORITHM,
+) -> np.ndarray:
+    """Generates a batch of pacman-like mazes, see `generate_pacmanlike_maze`.
+
+    Parameters
+    ----------
+    n_mazes : int
+        Number of mazes N.
+    shape : tuple[int, int]
+        Shape of every maze in the form of (H, W).
+    rng : np.random.Generator | Sequence[np.random.Generator], optional
+        Random generator shared by the mazes, or one generator per maze.
+        A freshly seeded one is used if not provided.
+    algorithm : str, default="aldous_broder"
+        Name of the generation algorithm, see `MAZE_ALGORITHMS`.
+
+    Returns
+    -------
+    np.ndarray
+        Pacman maze representations stacked into a uint8 array of shape
+        (N, 2H + 1, 2W + 1).
+
+    Notes
+    -----
+    Mazes are carved and straved one by one, after that the ghost home,
+    coins, pacman and ghosts are put into the whole batch at once. The
+    result matches N consecutive calls of `generate_pacmanlike_maze` with
+    the same generators.
+    """
+    if rng is None or isinstance(rng, np.random.Generator):
+        rngs = [np.random.default_rng(rng)] * n_mazes
+    else:
+        rngs = list(rng)
+        if len(rngs) != n_mazes:
+            raise ValueError(
+                f"Expected one generator per maze ({n_mazes}): provided {len(rngs)}"
+            )
+
+    layouts = np.empty((n_mazes, *layout_shape(shape)), dtype=np.uint8)
+    for layout, maze_rng in zip(layouts, rngs):
+        layout[...] = generate_straved_maze(
+            shape=shape, rng=maze_rng, algorithm=algorithm
+        )
+    return _populate_maze(_put_ghost_home(layouts))
@@ -1 +1,2 @@
+from .compact import CompactLayout
 from .weight import EntityWeight
@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import numpy as np
+
+from .weight import EntityWeight
+
+
+@dataclass(frozen=True)
+class CompactLayout:
+    """Populated maze stored as separate planes instead of summed weights.
+
+    Attributes
+    ----------
+    walls : np.ndarray
+        Wall plane of shape (H, W) and type uint8, where 1 means wall and
+        0 means path. It can be passed wherever a layout is only checked
+        for walls, e.g. to `NavigationTable` or `WallType.infer_grid`.
+    coins : np.ndarray
+        Coin plane packed into bits, see `np.packbits`, shape
+        (ceil(H * W / 8),).
+    pacman_spawn : np.ndarray
+        Spawn point of pacman in the format (Y, X), shape (2,).
+    ghost_spawns : np.ndarray
+        Spawn points of the ghosts in the format (Y, X), ordered row by row,
+        shape (G, 2).
+
+    Notes
+    -----
+    The weighted layout produced by `generate_pacmanlike_maze` takes a byte
+    per cell and has to be decoded before use. Here walls take a byte per
+    cell and coins a bit per cell, so the planes are ready to be used
+    directly. See `from_layout` and `to_layout` for the conversion.
+    """
+
+    walls: np.ndarray
+    coins: np.ndarray
+    pacman_spawn: np.ndarray
+    ghost_spawns: np.ndarray
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        """Shape (H, W) of the layout."""
+        return self.walls.shape
+
+    @property
+    def nbytes(self) -> int:
+        """Number of bytes taken by the planes and spawn points."""
+        return (
+            self.walls.nbytes
+            + self.coins.nbytes
+            + self.pacman_spawn.nbytes
+            + self.ghost_spawns.nbytes
+        )
+
+    @classmethod
+    def from_layout(cls, layout: np.ndarray) -> CompactLayout:
+        """Decodes a weighted layout.
+
+        Parameters
+        ----------
+        layout : np.ndarray
+            A numeric representation of a populated maze, as produced by
+            `generate_pacmanlike_maze`.
+
+        Returns
+        -------
+        CompactLayout
+            The same maze stored as planes.
+        """
+        walls = layout == 1
+        weights = np.where(walls, 0, layout.astype(np.int64))
+        ghosts, weights = np.divmod(weights, EntityWeight.GHOST_WEIGHT)
+        pacman, weights = np.divmod(weights, EntityWeight.PACMAN_WEIGHT)
+        coins = weights >= EntityWeight.COIN_WEIGHT
+
+        pacman_cells = np.argwhere(pacman)
+        if len(pacman_cells) != 1:
+            raise ValueError(
+                f"Layout must contain exactly one pacman: provided {len(pacman_cells)}"
+            )
+        return cls(
+            walls=walls.view(np.uint8),
+            coins=np.packbits(coins),
+            pacman_spawn=pacman_cells[0],
+            ghost_spawns=np.repeat(np.argwhere(ghosts), ghosts[ghosts > 0], axis=0),
+        )
+
+    def coin_mask(self) -> np.ndarray:
+        """Unpacks the coin plane.
+
+        Returns
+        -------
+        np.ndarray
+            Newly allocated mask of cells containing a coin, shape (H, W).
+        """
+        height, width = self.shape
+        return (
+            np.unpackbits(self.coins, count=height * width)
+            .view(np.bool_)
+            .reshape(height, width)
+        )
+
+    def to_layout(self) -> np.ndarray:
+        """Encodes the maze back into a weighted layout.
+
+        Returns
+        -------
+        np.ndarray
+            Layout of shape (H, W) and type int8, encoded the same way as
+            the output of `generate_pacmanlike_maze`.
+        """
+        layout = self.walls.astype(np.int8)
+        layout[self.coin_mask()] = EntityWeight.COIN_WEIGHT
+        layout[tuple(self.pacman_spawn)] += EntityWeight.PACMAN_WEIGHT
+        np.add.at(
+            layout,
+            (self.ghost_spawns[:, 0], self.ghost_spawns[:, 1]),
+            EntityWeight.GHOST_WEIGHT,
+        )
+        return layout
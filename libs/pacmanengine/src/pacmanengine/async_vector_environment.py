@@ -0,0 +1,351 @@
+from __future__ import annotations
+
+import multiprocessing as mp
+import traceback
+from multiprocessing.connection import Connection
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+from pacmanengine.algorithms.maze import layout_shape
+from pacmanengine.environment import Environment
+from pacmanengine.types.mobs import Action
+from pacmanengine.vector_environment import VectorEnvironmentStep
+
+
+def _shared_layout(
+    num_envs: int, shape: tuple[int, int]
+) -> tuple[list[tuple[str, np.dtype, tuple[int, ...], int]], int]:
+    """Lays out arrays of the vector environment in a shared memory block.
+
+    Parameters
+    ----------
+    num_envs : int
+        Number of environments.
+    shape : tuple[int, int]
+        Shape of a single observation (H, W).
+
+    Returns
+    -------
+    tuple[list[tuple[str, np.dtype, tuple[int, ...], int]], int]
+        Name, dtype, shape and offset of every array, along with the
+        total size of the block in bytes.
+    """
+    specs = [
+        ("actions", np.dtype(np.int64), (num_envs,)),
+        ("rewards", np.dtype(np.float32), (num_envs,)),
+        ("dones", np.dtype(np.bool_), (num_envs,)),
+        ("observations", np.dtype(np.int8), (num_envs, *shape)),
+    ]
+    layout = []
+    offset = 0
+    for name, dtype, array_shape in specs:
+        offset = -(-offset // dtype.itemsize) * dtype.itemsize
+        layout.append((name, dtype, array_shape, offset))
+        offset += int(np.prod(array_shape)) * dtype.itemsize
+    return layout, offset
+
+
+def _shared_arrays(
+    buffer: memoryview, num_envs: int, shape: tuple[int, int]
+) -> dict[str, np.ndarray]:
+    """Creates arrays of the vector environment backed by a shared buffer.
+
+    Parameters
+    ----------
+    buffer : memoryview
+        Buffer of the shared memory block.
+    num_envs : int
+        Number of environments.
+    shape : tuple[int, int]
+        Shape of a single observation (H, W).
+
+    Returns
+    -------
+    dict[str, np.ndarray]
+        Arrays "actions", "rewards", "dones" and "observations".
+    """
+    layout, _ = _shared_layout(num_envs, shape)
+    return {
+        name: np.ndarray(array_shape, dtype=dtype, buffer=buffer, offset=offset)
+        for name, dtype, array_shape, offset in layout
+    }
+
+
+def _worker(
+    connection: Connection,
+    parent_connection: Connection,
+    shared_memory_name: str,
+    num_envs: int,
+    env_indices: list[int],
+    shape: tuple[int, int],
+    seeds: list[np.random.SeedSequence],
+) -> None:
+    """Loop of a worker process that owns a slice of environments.
+
+    Parameters
+    ----------
+    connection : Connection
+        End of the pipe commands are received from.
+    parent_connection : Connection
+        End of the pipe owned by the parent process. It is closed right away.
+    shared_memory_name : str
+        Name of the shared memory block with the arrays.
+    num_envs : int
+        Total number of environments in the vector environment.
+    env_indices : list[int]
+        Indices of environments owned by the worker.
+    shape : tuple[int, int]
+        Shape of each maze.
+    seeds : list[np.random.SeedSequence]
+        Seeds of the environments owned by the worker.
+    """
+    parent_connection.close()
+    shared_memory = SharedMemory(name=shared_memory_name)
+    arrays = _shared_arrays(shared_memory.buf, num_envs, layout_shape(shape))
+    actions, rewards = arrays["actions"], arrays["rewards"]
+    dones, observations = arrays["dones"], arrays["observations"]
+    envs = {
+        index: Environment(shape=shape, seed=seed)
+        for index, seed in zip(env_indices, seeds)
+    }
+
+    try:
+        while True:
+            command = connection.recv()
+            if command == "reset":
+                for index, env in envs.items():
+                    step = env.reset()
+                    rewards[index] = step.reward
+                    dones[index] = step.done
+                    observations[index] = env.simulation.observation()
+            elif command == "step":
+                for index, env in envs.items():
+                    step = env.step(Action(actions[index]))
+                    rewards[index] = step.reward
+                    dones[index] = step.done
+                    if dones[index]:
+                        env.reset()
+                    observations[index] = env.simulation.observation()
+            elif command == "close":
+                break
+            else:
+                raise ValueError(f"Unknown command: {command}")
+            connection.send((True, None))
+    except (KeyboardInterrupt, EOFError):
+        pass
+    except Exception:
+        connection.send((False, traceback.format_exc()))
+    finally:
+        del actions, rewards, dones, observations, arrays
+        shared_memory.close()
+        connection.close()
+
+
+class AsyncVectorEnvironment:
+    """Runs N environments in a pool of worker processes.
+
+    Every worker owns a slice of `Environment` instances. Actions are passed
+    to the workers and observations, rewards and done flags are passed back
+    through a single shared memory block, so nothing is pickled per step.
+
+    Parameters
+    ----------
+    num_envs : int
+        Number of environments N.
+    num_workers : int, optional
+        Number of worker processes K. Defaults to the number of CPUs, but
+        no more than `num_envs`.
+    shape : tuple[int, int], default=(10, 20)
+        Shape of each maze, see `generate_pacmanlike_maze`.
+    seed : int, default=42
+        Seed of the environment. Environment i is seeded with the i-th seed
+        spawned from it.
+    context : str, optional
+        Start method of the worker processes, see `multiprocessing`.
+    copy : bool, default=True
+        Whether to copy arrays out of the shared memory. If False, the
+        returned arrays are views that are overwritten on the next step.
+
+    Notes
+    -----
+    Use `step_async` and `step_wait` to overlap inference of the learner
+    with simulation. Finished environments are reset automatically and
+    the returned observation belongs to the new episode.
+    """
+
+    def __init__(
+        self,
+        num_envs: int,
+        num_workers: int | None = None,
+        shape: tuple[int, int] = (10, 20),
+        seed: int = 42,
+        context: str | None = None,
+        copy: bool = True,
+    ) -> None:
+        if num_envs < 1:
+            raise ValueError(f"num_envs must be positive: provided {num_envs}")
+        self.num_envs = num_envs
+        self.num_workers = min(num_workers or mp.cpu_count(), num_envs)
+        self.shape = shape
+        self.seed = seed
+        self.copy = copy
+        self.closed = False
+        self._waiting = False
+
+        observation_shape = layout_shape(shape)
+        _, nbytes = _shared_layout(num_envs, observation_shape)
+        self._shared_memory = SharedMemory(create=True, size=nbytes)
+        arrays = _shared_arrays(self._shared_memory.buf, num_envs, observation_shape)
+        self._actions = arrays["actions"]
+        self._rewards = arrays["rewards"]
+        self._dones = arrays["dones"]
+        self._observations = arrays["observations"]
+
+        seeds = np.random.SeedSequence(seed).spawn(num_envs)
+        ctx = mp.get_context(context)
+        self._connections: list[Connection] = []
+        self._processes: list[mp.Process] = []
+        for env_indices in np.array_split(np.arange(num_envs), self.num_workers):
+            parent_connection, child_connection = ctx.Pipe()
+            process = ctx.Process(
+                target=_worker,
+                args=(
+                    child_connection,
+                    parent_connection,
+                    self._shared_memory.name,
+                    num_envs,
+                    env_indices.tolist(),
+                    shape,
+                    [seeds[index] for index in env_indices],
+                ),
+                daemon=True,
+            )
+            process.start()
+            child_connection.close()
+            self._connections.append(parent_connection)
+            self._processes.append(process)
+
+    def _send(self, command: str) -> None:
+        for connection in self._connections:
+            connection.send(command)
+
+    def _receive(self) -> None:
+        errors = []
+        for connection in self._connections:
+            success, error = connection.recv()
+            if not success:
+                errors.append(error)
+        if errors:
+            raise RuntimeError("Worker process failed:\n" + "\n".join(errors))
+
+    def _result(self, actions: np.ndarray) -> VectorEnvironmentStep:
+        convert = np.copy if self.copy else np.asarray
+        return VectorEnvironmentStep(
+            actions=actions,
+            observations=convert(self._observations),
+            rewards=convert(self._rewards),
+            dones=convert(self._dones),
+        )
+
+    def reset(self) -> VectorEnvironmentStep:
+        """Resets all environments.
+
+        Returns
+        -------
+        VectorEnvironmentStep
+            Step of the environments.
+        """
+        self._assert_ready()
+        self._send("reset")
+        self._receive()
+        return self._result(np.full(self.num_envs, Action.STAY, dtype=np.int64))
+
+    def step_async(self, actions: np.ndarray) -> None:
+        """Sends actions to the workers without waiting for the result.
+
+        Parameters
+        ----------
+        actions : np.ndarray
+            Actions of Pacman for every environment, shape (N,).
+        """
+        self._assert_ready()
+        actions = np.asarray(actions, dtype=np.int64)
+        if actions.shape != (self.num_envs,):
+            raise ValueError(
+                f"Actions must be of shape ({self.num_envs},): "
+                f"provided {actions.shape}"
+            )
+        self._actions[:] = actions
+        self._send("step")
+        self._waiting = True
+
+    def step_wait(self) -> VectorEnvironmentStep:
+        """Waits for the workers to finish the step started by `step_async`.
+
+        Returns
+        -------
+        VectorEnvironmentStep
+            Batched step of the environments.
+        """
+        if not self._waiting:
+            raise RuntimeError("step_async must be called before step_wait.")
+        try:
+            self._receive()
+        finally:
+            # A failed step is over as well, so the error does not leave the
+            # environment stuck waiting for a result that never comes.
+            self._waiting = False
+        return self._result(self._actions.copy())
+
+    def step(self, actions: np.ndarray) -> VectorEnvironmentStep:
+        """Makes a step in every environment and waits for the result.
+
+        Parameters
+        ----------
+        actions : np.ndarray
+            Actions of Pacman for every environment, shape (N,).
+
+        Returns
+        -------
+        VectorEnvironmentStep
+            Batched step of the environments.
+        """
+        self.step_async(actions)
+        return self.step_wait()
+
+    def _assert_ready(self) -> None:
+        if self.closed:
+            raise RuntimeError("Environment is closed.")
+        if self._waiting:
+            raise RuntimeError("Previous step has not been awaited by step_wait.")
+
+    def close(self) -> None:
+        """Stops worker processes and releases the shared memory."""
+        if self.closed:
+            return
+        if self._waiting:
+            self._receive()
+            self._waiting = False
+        for connection in self._connections:
+            try:
+                connection.send("close")
+            except (BrokenPipeError, OSError):
+                pass
+        for process in self._processes:
+            process.join()
+        for connection in self._connections:
+            connection.close()
+        del self._actions, self._rewards, self._dones, self._observations
+        self._shared_memory.close()
+        self._shared_memory.unlink()
+        self.closed = True
+
+    def __enter__(self) -> AsyncVectorEnvironment:
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def __del__(self) -> None:
+        if not getattr(self, "closed", True):
+            self.close()
@@ -1,15 +1,31 @@
-import itertools
+from __future__ import annotations
+
 from dataclasses import dataclass
+from typing import TYPE_CHECKING
 
-from pacmanengine.types.maze import Maze, MazeState
+import numpy as np
+from pacmanengine.algorithms.maze import DEFAULT_MAZE_ALGORITHM
+from pacmanengine.events import EventBus, EventType
+from pacmanengine.instrumentation import instrumentation
+from pacmanengine.maze_pool import MazePool
+from pacmanengine.types.maze_state import MazeState
 from pacmanengine.types.mobs import Action
+from pacmanengine.types.simulation import (
+    COIN_SCORE,
+    Collisions,
+    Simulation,
+    SimulationSnapshot,
+)
+
+if TYPE_CHECKING:
+    from pacmanengine.maze_corpus import MazeCorpus
 
 
 @dataclass
 class EnvironmentStep:
     action: Action
     maze_state: MazeState
-    reward: int
+    reward: float
     done: bool
 
 
@@ -17,16 +33,75 @@ class Environment:
     """Defines an environment for training RL-agent for the
     Pacman mob.
 
+    Parameters
+    ----------
+    shape : tuple[int, int], default=(10, 20)
+        Shape of the maze, see `generate_pacmanlike_maze`.
+    seed : int | np.random.SeedSequence, default=42
+        Seed of the random generator the mazes are generated with. Spawn
+        seeds with `np.random.SeedSequence.spawn` to get independent
+        environments.
+    pool : MazePool, optional
+        Pool of pre-generated mazes to take a maze from on reset. If not
+        provided, the maze is generated on reset.
+    algorithm : str, default="aldous_broder"
+        Name of the algorithm mazes are generated with, see
+        `MAZE_ALGORITHMS`. The pool, if provided, generates its own mazes.
+
+    Attributes
+    ----------
+    rng : np.random.Generator
+        Random generator of the environment.
+    episode_timings : dict, optional
+        Timings of the engine phases recorded during the last finished
+        episode, see `Instrumentation.export`. Collected on reset while
+        the instrumentation is enabled.
+    events : EventBus
+        Bus the collisions of every step are published to, see
+        `EventType.COLLISIONS`.
+
     Notes
     -----
     Class follows rules of the Gymnasium environment specifications.
     For more follow the link: https://arxiv.org/abs/2407.17032.
+
+    Rewards are the score gained on a step, and an episode is done once
+    Pacman has no hearts or no coins are left, the same as in
+    `VectorEnvironment`. Both are derived from the collisions of the step
+    and the live coin count of the simulation, so the maze is never scanned.
+
+    The environment runs on a headless `Simulation`, so no sprite-bearing
+    objects are allocated during training, and nothing is published while
+    nobody subscribes to `events`.
     """
 
-    def __init__(self, shape: tuple[int, int] = (10, 20), seed: int = 42) -> None:
+    def __init__(
+        self,
+        shape: tuple[int, int] = (10, 20),
+        seed: int | np.random.SeedSequence = 42,
+        pool: MazePool | None = None,
+        algorithm: str = DEFAULT_MAZE_ALGORITHM,
+    ) -> None:
+        if pool is not None and pool.shape != shape:
+            raise ValueError(
+                f"Shape of the pool must match the shape of the environment: "
+                f"provided {pool.shape}, expected {shape}"
+            )
         self.seed = seed
+        self.rng = np.random.default_rng(seed)
         self.shape = shape
-        self.maze = Maze(shape=self.shape)
+        self.pool = pool
+        self.algorithm = algorithm
+        self.episode_timings: dict | None = None
+        self.events = EventBus()
+        self.simulation = self._create_simulation()
+
+    def _create_simulation(self) -> Simulation:
+        if self.pool is not None:
+            return self.pool.simulation()
+        return Simulation.generate(
+            shape=self.shape, rng=self.rng, algorithm=self.algorithm
+        )
 
     def reset(self) -> EnvironmentStep:
         """Resets the environment:
@@ -36,40 +111,101 @@ class Environment:
         Returns
         -------
         EnvironmentStep
-            Step of the environment.
+            Initial step of the new episode, with no reward and not done.
         """
-        self.maze = Maze(shape=self.shape)
+        if instrumentation.enabled:
+            self.episode_timings = instrumentation.export()
+            instrumentation.reset()
+        self.simulation = self._create_simulation()
+        return EnvironmentStep(
+            action=Action.STAY,
+            maze_state=self.simulation.state(),
+            reward=0.0,
+            done=False,
+        )
 
-    def calculate_reward(self, maze_state: MazeState) -> float:
-        """Calculates the reward of the maze.
+    def load(self, corpus: MazeCorpus, maze_id: int) -> None:
+        """Resets the environment to a maze stored in the corpus.
 
         Parameters
         ----------
-        maze_state : MazeState
-            State of the maze to calculate reward on.
+        corpus : MazeCorpus
+            Corpus of the mazes.
+        maze_id : int
+            Identifier of the maze in the corpus.
+        """
+        if corpus.shape(maze_id) != self.shape:
+            raise ValueError(
+                f"Shape of the maze must match the shape of the environment: "
+                f"provided {corpus.shape(maze_id)}, expected {self.shape}"
+            )
+        self.simulation = corpus.simulation(maze_id)
+
+    def snapshot(self) -> SimulationSnapshot:
+        """Captures the state of the game, e.g. to branch rollouts of a
+        planning agent from it.
+
+        Returns
+        -------
+        SimulationSnapshot
+            Immutable state of the game, see `Simulation.snapshot`.
+        """
+        return self.simulation.snapshot()
+
+    def restore(self, snapshot: SimulationSnapshot) -> None:
+        """Brings the game back to the captured state. Restoring a snapshot
+        of the current maze only copies a few small arrays, a snapshot of
+        another maze replaces the simulation.
+
+        Parameters
+        ----------
+        snapshot : SimulationSnapshot
+            State of the game taken with `snapshot`.
+        """
+        if snapshot.layout is not self.simulation.layout:
+            self.simulation = Simulation.from_snapshot(snapshot)
+            return
+        self.simulation.restore(snapshot)
+
+    def calculate_reward(self, collisions: Collisions) -> float:
+        """Calculates the reward of the step.
+
+        Parameters
+        ----------
+        collisions : Collisions
+            Collisions of the step.
 
         Returns
         -------
         float
-            Calculated reward for the agent.
+            Calculated reward for the agent, the score gained on the step.
         """
-        pass
+        return float(COIN_SCORE) if collisions.coin else 0.0
 
-    def step(self) -> EnvironmentStep:
-        """Makes environment step (moves objects, predicts next
-        best move for Pacman).
+    def step(self, action: Action) -> EnvironmentStep:
+        """Makes environment step (moves ghosts, then moves Pacman
+        according to the action).
+
+        Parameters
+        ----------
+        action : Action
+            Action of the Pacman on the current step.
 
         Returns
         -------
         EnvironmentStep
             Step of the environment.
         """
-        for mob in itertools.chain(self.maze.ghosts, [self.maze.pacman]):
-            mob.move()
-        maze_state = self.maze.state()
-        return EnvironmentStep(
-            reward=self.calculate_reward(maze_state),
-            maze_state=maze_state,
-            action=...,
-            done=...,
-        )
+        with instrumentation.phase("environment.step"):
+            collisions = self.simulation.step(action)
+            self.events.emit(EventType.COLLISIONS, self, collisions)
+            with instrumentation.phase("environment.state"):
+                maze_state = self.simulation.state()
+            with instrumentation.phase("environment.reward"):
+                reward = self.calculate_reward(collisions)
+            return EnvironmentStep(
+                reward=reward,
+                maze_state=maze_state,
+                action=action,
+                done=self.simulation.done,
+            )
@@ -0,0 +1,205 @@
+from __future__ import annotations
+
+from typing import Iterator, Sequence
+
+import numpy as np
+from pacmanengine.algorithms.maze import generate_pacmanlike_maze
+from pacmanengine.types.maze_state import MazeState
+from pacmanengine.types.mobs import Action
+from pacmanengine.types.simulation import Simulation, SimulationSnapshot
+
+
+class EpisodeReplay:
+    """Re-simulates a recorded episode headlessly from its maze and the
+    actions taken by Pacman.
+
+    Parameters
+    ----------
+    layout : np.ndarray
+        A numeric representation of the populated maze the episode was
+        played on.
+    actions : Sequence[int]
+        Actions of Pacman, one per step of the episode.
+    level : int, default=1
+        Level of the maze.
+    keyframe_interval : int, default=1000
+        Number of steps between snapshots kept to jump around the episode.
+
+    Attributes
+    ----------
+    simulation : Simulation
+        Simulation of the episode at `step`.
+    step : int
+        Number of actions applied to the simulation.
+    keyframes : dict[int, SimulationSnapshot]
+        Snapshots of the simulation taken every `keyframe_interval` steps.
+        Filled in as the replay passes them.
+    end : int | None
+        Step after which the game is over, see `Simulation.done`. None
+        until the replay reaches it. Actions recorded after it are never
+        played.
+
+    Notes
+    -----
+    Ghosts are driven by deterministic agents, so the maze and the actions
+    of Pacman define the whole episode. Jumping to a step restores the
+    closest keyframe before it and simulates at most `keyframe_interval`
+    steps from there, unless the replay has not reached that far yet.
+    Steps in between keyframes are played with `Simulation.run`, so
+    reaching step 100 000 for the first time takes about 0.5 s on a 10x20
+    maze.
+
+    Examples
+    --------
+    ```
+    replay = EpisodeReplay.from_seed(shape=(10, 20), seed=7, actions=actions)
+    maze_state = replay.seek(50_000)
+    ```
+    """
+
+    def __init__(
+        self,
+        layout: np.ndarray,
+        actions: Sequence[int],
+        level: int = 1,
+        keyframe_interval: int = 1000,
+    ) -> None:
+        if keyframe_interval < 1:
+            raise ValueError(
+                f"keyframe_interval must be positive: provided {keyframe_interval}"
+            )
+        self.actions = [Action(action) for action in np.asarray(actions).tolist()]
+        self.keyframe_interval = keyframe_interval
+        self.simulation = Simulation(layout=layout, level=level)
+        self.step = 0
+        self.end: int | None = 0 if self.simulation.done else None
+        self.keyframes: dict[int, SimulationSnapshot] = {0: self.simulation.snapshot()}
+
+    @classmethod
+    def from_seed(
+        cls,
+        shape: tuple[int, int],
+        seed: int,
+        actions: Sequence[int],
+        level: int = 1,
+        keyframe_interval: int = 1000,
+    ) -> EpisodeReplay:
+        """Regenerates the maze of the episode from its seed.
+
+        Parameters
+        ----------
+        shape : tuple[int, int]
+            Shape of the maze, see `generate_pacmanlike_maze`.
+        seed : int
+            Seed the maze was generated with, the same as in
+            `MazeCorpusWriter.add`.
+        actions : Sequence[int]
+            Actions of Pacman, one per step of the episode.
+        level : int, default=1
+            Level of the maze.
+        keyframe_interval : int, default=1000
+            Number of steps between snapshots.
+
+        Returns
+        -------
+        EpisodeReplay
+            Replay positioned at the start of the episode.
+        """
+        return cls(
+            layout=generate_pacmanlike_maze(
+                shape=shape, rng=np.random.default_rng(seed)
+            ),
+            actions=actions,
+            level=level,
+            keyframe_interval=keyframe_interval,
+        )
+
+    def __len__(self) -> int:
+        """Number of steps in the episode."""
+        return len(self.actions)
+
+    def _advance(self, stop: int) -> None:
+        """Simulates steps up to `stop`, taking keyframes on the way, and
+        stops early once the game is over."""
+        interval = self.keyframe_interval
+        while self.step < stop:
+            keyframe = (self.step // interval + 1) * interval
+            chunk = self.actions[self.step : min(stop, keyframe)]
+            self.step += self.simulation.run(chunk)
+            if self.step == keyframe:
+                self.keyframes[keyframe] = self.simulation.snapshot()
+            if self.simulation.done:
+                self.end = self.step
+                return
+
+    def _seek(self, step: int) -> None:
+        """Restores the closest keyframe before the step, unless the replay
+        is already in between, and simulates the steps left."""
+        keyframe = min(
+            step // self.keyframe_interval * self.keyframe_interval,
+            max(self.keyframes),
+        )
+        if step < self.step or keyframe > self.step:
+            self.simulation.restore(self.keyframes[keyframe])
+            self.step = keyframe
+        self._advance(step)
+
+    def _check_step(self, step: int) -> None:
+        if not 0 <= step <= len(self):
+            raise IndexError(f"Step must be within [0, {len(self)}]: provided {step}")
+        if self.end is not None and step > self.end:
+            raise IndexError(f"Episode is over after step {self.end}: provided {step}")
+
+    def seek(self, step: int) -> MazeState:
+        """Brings the replay to the state after `step` actions.
+
+        Parameters
+        ----------
+        step : int
+            Number of actions to apply, from 0 to the length of the episode.
+
+        Returns
+        -------
+        MazeState
+            State of the maze after the step.
+
+        Raises
+        ------
+        IndexError
+            If the step lies outside of the episode or after the game is
+            over, see `end`. In the latter case the replay is left at the
+            end of the episode.
+        """
+        self._check_step(step)
+        self._seek(step)
+        self._check_step(step)
+        return self.simulation.state()
+
+    def run(self) -> MazeState:
+        """Replays the episode to the end, i.e. until the game is over or
+        the actions run out.
+
+        Returns
+        -------
+        MazeState
+            Final state of the maze.
+        """
+        self._seek(len(self) if self.end is None else self.end)
+        return self.simulation.state()
+
+    def __iter__(self) -> Iterator[MazeState]:
+        """Replays the episode from the start, yielding the state of the
+        maze after every step until the game is over."""
+        self._seek(0)
+        simulation, interval = self.simulation, self.keyframe_interval
+        for action in self.actions:
+            if simulation.done:
+                self.end = self.step
+                return
+            simulation.step(action)
+            self.step += 1
+            if self.step % interval == 0:
+                self.keyframes[self.step] = simulation.snapshot()
+            yield simulation.state()
+        if simulation.done:
+            self.end = self.step
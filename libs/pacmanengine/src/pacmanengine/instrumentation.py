@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+import json
+from bisect import bisect_right
+from time import perf_counter
+
+HISTOGRAM_BOUNDS: tuple[float, ...] = tuple(1e-6 * 2**power for power in range(25))
+"""Upper bounds of the histogram buckets in seconds, from 1 us to ~16 s. The
+last bucket collects everything above the last bound."""
+
+
+class PhaseStatistics:
+    """Accumulated wall time of a single phase.
+
+    Attributes
+    ----------
+    count : int
+        Number of recorded calls.
+    total : float
+        Total time of the calls in seconds.
+    min, max : float
+        Fastest and slowest calls in seconds.
+    histogram : list[int]
+        Number of calls per bucket of `HISTOGRAM_BOUNDS`.
+    """
+
+    __slots__ = ("count", "total", "min", "max", "histogram")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.min = float("inf")
+        self.max = 0.0
+        self.histogram = [0] * (len(HISTOGRAM_BOUNDS) + 1)
+
+    def add(self, seconds: float) -> None:
+        """Records a single call that took `seconds`."""
+        self.count += 1
+        self.total += seconds
+        if seconds < self.min:
+            self.min = seconds
+        if seconds > self.max:
+            self.max = seconds
+        self.histogram[bisect_right(HISTOGRAM_BOUNDS, seconds)] += 1
+
+    def to_dict(self) -> dict:
+        """Exports statistics as a plain dictionary."""
+        return {
+            "count": self.count,
+            "total": self.total,
+            "mean": self.total / self.count if self.count else 0.0,
+            "min": self.min if self.count else 0.0,
+            "max": self.max,
+            "histogram": self.histogram.copy(),
+        }
+
+
+class _Phase:
+    """Context manager that times a block of code."""
+
+    __slots__ = ("statistics", "start")
+
+    def __init__(self, statistics: PhaseStatistics) -> None:
+        self.statistics = statistics
+        self.start = 0.0
+
+    def __enter__(self) -> _Phase:
+        self.start = perf_counter()
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.statistics.add(perf_counter() - self.start)
+
+
+class _NullPhase:
+    """Context manager that does nothing, used while disabled."""
+
+    __slots__ = ()
+
+    def __enter__(self) -> _NullPhase:
+        return self
+
+    def __exit__(self, *args) -> None:
+        pass
+
+
+_null_phase = _NullPhase()
+
+
+class Instrumentation:
+    """Opt-in wall time instrumentation of the engine phases.
+
+    Phases are named blocks of code, e.g. "environment.step", timed with
+    `phase`. While disabled, `phase` returns a shared no-op context
+    manager, so instrumented code pays for a single attribute check.
+
+    Examples
+    --------
+    ```
+    from pacmanengine.instrumentation import instrumentation
+
+    instrumentation.enable()
+    ...  # Run an episode.
+    print(instrumentation.to_json())
+    instrumentation.reset()
+    ```
+
+    Notes
+    -----
+    Phases may be nested, in which case the time of the inner phase is
+    also included in the outer one. Timings are not thread-safe.
+    """
+
+    def __init__(self) -> None:
+        self.enabled = False
+        self.phases: dict[str, PhaseStatistics] = {}
+
+    def enable(self) -> None:
+        """Starts recording timings."""
+        self.enabled = True
+
+    def disable(self) -> None:
+        """Stops recording timings. Recorded timings are kept."""
+        self.enabled = False
+
+    def reset(self) -> None:
+        """Drops recorded timings."""
+        self.phases.clear()
+
+    def phase(self, name: str) -> _Phase | _NullPhase:
+        """Times a block of code.
+
+        Parameters
+        ----------
+        name : str
+            Name of the phase.
+
+        Returns
+        -------
+        _Phase | _NullPhase
+            Context manager that records the time of the block.
+        """
+        if not self.enabled:
+            return _null_phase
+        statistics = self.phases.get(name)
+        if statistics is None:
+            statistics = self.phases[name] = PhaseStatistics()
+        return _Phase(statistics)
+
+    def export(self) -> dict:
+        """Exports recorded timings.
+
+        Returns
+        -------
+        dict
+            Histogram bounds in seconds under "histogram_bounds", and
+            statistics of every phase under "phases".
+        """
+        return {
+            "histogram_bounds": list(HISTOGRAM_BOUNDS),
+            "phases": {
+                name: statistics.to_dict()
+                for name, statistics in sorted(self.phases.items())
+            },
+        }
+
+    def to_json(self, **kwargs) -> str:
+        """Exports recorded timings as a JSON string, see `export`."""
+        return json.dumps(self.export(), **kwargs)
+
+
+instrumentation = Instrumentation()
+"""Instrumentation shared by the whole engine."""
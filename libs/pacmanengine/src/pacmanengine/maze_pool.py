@@ -0,0 +1,260 @@
+from __future__ import annotations
+
+import threading
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import TYPE_CHECKING
+
+import numpy as np
+from pacmanengine.algorithms.maze import (
+    DEFAULT_MAZE_ALGORITHM,
+    generate_pacmanlike_maze,
+)
+from pacmanengine.types.simulation import Simulation
+
+if TYPE_CHECKING:
+    from pacmanengine.algorithms.agent.ghost.navigation import NavigationTable
+
+
+def _generate(
+    shape: tuple[int, int],
+    navigation: bool,
+    seed: np.random.SeedSequence,
+    algorithm: str = DEFAULT_MAZE_ALGORITHM,
+) -> tuple[np.ndarray, NavigationTable | None]:
+    """Generates a layout of the pool along with its navigation table.
+
+    Parameters
+    ----------
+    shape : tuple[int, int]
+        Shape of the maze, see `generate_pacmanlike_maze`.
+    navigation : bool
+        Whether to precompute the navigation table of the layout.
+    seed : np.random.SeedSequence
+        Seed of the maze.
+    algorithm : str, default="aldous_broder"
+        Name of the maze generation algorithm.
+
+    Returns
+    -------
+    tuple[np.ndarray, NavigationTable | None]
+        Layout of the maze and its navigation table, if requested.
+    """
+    layout = generate_pacmanlike_maze(
+        shape=shape, rng=np.random.default_rng(seed), algorithm=algorithm
+    )
+    if not navigation:
+        return layout, None
+    simulation = Simulation(layout=layout)
+    return simulation.layout, simulation.navigation
+
+
+class MazePool:
+    """Pool of pre-generated mazes handed out on reset of the environment.
+
+    Parameters
+    ----------
+    shape : tuple[int, int], default=(10, 20)
+        Shape of the mazes, see `generate_pacmanlike_maze`.
+    size : int, default=16
+        Number of mazes kept in the pool.
+    refill_threshold : int, optional
+        The producer starts topping the pool up to `size` once fewer than
+        `refill_threshold` mazes are ready or being generated. Defaults to
+        `size`, so the pool is refilled after every handed out maze.
+    reuse : bool, default=False
+        Whether to hand out the same `size` mazes over and over. If False,
+        every maze is handed out once and replaced with a fresh one.
+    producer : str, optional
+        Where mazes are generated: "thread", "process", or None to generate
+        them synchronously on the calling thread.
+    navigation : bool, default=True
+        Whether to precompute navigation tables of the mazes as well.
+    wait : bool, default=True
+        Whether to wait for the producer if the pool is empty. If False, the
+        earliest requested maze is generated synchronously instead.
+    seed : int | np.random.SeedSequence, optional
+        Seed of the pool. Every maze is generated from its own seed spawned
+        from it. Fresh entropy is used if not provided.
+    algorithm : str, default="aldous_broder"
+        Name of the algorithm mazes are generated with, see
+        `MAZE_ALGORITHMS`.
+
+    Attributes
+    ----------
+    hits : int
+        Number of mazes handed out without generating or waiting.
+    misses : int
+        Number of mazes that were not ready when requested.
+
+    Notes
+    -----
+    Seeds are spawned and mazes are handed out in the order of the
+    requests, so a pool with a fixed seed hands out the same mazes every
+    run regardless of the producer.
+    """
+
+    def __init__(
+        self,
+        shape: tuple[int, int] = (10, 20),
+        size: int = 16,
+        refill_threshold: int | None = None,
+        reuse: bool = False,
+        producer: str | None = "thread",
+        navigation: bool = True,
+        wait: bool = True,
+        seed: int | np.random.SeedSequence | None = None,
+        algorithm: str = DEFAULT_MAZE_ALGORITHM,
+    ) -> None:
+        if size < 1:
+            raise ValueError(f"size must be positive: provided {size}")
+        if producer not in ("thread", "process", None):
+            raise ValueError(
+                f"producer must be 'thread', 'process' or None: provided {producer}"
+            )
+        self.shape = shape
+        self.size = size
+        self.refill_threshold = size if refill_threshold is None else refill_threshold
+        self.reuse = reuse
+        self.navigation = navigation
+        self.wait = wait
+        self.algorithm = algorithm
+        self.hits = 0
+        self.misses = 0
+        self.closed = False
+
+        self._seed = (
+            seed
+            if isinstance(seed, np.random.SeedSequence)
+            else np.random.SeedSequence(seed)
+        )
+        self._lock = threading.Lock()
+        self._ready: deque[tuple[np.ndarray, NavigationTable | None]] = deque()
+        # Seeds of the mazes being generated along with their futures.
+        self._pending: deque[tuple[np.random.SeedSequence, Future]] = deque()
+        self._executor: Executor | None = None
+        if producer == "thread":
+            self._executor = ThreadPoolExecutor(max_workers=1)
+        elif producer == "process":
+            self._executor = ProcessPoolExecutor(max_workers=1)
+        self._refill(force=True)
+
+    def __len__(self) -> int:
+        """Number of mazes ready to be handed out."""
+        return len(self._ready)
+
+    def _generate(
+        self, seed: np.random.SeedSequence
+    ) -> tuple[np.ndarray, NavigationTable | None]:
+        return _generate(
+            shape=self.shape,
+            navigation=self.navigation,
+            seed=seed,
+            algorithm=self.algorithm,
+        )
+
+    def _refill(self, force: bool = False) -> None:
+        """Schedules generation of mazes according to the refill policy.
+
+        Parameters
+        ----------
+        force : bool, default=False
+            Whether to top the pool up regardless of `refill_threshold`.
+        """
+        missing = self.size - len(self._ready) - len(self._pending)
+        if missing <= 0 or (not force and self.size - missing >= self.refill_threshold):
+            return
+        for seed in self._seed.spawn(missing):
+            if self._executor is None:
+                self._ready.append(self._generate(seed))
+            else:
+                future = self._executor.submit(
+                    _generate, self.shape, self.navigation, seed, self.algorithm
+                )
+                self._pending.append((seed, future))
+
+    def _collect(self, block: bool) -> None:
+        """Moves generated mazes from the producer to the pool in the order
+        they were requested.
+
+        Parameters
+        ----------
+        block : bool
+            Whether to wait for the earliest requested maze.
+        """
+        if block and self._pending:
+            self._pending[0][1].result()
+        while self._pending and self._pending[0][1].done():
+            self._ready.append(self._pending.popleft()[1].result())
+
+    def get(self) -> tuple[np.ndarray, NavigationTable | None]:
+        """Hands out a maze of the pool.
+
+        Returns
+        -------
+        tuple[np.ndarray, NavigationTable | None]
+            Layout of the maze and its navigation table, if the pool
+            precomputes them. Layouts are shared, so they must not be
+            modified.
+        """
+        if self.closed:
+            raise RuntimeError("Maze pool is closed.")
+        with self._lock:
+            self._collect(block=False)
+            if not self._ready:
+                self.misses += 1
+                if self.wait and self._pending:
+                    self._collect(block=True)
+                elif self._pending:
+                    # The earliest requested maze is generated right here, so
+                    # the mazes keep the order of their seeds.
+                    seed, future = self._pending.popleft()
+                    future.cancel()
+                    self._ready.append(self._generate(seed))
+                else:
+                    self._ready.append(self._generate(self._seed.spawn(1)[0]))
+            else:
+                self.hits += 1
+
+            maze = self._ready.popleft()
+            if self.reuse:
+                self._ready.append(maze)
+            else:
+                self._refill()
+        return maze
+
+    def simulation(self, level: int = 1) -> Simulation:
+        """Creates a simulation of a maze handed out by the pool.
+
+        Parameters
+        ----------
+        level : int, default=1
+            Level of the maze.
+
+        Returns
+        -------
+        Simulation
+            Simulation of the maze.
+        """
+        layout, navigation = self.get()
+        return Simulation(layout=layout, level=level, navigation=navigation)
+
+    def close(self) -> None:
+        """Stops the producer and drops pending mazes."""
+        if self.closed:
+            return
+        self.closed = True
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+        self._pending.clear()
+        self._ready.clear()
+
+    def __enter__(self) -> MazePool:
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def __del__(self) -> None:
+        if not getattr(self, "closed", True):
+            self.close()
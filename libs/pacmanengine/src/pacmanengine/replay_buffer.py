@@ -0,0 +1,310 @@
+from __future__ import annotations
+
+import json
+import os
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+
+_field_dtypes: dict[str, np.dtype] = {
+    "actions": np.dtype(np.int8),
+    "rewards": np.dtype(np.float32),
+    "dones": np.dtype(np.bool_),
+}
+"""Storage types of the per-step fields, observations are typed by the
+schema."""
+
+
+@dataclass
+class ReplayBatch:
+    """Transitions sampled from the `ReplayBuffer`.
+
+    Attributes
+    ----------
+    observations : np.ndarray
+        Observations the actions were taken on, shape (B, ...).
+    actions : np.ndarray
+        Actions taken by Pacman, shape (B,).
+    rewards : np.ndarray
+        Rewards received for the actions, shape (B,).
+    dones : np.ndarray
+        Whether the episode has ended after the actions, shape (B,).
+    next_observations : np.ndarray
+        Observations that followed the actions, shape (B, ...). They belong
+        to the next episode where `dones` is set.
+    """
+
+    observations: np.ndarray
+    actions: np.ndarray
+    rewards: np.ndarray
+    dones: np.ndarray
+    next_observations: np.ndarray
+
+
+class ReplayBuffer:
+    """On-disk ring buffer of steps recorded from several environments.
+
+    Parameters
+    ----------
+    path : str | os.PathLike
+        Directory of the buffer created with `ReplayBuffer.create`.
+
+    Attributes
+    ----------
+    num_envs : int
+        Number of environments the buffer records.
+    capacity : int
+        Number of steps kept per environment. Older steps are overwritten.
+    observation_shape : tuple[int, ...]
+        Shape of a single observation.
+    observation_dtype : np.dtype
+        Type of the observation elements.
+
+    Notes
+    -----
+    Every environment owns its own ring and write cursor, and every field
+    lives in its own memory-mapped file. Writers of different environments
+    never touch the same bytes, so environments can append concurrently
+    from separate threads or processes, each opening the buffer on its own,
+    without locks. Sampling only reads the sampled rows from the files.
+
+    A step is the observation the action was taken on, along with the
+    action, the reward and the done flag that followed it. The next
+    observation of a step is the observation of the following step of the
+    same environment, so the latest step of every environment is not
+    sampled until the next one is appended.
+
+    Examples
+    --------
+    ```
+    buffer = ReplayBuffer.create("replay", num_envs=4, capacity=100_000,
+                                 observation_shape=(21, 41))
+    buffer.extend(observations, actions, rewards, dones)
+    batch = buffer.sample(batch_size=256, rng=np.random.default_rng(0))
+    ```
+    """
+
+    def __init__(self, path: str | os.PathLike) -> None:
+        self.path = Path(path)
+        schema_path = self.path / "schema.json"
+        if not schema_path.exists():
+            raise FileNotFoundError(f"Replay buffer is not found: {self.path}")
+        schema = json.loads(schema_path.read_text())
+        self.num_envs: int = schema["num_envs"]
+        self.capacity: int = schema["capacity"]
+        self.observation_shape: tuple[int, ...] = tuple(schema["observation_shape"])
+        self.observation_dtype = np.dtype(schema["observation_dtype"])
+
+        rings = (self.num_envs, self.capacity)
+        self.observations = np.memmap(
+            self.path / "observations.bin",
+            dtype=self.observation_dtype,
+            mode="r+",
+            shape=(*rings, *self.observation_shape),
+        )
+        self._fields = {
+            name: np.memmap(
+                self.path / f"{name}.bin", dtype=dtype, mode="r+", shape=rings
+            )
+            for name, dtype in _field_dtypes.items()
+        }
+        self.cursors = np.memmap(
+            self.path / "cursors.bin", dtype=np.int64, mode="r+", shape=(self.num_envs,)
+        )
+
+    @classmethod
+    def create(
+        cls,
+        path: str | os.PathLike,
+        num_envs: int,
+        capacity: int,
+        observation_shape: tuple[int, ...],
+        observation_dtype: np.dtype = np.int8,
+    ) -> ReplayBuffer:
+        """Preallocates files of an empty buffer.
+
+        Parameters
+        ----------
+        path : str | os.PathLike
+            Directory of the buffer. Created if it does not exist, an
+            existing buffer is overwritten.
+        num_envs : int
+            Number of environments to record.
+        capacity : int
+            Number of steps kept per environment.
+        observation_shape : tuple[int, ...]
+            Shape of a single observation, e.g. the layout shape (H, W), or
+            `MazeState.observation_shape`.
+        observation_dtype : np.dtype, default=np.int8
+            Type of the observation elements.
+
+        Returns
+        -------
+        ReplayBuffer
+            Buffer opened for appending and sampling.
+        """
+        if num_envs < 1:
+            raise ValueError(f"num_envs must be positive: provided {num_envs}")
+        if capacity < 2:
+            raise ValueError(f"capacity must be at least 2: provided {capacity}")
+        path = Path(path)
+        path.mkdir(parents=True, exist_ok=True)
+
+        rings = (num_envs, capacity)
+        files = {
+            "observations": (np.dtype(observation_dtype), (*rings, *observation_shape)),
+            **{name: (dtype, rings) for name, dtype in _field_dtypes.items()},
+            "cursors": (np.dtype(np.int64), (num_envs,)),
+        }
+        for name, (dtype, shape) in files.items():
+            np.memmap(path / f"{name}.bin", dtype=dtype, mode="w+", shape=shape).flush()
+
+        schema = {
+            "num_envs": num_envs,
+            "capacity": capacity,
+            "observation_shape": list(observation_shape),
+            "observation_dtype": np.dtype(observation_dtype).str,
+        }
+        (path / "schema.json").write_text(json.dumps(schema, indent=2))
+        return cls(path)
+
+    @property
+    def actions(self) -> np.ndarray:
+        """Actions of the steps, shape (N, capacity)."""
+        return self._fields["actions"]
+
+    @property
+    def rewards(self) -> np.ndarray:
+        """Rewards of the steps, shape (N, capacity)."""
+        return self._fields["rewards"]
+
+    @property
+    def dones(self) -> np.ndarray:
+        """Done flags of the steps, shape (N, capacity)."""
+        return self._fields["dones"]
+
+    def _valid_counts(self, cursors: np.ndarray) -> np.ndarray:
+        """Number of sampleable steps of every environment.
+
+        The latest step has no next observation yet, and the oldest slot of
+        a full ring may be in the middle of being overwritten.
+        """
+        return np.clip(np.minimum(cursors, self.capacity - 1) - 1, 0, None)
+
+    def __len__(self) -> int:
+        """Number of steps that can be sampled."""
+        return int(self._valid_counts(np.array(self.cursors)).sum())
+
+    def append(
+        self,
+        env: int,
+        observation: np.ndarray,
+        action: int,
+        reward: float,
+        done: bool,
+    ) -> None:
+        """Records a step of the environment.
+
+        Parameters
+        ----------
+        env : int
+            Index of the environment.
+        observation : np.ndarray
+            Observation the action was taken on.
+        action : int
+            Action taken by Pacman.
+        reward : float
+            Reward received for the action.
+        done : bool
+            Whether the episode has ended after the action.
+        """
+        cursor = int(self.cursors[env])
+        slot = cursor % self.capacity
+        self.observations[env, slot] = observation
+        self.actions[env, slot] = action
+        self.rewards[env, slot] = reward
+        self.dones[env, slot] = done
+        self.cursors[env] = cursor + 1
+
+    def extend(
+        self,
+        observations: np.ndarray,
+        actions: np.ndarray,
+        rewards: np.ndarray,
+        dones: np.ndarray,
+        envs: np.ndarray | None = None,
+    ) -> None:
+        """Records a step of several environments at once, e.g. a step of
+        the `VectorEnvironment`.
+
+        Parameters
+        ----------
+        observations : np.ndarray
+            Observations the actions were taken on, shape (B, ...).
+        actions : np.ndarray
+            Actions taken by Pacman, shape (B,).
+        rewards : np.ndarray
+            Rewards received for the actions, shape (B,).
+        dones : np.ndarray
+            Whether the episodes have ended after the actions, shape (B,).
+        envs : np.ndarray, optional
+            Distinct indices of the environments, shape (B,). Defaults to
+            the first B environments.
+        """
+        if envs is None:
+            envs = np.arange(len(actions))
+        cursors = np.array(self.cursors[envs])
+        slots = cursors % self.capacity
+        self.observations[envs, slots] = observations
+        self.actions[envs, slots] = actions
+        self.rewards[envs, slots] = rewards
+        self.dones[envs, slots] = dones
+        self.cursors[envs] = cursors + 1
+
+    def sample(
+        self, batch_size: int, rng: np.random.Generator | None = None
+    ) -> ReplayBatch:
+        """Samples steps uniformly over all environments.
+
+        Parameters
+        ----------
+        batch_size : int
+            Number of steps to sample, with replacement.
+        rng : np.random.Generator, optional
+            Random generator to sample with.
+
+        Returns
+        -------
+        ReplayBatch
+            Sampled steps along with their next observations.
+        """
+        rng = rng if rng is not None else np.random.default_rng()
+        cursors = np.array(self.cursors)
+        counts = self._valid_counts(cursors)
+        total = int(counts.sum())
+        if total == 0:
+            raise ValueError("Replay buffer has no steps to sample yet.")
+
+        indices = rng.integers(total, size=batch_size)
+        ends = np.cumsum(counts)
+        envs = np.searchsorted(ends, indices, side="right")
+        steps = indices - (ends[envs] - counts[envs])
+        # Steps are counted back from the one preceding the latest.
+        steps = cursors[envs] - 1 - counts[envs] + steps
+        slots = steps % self.capacity
+        next_slots = (steps + 1) % self.capacity
+        return ReplayBatch(
+            observations=self.observations[envs, slots],
+            actions=self.actions[envs, slots],
+            rewards=self.rewards[envs, slots],
+            dones=self.dones[envs, slots],
+            next_observations=self.observations[envs, next_slots],
+        )
+
+    def flush(self) -> None:
+        """Flushes recorded steps to the disk."""
+        self.observations.flush()
+        for array in self._fields.values():
+            array.flush()
+        self.cursors.flush()
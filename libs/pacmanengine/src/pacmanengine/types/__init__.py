@@ -1,6 +1,19 @@
 from pacmanengine.types.animated import Animated
 from pacmanengine.types.collidable import Collidable
 from pacmanengine.types.maze import Maze, MazeState, Tile
+from pacmanengine.types.occupancy import OccupancyGrid
 from pacmanengine.types.position import Position
+from pacmanengine.types.simulation import Collisions, Simulation, SimulationSnapshot
 
-__all__ = [Animated, Collidable, Position, Maze, MazeState, Tile]
+__all__ = [
+    Animated,
+    Collidable,
+    Collisions,
+    Position,
+    Maze,
+    MazeState,
+    OccupancyGrid,
+    Simulation,
+    SimulationSnapshot,
+    Tile,
+]
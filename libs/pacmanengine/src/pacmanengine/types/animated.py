@@ -2,6 +2,10 @@ from __future__ import annotations
 
 from typing import Callable
 
+from pacmanengine.events import EventBus, EventType, SealedEventBus
+
+_SEALED_EVENTS = SealedEventBus()
+
 
 class Animated:
     """Base class for all objects that have sprite and
@@ -11,11 +15,41 @@ class Animated:
     ----------
     gif : str
         Default gif to be displayed.
+    events : EventBus, optional
+        Bus the events of the object are published to. The maze passes its
+        own bus, objects created without one get a bus of their own once
+        the first callback is set.
+
+    Notes
+    -----
+    Objects without a bus publish nothing, so changing them costs no more
+    than setting an attribute. Objects shared between mazes are sealed, see
+    `seal`.
     """
 
-    def __init__(self, gif: str) -> None:
+    __slots__ = ("gif", "events")
+
+    def __init__(self, gif: str, events: EventBus | None = None) -> None:
         self.gif = gif
-        self.on_gif_changed_slot: Callable[..., None] | None = None
+        self.events = events
+
+    def seal(self) -> Animated:
+        """Makes the object refuse subscriptions, as objects shared between
+        mazes would keep subscribers of every maze forever.
+
+        Returns
+        -------
+        Animated
+            The object itself.
+        """
+        self.events = _SEALED_EVENTS
+        return self
+
+    def _event_bus(self) -> EventBus:
+        """Bus of the object, created on the first subscription."""
+        if self.events is None:
+            self.events = EventBus()
+        return self.events
 
     def setGif(self, gif: str) -> None:
         """Change current gif to the one provided.
@@ -26,14 +60,22 @@ class Animated:
             Path to the gif to be used instead.
         """
         self.gif = gif
-        self.on_gif_changed_slot()
+        if self.events is not None:
+            self.events.emit(EventType.GIF_CHANGED, self, gif)
 
-    def on_gif_changed(self, slot: Callable[..., None]) -> None:
-        """Set callback on gif being changed.
+    def on_gif_changed(self, slot: Callable[[], None]) -> Callable[[], None]:
+        """Add callback on gif being changed.
 
         Parameters
         ----------
-        slot : Callable[[Animated], None]
+        slot : Callable[[], None]
             Function to call when gif has changed.
+
+        Returns
+        -------
+        Callable[[], None]
+            Function that removes the callback.
         """
-        self.on_gif_changed_slot = slot
+        return self._event_bus().subscribe(
+            EventType.GIF_CHANGED, lambda source, gif: slot(), source=self
+        )
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from typing import Any, Callable, Type
 
+from pacmanengine.events import EventType
 from pacmanengine.types.position import Position
 
 
@@ -12,30 +13,55 @@ class Collidable:
     ----------
     position : Position
         Current position of the object.
+
+    Notes
+    -----
+    Collidables are also `Animated`, which owns the instance layout and the
+    bus of events, so this class declares no slots itself. Subclasses add
+    `slot_names` to their `__slots__`. Collision callbacks are stored only
+    once one is set, so objects that never react to collisions, like coins,
+    carry no dict.
     """
 
+    __slots__ = ()
+    slot_names: tuple[str, ...] = (
+        "on_collision_slots",
+        "previous_position",
+        "current_position",
+    )
+
     def __init__(self, position: Position) -> None:
-        self.on_collision_slots: dict[Type, Callable[[Collidable], bool]] = {}
-        self.on_position_changed_slot: Callable[[Position], None]
-        self.on_destroy_slot: Callable[[], None]
+        self.on_collision_slots: dict[Type, Callable[[Collidable], bool]] | None = None
 
         self.previous_position = None
         self.current_position = position
 
-    def on_position_changed(self, slot: Callable[[Position], None]) -> None:
-        """Set callback to be called when position have been changed.
+    def on_position_changed(
+        self, slot: Callable[[Position], None]
+    ) -> Callable[[], None]:
+        """Add callback to be called when position have been changed.
 
         Parameters
         ----------
         slot : Callable[[Position], None]
             Function that accepts a new position.
+
+        Returns
+        -------
+        Callable[[], None]
+            Function that removes the callback.
         """
-        self.on_position_changed_slot = slot
+        return self._event_bus().subscribe(
+            EventType.POSITION_CHANGED,
+            lambda source, position: slot(position),
+            source=self,
+        )
 
     def on_collision(
         self, collidable_type: Type, slot: Callable[[Collidable], Any]
     ) -> None:
-        """Set callback to be called when state have been changed.
+        """Set callback to be called when the object collides with an
+        object of the type.
 
         Parameters
         ----------
@@ -43,18 +69,33 @@ class Collidable:
             An instance of type bound to collidable.
         slot : Callable[[State], None]
             Function that accepts other collidable.
+
+        Notes
+        -----
+        The maze calls the callbacks once collisions of a frame are
+        resolved: pacman and every ghost that caught it collide with each
+        other, and pacman collides with the coin it consumes.
         """
+        if self.on_collision_slots is None:
+            self.on_collision_slots = {}
         self.on_collision_slots[collidable_type] = slot
 
-    def on_destroy(self, slot: Callable[[], None]) -> None:
-        """Set callback to be called when object has beed destroyed.
+    def on_destroy(self, slot: Callable[[], None]) -> Callable[[], None]:
+        """Add callback to be called when object has beed destroyed.
 
         Parameters
         ----------
         slot : Callable[[], None]
             Function that accepts not Arguments.
+
+        Returns
+        -------
+        Callable[[], None]
+            Function that removes the callback.
         """
-        self.on_destroy_slot = slot
+        return self._event_bus().subscribe(
+            EventType.DESTROYED, lambda source, value: slot(), source=self
+        )
 
     def setPosition(self, position: Position) -> None:
         """Sets the new state.
@@ -71,7 +112,8 @@ class Collidable:
         """
         self.previous_position = self.current_position
         self.current_position = position
-        self.on_position_changed_slot(position)
+        if self.events is not None:
+            self.events.emit(EventType.POSITION_CHANGED, self, position)
 
     def collision(self, other: Collidable) -> None:
         """Conducts a collision (being present on the same tile with
@@ -82,9 +124,11 @@ class Collidable:
         other : Collidable
             Other object that also can be collided with.
         """
-        if self.on_collision_slots.get(type(other)):
-            self.on_collision_slots[type(other)](other)
+        slot = self.on_collision_slots and self.on_collision_slots.get(type(other))
+        if slot:
+            slot(other)
 
     def destroy(self) -> None:
         """Destroy object."""
-        self.on_destroy_slot()
+        if self.events is not None:
+            self.events.emit(EventType.DESTROYED, self)
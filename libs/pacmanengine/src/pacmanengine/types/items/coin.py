@@ -4,6 +4,8 @@ from .item import Item
 
 
 class Coin(Item):
+    __slots__ = ()
+
     def __init__(
         self,
         position: Position,
@@ -14,6 +14,8 @@ class Item(Animated, Collidable):
         Initial position of the item.
     """
 
+    __slots__ = Collidable.slot_names
+
     def __init__(self, gif: str, initial_position: Position) -> None:
         Animated.__init__(self, gif=gif)
         Collidable.__init__(self, position=initial_position)
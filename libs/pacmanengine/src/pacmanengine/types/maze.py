@@ -1,22 +1,33 @@
-from collections import deque
+from __future__ import annotations
+
+from contextlib import contextmanager
 from dataclasses import dataclass
-from typing import Callable
+from typing import TYPE_CHECKING, Callable, Iterator
 
 import numpy as np
 from pacmanagent.agent import PacmanAgent
-from pacmanengine.algorithms.maze import generate_pacmanlike_maze
-from pacmanengine.algorithms.maze.types import EntityWeight
+from pacmanengine.algorithms.agent.agent import Agent
+from pacmanengine.algorithms.agent.ghost.navigation import NavigationTable
+from pacmanengine.algorithms.maze import DEFAULT_MAZE_ALGORITHM
+from pacmanengine.algorithms.maze.types import CompactLayout
+from pacmanengine.events import EventBus, EventType
+from pacmanengine.instrumentation import instrumentation
 from pacmanengine.types.collidable import Collidable
 from pacmanengine.types.items import Coin
 from pacmanengine.types.maze_state import MazeState
 from pacmanengine.types.mobs import Action, Ghost, GhostType, Mob, Pacman
+from pacmanengine.types.occupancy import OccupancyGrid
 from pacmanengine.types.position import Position
+from pacmanengine.types.simulation import Collisions, Simulation
 
 from .animated import Animated
 from .structure import Floor, Wall, WallType
 
+if TYPE_CHECKING:
+    from pacmanengine.maze_corpus import MazeCorpus
+
 
-@dataclass
+@dataclass(slots=True)
 class Tile:
     """Object that represents a single cell on the
     map.
@@ -24,7 +35,9 @@ class Tile:
     Attributes
     ----------
     objects : list[Animated]
-        A list of objects that tile contains.
+        A list of objects that tile contains: the wall or the floor, and
+        the items placed there. Mobs are not kept in tiles, see
+        `Maze.objects`.
     """
 
     objects: list[Animated]
@@ -68,63 +81,268 @@ class Tile:
 
 
 class Maze:
-    """An oracle object that defines rules of the game
-    and constructs a map.
+    """An oracle object that constructs a map and exposes it as a
+    set of sprite-bearing objects.
 
-    It is responsible for generating maze, populating it with
-    structures/mobs/items. It also provides an interface to access
-    internal part of the maze.
+    It is responsible for populating maze with structures/mobs/items. Rules
+    of the game are applied by the underlying `Simulation`, so the maze
+    is a view layer that keeps objects in sync with the simulation.
+    It also provides an interface to access internal part of the maze.
 
     Parameters
     ----------
     shape : tuple[int, int]
         Shape of the maze.
+    level : int, default=1
+        Level of the maze.
+    simulation : Simulation, optional
+        Simulation to be displayed. If not passed, a new maze of the
+        specified shape is generated.
+    wall_types : np.ndarray, optional
+        Precomputed types of the walls, see `WallType.infer_grid`. Inferred
+        from the layout if not passed.
+    pacman_agent : Agent, optional
+        Agent that controls Pacman. Defaults to `PacmanAgent`, which is
+        controlled by the keyboard.
+    algorithm : str, default="aldous_broder"
+        Name of the algorithm the maze is generated with, see
+        `MAZE_ALGORITHMS`. Ignored if the simulation is passed.
+
+    Attributes
+    ----------
+    events : EventBus
+        Bus the maze, its mobs and coins publish their events to. Events of
+        a `frame` are coalesced, so a single score change is delivered per
+        frame.
+
+    Notes
+    -----
+    Collisions follow the same rule as in the headless `Simulation.step`:
+    mobs move without resolving anything, and collisions of the whole
+    frame are resolved at once by `Simulation.collide`. A move made
+    outside of a `frame` is a frame of its own.
     """
 
-    def __init__(self, shape: tuple[int, int], level: int = 1) -> None:
+    def __init__(
+        self,
+        shape: tuple[int, int],
+        level: int = 1,
+        simulation: Simulation | None = None,
+        wall_types: np.ndarray | None = None,
+        pacman_agent: Agent | None = None,
+        algorithm: str = DEFAULT_MAZE_ALGORITHM,
+    ) -> None:
+        self.simulation = simulation or Simulation.generate(
+            shape=shape, level=level, algorithm=algorithm
+        )
+        self._pacman_agent = pacman_agent
+        self.events = EventBus()
         self.ghosts: list[Ghost] = []
         self.pacman: Pacman | None = None
-        self.score: int = 0
-        self.hearts: int = 3
-        self.level: int = level
+        self._mob_indices: dict[Mob, int] = {}
+        self._in_frame = False
+
+        self.layout = self.simulation.layout
+        self.nrows = self.simulation.nrows
+        self.ncols = self.simulation.ncols
+        self.occupancy = OccupancyGrid((self.nrows, self.ncols))
+        self._positions: list[Position | None] = [None] * (self.nrows * self.ncols)
+        self.tiles: list[Tile] = self._layout_from_map(
+            self.simulation.compact, wall_types=wall_types
+        )
 
-        self.layout = generate_pacmanlike_maze(shape=shape)
-        self.nrows = self.layout.shape[0]
-        self.ncols = self.layout.shape[1]
-        self.tiles: list[Tile] = self._layout_from_map(self.layout)
+    @classmethod
+    def from_corpus(cls, corpus: MazeCorpus, maze_id: int, level: int = 1) -> Maze:
+        """Creates a maze from the layout stored in the corpus.
 
-        self.on_score_changed_slot: Callable[[], None] | None = None
-        self.on_hearts_changed_slot: Callable[[], None] | None = None
+        Parameters
+        ----------
+        corpus : MazeCorpus
+            Corpus of the mazes.
+        maze_id : int
+            Identifier of the maze in the corpus.
+        level : int, default=1
+            Level of the maze.
 
-    def on_score_changed(self, slot: Callable[[], None]) -> None:
-        self.on_score_changed_slot = slot
+        Returns
+        -------
+        Maze
+            Maze with the layout of the corpus.
+        """
+        return cls(
+            shape=corpus.shape(maze_id),
+            simulation=corpus.simulation(maze_id, level=level),
+            wall_types=corpus.wall_types(maze_id),
+        )
 
-    def on_hearts_changed(self, slot: Callable[[], None]) -> None:
-        self.on_hearts_changed_slot = slot
+    @property
+    def score(self) -> int:
+        """Score achieved in the maze."""
+        return self.simulation.score
 
-    def _move_object(self, obj: Mob, delta_x: int, delta_y: int) -> bool:
-        new_position = Position(
-            obj.current_position.pos_x + delta_x, obj.current_position.pos_y + delta_y
+    @property
+    def hearts(self) -> int:
+        """Hearts left in the maze."""
+        return self.simulation.hearts
+
+    @property
+    def remaining_coins(self) -> int:
+        """Number of coins left in the maze."""
+        return self.simulation.remaining_coins
+
+    @property
+    def level(self) -> int:
+        """Level of the maze."""
+        return self.simulation.level
+
+    @property
+    def navigation(self) -> NavigationTable:
+        """Shortest paths of the maze shared by all ghosts."""
+        return self.simulation.navigation
+
+    def on_score_changed(self, slot: Callable[[], None]) -> Callable[[], None]:
+        """Add callback to be called when score has changed.
+
+        Parameters
+        ----------
+        slot : Callable[[], None]
+            Function that accepts no arguments.
+
+        Returns
+        -------
+        Callable[[], None]
+            Function that removes the callback.
+        """
+        return self.events.subscribe(
+            EventType.SCORE_CHANGED, lambda source, score: slot(), source=self
         )
 
-        if new_position.pos_x < 0 or new_position.pos_x >= self.ncols:
-            return False
+    def on_hearts_changed(self, slot: Callable[[], None]) -> Callable[[], None]:
+        """Add callback to be called when the number of hearts has changed.
 
-        if new_position.pos_y < 0 or new_position.pos_y >= self.nrows:
-            return False
+        Parameters
+        ----------
+        slot : Callable[[], None]
+            Function that accepts no arguments.
 
-        next_tile = self.tile(x=new_position.pos_x, y=new_position.pos_y)
+        Returns
+        -------
+        Callable[[], None]
+            Function that removes the callback.
+        """
+        return self.events.subscribe(
+            EventType.HEARTS_CHANGED, lambda source, hearts: slot(), source=self
+        )
 
-        if next_tile.append(obj):
-            previous_tile = self.tile(
-                obj.current_position.pos_x, obj.current_position.pos_x
-            )
-            previous_tile.pop(obj)
-            obj.setPosition(new_position)
-            for collision_obj in next_tile.objects:
-                obj.collision(collision_obj)
-            return True
-        return False
+    def position(self, cell: int) -> Position:
+        """Interned position of the cell, shared by every object placed in
+        it, so moving objects allocates no positions.
+
+        Parameters
+        ----------
+        cell : int
+            Flat index `y * ncols + x` of the cell.
+
+        Returns
+        -------
+        Position
+            Position of the cell.
+        """
+        position = self._positions[cell]
+        if position is None:
+            position = self._positions[cell] = Position.from_cell(cell, self.ncols)
+        return position
+
+    @contextmanager
+    def frame(self) -> Iterator[None]:
+        """Groups moves of the mobs into a single frame. Collisions of the
+        frame are resolved once it is over, see `Simulation.collide`, and
+        events are delivered after that. Nested frames are merged into the
+        outermost one.
+
+        Examples
+        --------
+        ```
+        with maze.frame():
+            maze.pacman.move(maze.state(), action=action)
+            for ghost in maze.ghosts:
+                ghost.move(maze.state())
+        ```
+        """
+        if self._in_frame:
+            yield
+            return
+        self._in_frame = True
+        np.copyto(self.simulation.previous_positions, self.simulation.positions)
+        try:
+            with self.events.tick():
+                yield
+                self._resolve_collisions()
+        finally:
+            self._in_frame = False
+
+    def step(self, action: Action | None = None) -> Collisions:
+        """Makes a frame of the game the same way as `Simulation.step`:
+        ghosts move following their agents, after that pacman takes the
+        action, and collisions of the frame are resolved.
+
+        Parameters
+        ----------
+        action : Action, optional
+            Action of the pacman. Taken from its agent if not passed.
+
+        Returns
+        -------
+        Collisions
+            Collisions of the frame.
+        """
+        with self.frame():
+            maze_state = self.state()
+            for ghost in self.ghosts:
+                ghost.move(maze_state)
+            self.pacman.move(maze_state, action=action)
+        return self.simulation.collisions
+
+    def _resolve_collisions(self) -> Collisions:
+        """Resolves collisions of the frame, syncs the objects with the
+        simulation and calls the collision callbacks of the objects that
+        have collided, see `Collidable.on_collision`."""
+        score, hearts = self.score, self.hearts
+        collisions = self.simulation.collide()
+        for index in collisions.ghosts:
+            ghost = self.ghosts[index]
+            self.pacman.collision(ghost)
+            ghost.collision(self.pacman)
+        if collisions.coin:
+            position = self.pacman.current_position
+            coin = self.occupancy.item(Coin, position.pos_x, position.pos_y)
+            if coin is not None:
+                self.pacman.collision(coin)
+                self.destroy(coin)
+        if self.score != score:
+            self.events.emit(EventType.SCORE_CHANGED, self, self.score)
+        if self.hearts != hearts:
+            self.events.emit(EventType.HEARTS_CHANGED, self, self.hearts)
+        return collisions
+
+    def _move_object(self, obj: Mob, delta_x: int, delta_y: int) -> bool:
+        with instrumentation.phase("maze.move_object"):
+            if self._in_frame:
+                return self._move_mob(obj, delta_x, delta_y)
+            with self.frame():
+                return self._move_mob(obj, delta_x, delta_y)
+
+    def _move_mob(self, obj: Mob, delta_x: int, delta_y: int) -> bool:
+        index = self._mob_indices[obj]
+        if not self.simulation.move(index, delta_x, delta_y, resolve=False):
+            return False
+
+        new_position = self.position(
+            obj.current_position.cell(self.ncols) + delta_y * self.ncols + delta_x
+        )
+        self.occupancy.move(obj, new_position.pos_x, new_position.pos_y)
+        obj.setPosition(new_position)
+        return True
 
     def setScore(self, score: int) -> None:
         """Set the current score.
@@ -136,8 +354,8 @@ class Maze:
         """
         if score < 0:
             return
-        self.score = score
-        self.on_score_changed_slot()
+        self.simulation.score = score
+        self.events.emit(EventType.SCORE_CHANGED, self, score)
 
     def setHearts(self, hearts: int) -> None:
         """Set the number of hearts.
@@ -149,8 +367,8 @@ class Maze:
         """
         if hearts < 0:
             return
-        self.hearts = hearts
-        self.on_hearts_changed_slot()
+        self.simulation.hearts = hearts
+        self.events.emit(EventType.HEARTS_CHANGED, self, hearts)
 
     def destroy(self, obj: Collidable) -> None:
         """Completely removes object from the map.
@@ -160,7 +378,9 @@ class Maze:
         obj : Collidable
             An object to be completely removed from the map.
         """
-        self.tile(obj.current_position.pos_x, obj.current_position.pos_y).pop(obj)
+        self.occupancy.remove(obj)
+        if not isinstance(obj, Mob):
+            self.tile(obj.current_position.pos_x, obj.current_position.pos_y).pop(obj)
         obj.destroy()
 
     def consume_coin(self, coin: Coin) -> None:
@@ -172,7 +392,10 @@ class Maze:
         coin : Coin
             A coin to be consumed.
         """
-        self.setScore(self.score + 50)
+        if self.simulation.consume_coin(
+            x=coin.current_position.pos_x, y=coin.current_position.pos_y
+        ):
+            self.events.emit(EventType.SCORE_CHANGED, self, self.score)
         self.destroy(coin)
 
     def _initialize_movement_callbacks(self, mob: Mob) -> None:
@@ -219,10 +442,20 @@ class Maze:
         Returns
         -------
         Ghost
-            Mob with default movement callbacks already assigned.
+            Mob with default movement callbacks already assigned. It is
+            controlled by the agent of the matching simulation ghost.
         """
-        ghost = Ghost.create(position=initial_position, ghost_type=type, action=action)
+        index = len(self.ghosts)
+        ghost = Ghost.create(
+            position=initial_position,
+            ghost_type=type,
+            action=action,
+            agent=self.simulation.ghost_agents[index],
+        )
+        ghost.events = self.events
         self._initialize_movement_callbacks(mob=ghost)
+        self.occupancy.add(ghost)
+        self._mob_indices[ghost] = index
         self.ghosts.append(ghost)
         return ghost
 
@@ -242,83 +475,81 @@ class Maze:
         Pacman
             Mob with default movement callbacks already assigned.
         """
-        pacman = Pacman(position=initial_position, action=action, agent=PacmanAgent())
+        pacman = Pacman(
+            position=initial_position,
+            action=action,
+            agent=self._pacman_agent or PacmanAgent(),
+        )
+        pacman.events = self.events
         self._initialize_movement_callbacks(pacman)
-        pacman.on_collision(Coin, lambda other: self.consume_coin(coin=other))
-        pacman.on_collision(Ghost, lambda _: self.setHearts(self.hearts - 1))
+        self.occupancy.add(pacman)
+        self._mob_indices[pacman] = self.simulation.pacman
         self.pacman = pacman
         return pacman
 
-    def _unravel_weight(self, layout: np.ndarray, x: int, y: int) -> list[Animated]:
-        """Unravels weight of a specific cell into a list of objects
-        placed there.
-
-        Parameters
-        ----------
-        layout : np.ndarray
-            A numeric representation of a map.
-        x : int
-            A column position of a cell needs to be unraveled.
-        y : int
-            A row position of a cell needs to be unraveled.
-
-        Returns
-        -------
-        list[Animated]
-            A list of objects from the cell.
-        """
-        if layout[y, x] == 1:
-            return [Wall.create(wall_type=WallType.infer(layout=layout, x=x, y=y))]
-
-        result = [Floor()]
-        weight = layout[y, x]
-        ghost_types = deque(GhostType._member_map_.values())
-        while weight > 0:
-            if weight - EntityWeight.GHOST_WEIGHT >= 0:
-                result.append(
-                    self._create_ghost(
-                        initial_position=Position(pos_x=x, pos_y=y),
-                        type=ghost_types.pop(),
-                        action=Action.MOVE_UP,
-                    )
-                )
-                weight -= EntityWeight.GHOST_WEIGHT
-            elif weight - EntityWeight.PACMAN_WEIGHT >= 0:
-                result.append(
-                    self._create_packman(
-                        initial_position=Position(pos_x=x, pos_y=y),
-                        action=Action.MOVE_UP,
-                    )
-                )
-                weight -= EntityWeight.PACMAN_WEIGHT
-            elif weight - EntityWeight.COIN_WEIGHT >= 0:
-                result.append(Coin(position=Position(pos_x=x, pos_y=y)))
-                weight -= EntityWeight.COIN_WEIGHT
-        return result
-
-    def _layout_from_map(self, layout: np.ndarray) -> list[Tile]:
+    def _layout_from_map(
+        self, layout: CompactLayout, wall_types: np.ndarray | None = None
+    ) -> list[Tile]:
         """Generates an object-oriented representation of a populated
-        maze from numeric representation into a 1d array of tiles.
+        maze from its planes into a 1d array of tiles.
 
         Parameters
         ----------
-        layout : np.ndarray
-            A numeric representation of a maze.
+        layout : CompactLayout
+            Planes and spawn points of a maze.
+        wall_types : np.ndarray, optional
+            Precomputed types of the walls. Inferred from the layout if
+            not passed.
 
         Returns
         -------
         list[Tile]
-            A 1d array of tiles.
+            A 1d array of tiles. Floor tiles hold the coin placed there,
+            mobs are only kept in the occupancy grid.
+
+        Notes
+        -----
+        Walls and floors are the shared flyweights, see `Wall.shared` and
+        `Floor.shared`. Nothing ever enters a wall tile, so walls of the
+        same type also share a single tile, and only floor tiles are
+        allocated per cell.
         """
-        result = [None] * layout.size
-
-        for row_index, row in enumerate(layout):
-            for column_index, _ in enumerate(row):
-                result[row_index * self.ncols + column_index] = Tile(
-                    objects=self._unravel_weight(
-                        layout=layout, x=column_index, y=row_index
-                    )
-                )
+        if wall_types is None:
+            wall_types = WallType.infer_grid(layout.walls)
+
+        walls = layout.walls.ravel().tolist()
+        types = wall_types.ravel().tolist()
+        wall_tiles = {
+            wall_type: Tile(objects=[Wall.shared(WallType(wall_type))])
+            for wall_type in np.unique(wall_types[layout.walls == 1]).tolist()
+        }
+        floor = Floor.shared()
+        result = [
+            wall_tiles[wall_type] if wall else Tile(objects=[floor])
+            for wall, wall_type in zip(walls, types)
+        ]
+        for cell in (layout.ghost_spawns @ (self.ncols, 1)).tolist():
+            self._create_ghost(
+                initial_position=self.position(cell),
+                type=self.simulation.ghost_types[len(self.ghosts)],
+                action=Action.MOVE_UP,
+            )
+        self._create_packman(
+            initial_position=self.position(int(layout.pacman_spawn @ (self.ncols, 1))),
+            action=Action.MOVE_UP,
+        )
+        cells = np.flatnonzero(layout.coin_mask())
+        coins = []
+        rows, columns = np.divmod(cells, self.ncols)
+        for index, pos_x, pos_y in zip(cells.tolist(), columns.tolist(), rows.tolist()):
+            position = self._positions[index]
+            if position is None:
+                position = self._positions[index] = Position(pos_x=pos_x, pos_y=pos_y)
+            coin = Coin(position=position)
+            coin.events = self.events
+            result[index].objects.append(coin)
+            coins.append(coin)
+        self.occupancy.add_items(Coin, cells, coins)
 
         return result
 
@@ -351,13 +582,25 @@ class Maze:
 
         return self.tiles[y * self.ncols + x]
 
+    def objects(self, x: int, y: int) -> list[Animated]:
+        """Objects to be displayed in the cell, bottom to top: the wall or
+        the floor, the mobs that occupy the cell, and the items placed there.
+
+        Parameters
+        ----------
+        x : int
+            Column of the cell.
+        y : int
+            Row of the cell.
+
+        Returns
+        -------
+        list[Animated]
+            Objects of the cell. Mobs come in the order they entered it.
+        """
+        base, *items = self.tile(x, y).objects
+        return [base, *self.occupancy.mobs(x, y), *items]
+
     def state(self) -> MazeState:
         """Generates state object for the maze."""
-        return MazeState(
-            ghost_states=[ghost.current_position for ghost in self.ghosts],
-            pacman_state=self.pacman.current_position,
-            score=self.score,
-            hearts=self.hearts,
-            layout=self.layout,
-            level=self.level,
-        )
+        return self.simulation.state()
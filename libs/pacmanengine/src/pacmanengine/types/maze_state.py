@@ -1,8 +1,16 @@
-from dataclasses import dataclass
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
 
 import numpy as np
+from pacmanengine.types.observation import observation_channels, write_observation
 from pacmanengine.types.position import Position
 
+if TYPE_CHECKING:
+    from pacmanengine.algorithms.agent.ghost.navigation import NavigationTable
+    from pacmanengine.algorithms.agent.ghost.state import GhostState
+
 
 @dataclass
 class MazeState:
@@ -11,10 +19,10 @@ class MazeState:
 
     Attributes
     ----------
-    ghost_positions : list[Position]
-        Positions of the individual ghosts.
-    pacman_position : Position
-        Position of the pacman.
+    ghost_cells : tuple[int, ...]
+        Flat indices `y * ncols + x` of the cells of the individual ghosts.
+    pacman_cell : int
+        Flat index of the cell of the pacman.
     score : int
         Score achieved on the current step.
     hearts : int
@@ -22,12 +30,95 @@ class MazeState:
     level : int
         Level of the maze.
     layout : np.ndarray
-        Numerical representation of the Maze.
+        Numerical representation of the Maze the game started from, as
+        produced by `generate_pacmanlike_maze`. It is not updated as mobs
+        move and coins are consumed.
+    navigation : NavigationTable, optional
+        Precomputed shortest paths of the maze. Ghosts fall back to
+        searching paths on the layout if it is not provided.
+    coins : np.ndarray, optional
+        Mask of cells that still contain a coin, shape (H, W). Shared with
+        the simulation rather than copied. If not provided, coins are
+        taken from the layout.
+    remaining_coins : int, optional
+        Number of coins left.
+    ghost_states : list[GhostState]
+        States of the individual ghosts, in the order of `ghost_cells`.
+    walls : np.ndarray, optional
+        Wall plane of the maze of type uint8, where 1 means wall, shape
+        (H, W). States of a `Simulation` share its plane, see
+        `CompactLayout`. Decoded from the layout if not provided.
+
+    Notes
+    -----
+    Cells are plain integers, so they can be used as NumPy indices into
+    the flattened layout. `ghost_positions` and `pacman_position` convert
+    them for the UI.
     """
 
-    ghost_positions: list[Position]
-    pacman_position: Position
+    ghost_cells: tuple[int, ...]
+    pacman_cell: int
     score: int
     hearts: int
     level: int
     layout: np.ndarray
+    navigation: NavigationTable | None = None
+    coins: np.ndarray | None = None
+    remaining_coins: int | None = None
+    ghost_states: list[GhostState] = field(default_factory=list)
+    walls: np.ndarray | None = None
+
+    def __post_init__(self) -> None:
+        if self.walls is None:
+            self.walls = (self.layout == 1).view(np.uint8)
+
+    @property
+    def ncols(self) -> int:
+        """Number of columns of the maze."""
+        return self.layout.shape[1]
+
+    @property
+    def ghost_positions(self) -> list[Position]:
+        """Positions of the individual ghosts."""
+        return [Position.from_cell(cell, self.ncols) for cell in self.ghost_cells]
+
+    @property
+    def pacman_position(self) -> Position:
+        """Position of the pacman."""
+        return Position.from_cell(self.pacman_cell, self.ncols)
+
+    @property
+    def observation_shape(self) -> tuple[int, int, int]:
+        """Shape (C, H, W) of the buffer expected by `observation`."""
+        return (observation_channels(len(self.ghost_cells)), *self.layout.shape)
+
+    def observation(
+        self, out: np.ndarray, previous: MazeState | None = None
+    ) -> np.ndarray:
+        """Writes the state as a stack of feature planes into a preallocated
+        buffer, see `write_observation`.
+
+        Parameters
+        ----------
+        out : np.ndarray
+            Buffer of shape `observation_shape`.
+        previous : MazeState, optional
+            State the buffer was written from on the previous step. If
+            provided, the buffer is updated incrementally.
+
+        Returns
+        -------
+        np.ndarray
+            The `out` buffer.
+
+        Examples
+        --------
+        ```
+        maze_state = environment.simulation.state()
+        buffer = np.empty(maze_state.observation_shape, dtype=np.float32)
+        maze_state.observation(out=buffer)
+        next_state = environment.step(action).maze_state
+        next_state.observation(out=buffer, previous=maze_state)
+        ```
+        """
+        return write_observation(self, out=out, previous=previous)
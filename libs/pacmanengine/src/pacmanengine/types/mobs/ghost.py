@@ -26,7 +26,7 @@ class GhostType(enum.Enum):
     PINK: str = "pink"
 
 
-_ghost_type_to_agent_type = {
+ghost_type_to_agent_type: dict[GhostType, type[Agent]] = {
     GhostType.RED: BlinkyAgent,
     GhostType.BLUE: InkyAgent,
     GhostType.PINK: PinkyAgent,
@@ -35,6 +35,8 @@ _ghost_type_to_agent_type = {
 
 
 class Ghost(Mob):
+    __slots__ = ()
+
     def __init__(
         self,
         move_right_gif: str,
@@ -56,7 +58,13 @@ class Ghost(Mob):
         )
 
     @classmethod
-    def create(cls, position: Position, action: Action, ghost_type: GhostType) -> Ghost:
+    def create(
+        cls,
+        position: Position,
+        action: Action,
+        ghost_type: GhostType,
+        agent: Agent | None = None,
+    ) -> Ghost:
         """Instantiates a Ghost with the specific type.
 
         Parameters
@@ -67,6 +75,9 @@ class Ghost(Mob):
             Initial action the ghost should take.
         ghost_type : GhostType
             Type of the ghost.
+        agent : Agent, optional
+            Agent that controls the ghost. If not passed, a new agent
+            matching the type of the ghost is created.
 
         Returns
         -------
@@ -76,7 +87,7 @@ class Ghost(Mob):
         return cls(
             position=position,
             action=action,
-            agent=_ghost_type_to_agent_type[ghost_type](),
+            agent=agent or ghost_type_to_agent_type[ghost_type](),
             move_right_gif=(
                 f"animations:mobs/ghost/{ghost_type.value}/ghost_move_right.gif"
             ),
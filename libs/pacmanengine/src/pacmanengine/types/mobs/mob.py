@@ -1,14 +1,34 @@
 from __future__ import annotations
 
-from typing import Callable
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Callable, Mapping
 
 from pacmanengine.algorithms.agent.agent import Agent
+from pacmanengine.events import EventType
+from pacmanengine.instrumentation import instrumentation
 from pacmanengine.types.animated import Animated
 from pacmanengine.types.collidable import Collidable
 from pacmanengine.types.mobs.action import Action
 from pacmanengine.types.position import Position
 
 
+@lru_cache(maxsize=None)
+def _action_to_gif(
+    move_up_gif: str, move_down_gif: str, move_left_gif: str, move_right_gif: str
+) -> Mapping[Action, str]:
+    """Read-only table of movement gifs, shared by all mobs with the same
+    gifs, e.g. by every pacman or every ghost of a type."""
+    return MappingProxyType(
+        {
+            Action.MOVE_UP: move_up_gif,
+            Action.MOVE_DOWN: move_down_gif,
+            Action.MOVE_LEFT: move_left_gif,
+            Action.MOVE_RIGHT: move_right_gif,
+        }
+    )
+
+
 class Mob(Animated, Collidable):
     """A class that represents a movable object.
 
@@ -36,8 +56,18 @@ class Mob(Animated, Collidable):
 
     This way you can implement an algorithm of how Ghost
     will behave itself.
+
+    Mobs with the same gifs share a single read-only `action_to_gif` table.
     """
 
+    __slots__ = (
+        *Collidable.slot_names,
+        "agent",
+        "action_to_gif",
+        "action_to_move_slot",
+        "current_action",
+    )
+
     def __init__(
         self,
         move_right_gif: str,
@@ -55,20 +85,15 @@ class Mob(Animated, Collidable):
         Collidable.__init__(self, position=position)
         self.agent = agent
 
-        self.action_to_gif: dict[Action, str] = {
-            Action.MOVE_UP: move_up_gif,
-            Action.MOVE_DOWN: move_down_gif,
-            Action.MOVE_LEFT: move_left_gif,
-            Action.MOVE_RIGHT: move_right_gif,
-        }
+        self.action_to_gif = _action_to_gif(
+            move_up_gif, move_down_gif, move_left_gif, move_right_gif
+        )
         self.action_to_move_slot: dict[Action, Callable[[Mob], bool] | None] = {
             Action.MOVE_UP: None,
             Action.MOVE_DOWN: None,
             Action.MOVE_LEFT: None,
             Action.MOVE_RIGHT: None,
         }
-        self.on_action_changed_slot: Callable[[Action], None]
-        self.on_move_end_slot: Callable[..., None] | None = None
 
         self.current_action = action
 
@@ -76,8 +101,9 @@ class Mob(Animated, Collidable):
         """Method that will be called at the end of
         movement.
         """
-        self.setGif(self.action_to_gif[self.current_action])
-        self.on_move_end_slot()
+        self.setGif(self.action_to_gif.get(self.current_action, self.gif))
+        if self.events is not None:
+            self.events.emit(EventType.MOVE_ENDED, self)
 
     def on_move(self, action: Action, slot: Callable[[Mob], bool]) -> None:
         """Callback that will be called when object will try to move.
@@ -93,28 +119,42 @@ class Mob(Animated, Collidable):
         """
         self.action_to_move_slot[action] = slot
 
-    def on_move_end(self, slot: Callable[..., None]) -> None:
+    def on_move_end(self, slot: Callable[[], None]) -> Callable[[], None]:
         """Callback that will be called at the end of the movement.
 
         Parameters
         ----------
-        slot : Callable[..., None]
+        slot : Callable[[], None]
             Callback that accepts no arguments and returns no
             values.
+
+        Returns
+        -------
+        Callable[[], None]
+            Function that removes the callback.
         """
-        self.on_move_end_slot = slot
+        return self._event_bus().subscribe(
+            EventType.MOVE_ENDED, lambda source, value: slot(), source=self
+        )
 
-    def on_action_changed(self, slot: Callable[[Action], None]) -> None:
-        """Set a callback that will be called after current action of the
+    def on_action_changed(self, slot: Callable[[Action], None]) -> Callable[[], None]:
+        """Add a callback that will be called after current action of the
         mob have been changed.
 
         Parameters
         ----------
-        slot : Callable[..., None]
+        slot : Callable[[Action], None]
             Callback that accepts Action type and returns no
             values.
+
+        Returns
+        -------
+        Callable[[], None]
+            Function that removes the callback.
         """
-        self.on_action_changed_slot = slot
+        return self._event_bus().subscribe(
+            EventType.ACTION_CHANGED, lambda source, action: slot(action), source=self
+        )
 
     def setAction(self, action: Action) -> None:
         """
@@ -124,7 +164,8 @@ class Mob(Animated, Collidable):
             Action to be set as the current action.
         """
         self.current_action = action
-        self.on_action_changed_slot(action)
+        if self.events is not None:
+            self.events.emit(EventType.ACTION_CHANGED, self, action)
 
     def move(self, maze_state, action: Action | None = None) -> None:
         """Method moves object around. You either can pass a
@@ -145,13 +186,18 @@ class Mob(Animated, Collidable):
         if not action and not self.agent:
             raise ValueError("Agent of this mob have not been initialized!")
 
-        if not action and self.agent:
-            action = self.agent.action(
-                starting_position=self.current_position, maze_state=maze_state
-            )
+        with instrumentation.phase("mob.move"):
+            if not action and self.agent:
+                with instrumentation.phase("mob.agent"):
+                    action = self.agent.action(
+                        starting_position=self.current_position.cell(maze_state.ncols),
+                        maze_state=maze_state,
+                    )
 
-        self.setAction(action)
+            self.setAction(action)
 
-        self.action_to_move_slot[action](self)
+            move_slot = self.action_to_move_slot.get(action)
+            if move_slot:
+                move_slot(self)
 
-        self._movement_end()
+            self._movement_end()
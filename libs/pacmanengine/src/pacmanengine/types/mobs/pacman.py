@@ -5,6 +5,8 @@ from pacmanengine.types.position import Position
 
 
 class Pacman(Mob):
+    __slots__ = ()
+
     def __init__(
         self,
         position: Position,
@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import numpy as np
+from pacmanengine.algorithms.maze.types import EntityWeight
+
+if TYPE_CHECKING:
+    from pacmanengine.types.maze_state import MazeState
+
+WALLS_CHANNEL: int = 0
+"""Channel of the observation holding the wall mask."""
+
+COINS_CHANNEL: int = 1
+"""Channel of the observation holding cells that still contain a coin."""
+
+PACMAN_CHANNEL: int = 2
+"""Channel of the observation holding the pacman position."""
+
+GHOSTS_CHANNEL: int = 3
+"""Channel of the observation holding the first ghost position. Every other
+ghost takes the next channel, the ghost mode follows the last ghost."""
+
+
+def observation_channels(n_ghosts: int) -> int:
+    """Number of channels of the observation with `n_ghosts` ghosts."""
+    return GHOSTS_CHANNEL + n_ghosts + 1
+
+
+def _coins_from_layout(layout: np.ndarray) -> np.ndarray:
+    """Extracts the coin mask from the initial layout of the maze."""
+    weights = np.where(layout == 1, 0, layout.astype(np.int64))
+    weights %= EntityWeight.GHOST_WEIGHT
+    weights %= EntityWeight.PACMAN_WEIGHT
+    return weights >= EntityWeight.COIN_WEIGHT
+
+
+def _write_mobs(maze_state: MazeState, out: np.ndarray, value: int) -> None:
+    """Writes pacman, ghosts and ghost modes of the state. With `value`
+    set to 0 it erases them instead."""
+    ncols = maze_state.ncols
+    pos_y, pos_x = divmod(maze_state.pacman_cell, ncols)
+    out[PACMAN_CHANNEL, pos_y, pos_x] = value
+    mode_channel = GHOSTS_CHANNEL + len(maze_state.ghost_cells)
+    for ghost, cell in enumerate(maze_state.ghost_cells):
+        pos_y, pos_x = divmod(cell, ncols)
+        out[GHOSTS_CHANNEL + ghost, pos_y, pos_x] = value
+        out[mode_channel, pos_y, pos_x] = 0
+
+    if not value:
+        return
+    for cell, ghost_state in zip(maze_state.ghost_cells, maze_state.ghost_states):
+        pos_y, pos_x = divmod(cell, ncols)
+        mode = out[mode_channel, pos_y, pos_x]
+        out[mode_channel, pos_y, pos_x] = max(mode, int(ghost_state) + 1)
+
+
+def write_observation(
+    maze_state: MazeState,
+    out: np.ndarray,
+    previous: MazeState | None = None,
+) -> np.ndarray:
+    """Writes the state of the maze as a stack of feature planes.
+
+    Parameters
+    ----------
+    maze_state : MazeState
+        State of the maze to encode.
+    out : np.ndarray
+        Preallocated buffer of shape (C, H, W), see `observation_channels`.
+        Any numeric or boolean dtype is supported.
+    previous : MazeState, optional
+        State the buffer was written from on the previous step. If provided,
+        only cells that could have changed since then are updated,
+        otherwise the buffer is rewritten completely.
+
+    Returns
+    -------
+    np.ndarray
+        The `out` buffer. Channels are, in order: walls, coins, pacman, every
+        ghost in the order of `ghost_cells`, and the ghost mode. The
+        ghost mode plane holds `GhostState + 1` in cells occupied by ghosts,
+        or the largest value if several ghosts share the cell, and 0
+        elsewhere.
+
+    Notes
+    -----
+    The incremental update relies on the rules of the game: walls never
+    change and coins are only consumed by pacman in the cell it enters.
+    It only writes scalars, so it allocates nothing.
+    """
+    n_channels = observation_channels(len(maze_state.ghost_cells))
+    if out.shape != (n_channels, *maze_state.layout.shape):
+        raise ValueError(
+            f"Observation buffer must be of shape "
+            f"{(n_channels, *maze_state.layout.shape)}: provided {out.shape}"
+        )
+
+    if previous is None:
+        np.copyto(out[WALLS_CHANNEL], maze_state.walls, casting="unsafe")
+        coins = maze_state.coins
+        if coins is None:
+            coins = _coins_from_layout(maze_state.layout)
+        np.copyto(out[COINS_CHANNEL], coins, casting="unsafe")
+        out[PACMAN_CHANNEL:] = 0
+    else:
+        _write_mobs(previous, out, value=0)
+        pos_y, pos_x = divmod(maze_state.pacman_cell, maze_state.ncols)
+        out[COINS_CHANNEL, pos_y, pos_x] = 0
+
+    _write_mobs(maze_state, out, value=1)
+    return out
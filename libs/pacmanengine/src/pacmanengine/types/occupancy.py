@@ -0,0 +1,224 @@
+from __future__ import annotations
+
+from typing import TypeVar
+
+import numpy as np
+from pacmanengine.types.collidable import Collidable
+from pacmanengine.types.mobs import Mob
+
+CollidableT = TypeVar("CollidableT", bound=Collidable)
+
+
+class OccupancyGrid:
+    """Spatial index of the collidables placed on the maze.
+
+    Parameters
+    ----------
+    shape : tuple[int, int]
+        Shape of the maze in the form of (H, W).
+
+    Attributes
+    ----------
+    counts : dict[type[Collidable], np.ndarray]
+        Number of objects of the class in every cell, uint8 grids of shape
+        (H, W). A grid is created when the first object of its class is
+        added.
+    mob_cells : dict[Mob, int]
+        Flat index of the cell occupied by every mob.
+
+    Notes
+    -----
+    Items, e.g. coins, never move and at most one item of a class is placed
+    in a cell, so they are kept in flat per-class tables indexed by the
+    cell. Mobs are kept in per-cell buckets that only exist for occupied
+    cells. Adding, moving, removing and looking up objects therefore takes
+    constant time and walks neither the objects of the tiles nor all mobs.
+    """
+
+    def __init__(self, shape: tuple[int, int]) -> None:
+        self.shape = shape
+        self.ncols = shape[1]
+        self.counts: dict[type[Collidable], np.ndarray] = {}
+        self.mob_cells: dict[Mob, int] = {}
+        self._mobs: dict[int, list[Mob]] = {}
+        self._items: dict[type[Collidable], list[Collidable | None]] = {}
+
+    def _cell(self, x: int, y: int) -> int:
+        return y * self.ncols + x
+
+    def _grid(self, cls: type[Collidable]) -> np.ndarray:
+        grid = self.counts.get(cls)
+        if grid is None:
+            grid = self.counts[cls] = np.zeros(self.shape, dtype=np.uint8)
+        return grid
+
+    def _item_table(self, cls: type[Collidable]) -> list[Collidable | None]:
+        items = self._items.get(cls)
+        if items is None:
+            items = self._items[cls] = [None] * (self.shape[0] * self.ncols)
+        return items
+
+    def _enter(self, mob: Mob, cell: int) -> None:
+        self.mob_cells[mob] = cell
+        bucket = self._mobs.get(cell)
+        if bucket is None:
+            self._mobs[cell] = [mob]
+        else:
+            bucket.append(mob)
+
+    def _leave(self, mob: Mob) -> int:
+        cell = self.mob_cells.pop(mob)
+        bucket = self._mobs[cell]
+        bucket.remove(mob)
+        if not bucket:
+            del self._mobs[cell]
+        return cell
+
+    def add(self, obj: Collidable) -> None:
+        """Places the object in the cell of its current position.
+
+        Parameters
+        ----------
+        obj : Collidable
+            Mob or item to be indexed.
+        """
+        x, y = obj.current_position.pos_x, obj.current_position.pos_y
+        self._grid(type(obj))[y, x] += 1
+        if isinstance(obj, Mob):
+            self._enter(obj, self._cell(x, y))
+        else:
+            self._item_table(type(obj))[self._cell(x, y)] = obj
+
+    def add_items(
+        self, cls: type[Collidable], cells: np.ndarray, items: list[Collidable]
+    ) -> None:
+        """Places many items of the class at once, e.g. all coins of a maze.
+
+        Parameters
+        ----------
+        cls : type[Collidable]
+            Class of the items.
+        cells : np.ndarray
+            Distinct flat indices of the cells of the items, shape (N,).
+        items : list[Collidable]
+            Items placed in the cells.
+        """
+        self._grid(cls).ravel()[cells] += 1
+        table = self._item_table(cls)
+        for cell, item in zip(cells.tolist(), items):
+            table[cell] = item
+
+    def move(self, mob: Mob, x: int, y: int) -> None:
+        """Moves the mob to another cell.
+
+        Parameters
+        ----------
+        mob : Mob
+            Indexed mob.
+        x : int
+            Column of the new cell.
+        y : int
+            Row of the new cell.
+        """
+        grid = self.counts[type(mob)]
+        previous_y, previous_x = divmod(self._leave(mob), self.ncols)
+        grid[previous_y, previous_x] -= 1
+        grid[y, x] += 1
+        self._enter(mob, self._cell(x, y))
+
+    def remove(self, obj: Collidable) -> None:
+        """Removes the object from the index.
+
+        Parameters
+        ----------
+        obj : Collidable
+            Indexed mob or item.
+        """
+        if isinstance(obj, Mob):
+            y, x = divmod(self._leave(obj), self.ncols)
+        else:
+            x, y = obj.current_position.pos_x, obj.current_position.pos_y
+            self._items[type(obj)][self._cell(x, y)] = None
+        self.counts[type(obj)][y, x] -= 1
+
+    def count(self, cls: type[Collidable], x: int, y: int) -> int:
+        """Number of objects of the class in the cell.
+
+        Parameters
+        ----------
+        cls : type[Collidable]
+            Exact class of the objects, e.g. `Ghost` or `Coin`.
+        x : int
+            Column of the cell.
+        y : int
+            Row of the cell.
+
+        Returns
+        -------
+        int
+            Number of objects.
+        """
+        grid = self.counts.get(cls)
+        return 0 if grid is None else int(grid[y, x])
+
+    def objects(self, cls: type[CollidableT], x: int, y: int) -> list[CollidableT]:
+        """Objects of the class in the cell, e.g. the ghosts that occupy it.
+
+        Parameters
+        ----------
+        cls : type[Collidable]
+            Exact class of the objects.
+        x : int
+            Column of the cell.
+        y : int
+            Row of the cell.
+
+        Returns
+        -------
+        list[Collidable]
+            Objects in the cell, mobs in the order they entered it.
+        """
+        if not self.count(cls, x, y):
+            return []
+        cell = self._cell(x, y)
+        items = self._items.get(cls)
+        if items is not None:
+            return [items[cell]]
+        return [mob for mob in self._mobs[cell] if type(mob) is cls]
+
+    def mobs(self, x: int, y: int) -> list[Mob]:
+        """Mobs of any class in the cell.
+
+        Parameters
+        ----------
+        x : int
+            Column of the cell.
+        y : int
+            Row of the cell.
+
+        Returns
+        -------
+        list[Mob]
+            Mobs in the cell in the order they entered it.
+        """
+        return list(self._mobs.get(self._cell(x, y), ()))
+
+    def item(self, cls: type[CollidableT], x: int, y: int) -> CollidableT | None:
+        """Item of the class placed in the cell, e.g. a coin.
+
+        Parameters
+        ----------
+        cls : type[Collidable]
+            Exact class of the item.
+        x : int
+            Column of the cell.
+        y : int
+            Row of the cell.
+
+        Returns
+        -------
+        Collidable | None
+            Item in the cell, or None if there is none.
+        """
+        items = self._items.get(cls)
+        return None if items is None else items[self._cell(x, y)]
@@ -1,7 +1,29 @@
+from __future__ import annotations
+
 from dataclasses import dataclass
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Position:
+    """Immutable position of an object displayed on the map.
+
+    Notes
+    -----
+    The engine itself works with flat cell indices `y * ncols + x`, which
+    can be compared, hashed and used as NumPy indices directly. Positions
+    are only built for the objects displayed by the UI, see `cell` and
+    `from_cell` for the conversion.
+    """
+
     pos_x: int
     pos_y: int
+
+    def cell(self, ncols: int) -> int:
+        """Flat index of the position in a maze with `ncols` columns."""
+        return self.pos_y * ncols + self.pos_x
+
+    @classmethod
+    def from_cell(cls, cell: int, ncols: int) -> Position:
+        """Position of the flat cell index in a maze with `ncols` columns."""
+        pos_y, pos_x = divmod(cell, ncols)
+        return cls(pos_x=pos_x, pos_y=pos_y)
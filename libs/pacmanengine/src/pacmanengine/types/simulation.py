@@ -0,0 +1,791 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Sequence
+
+import numpy as np
+from pacmanengine.algorithms.agent.ghost.ghost import GhostAgent
+from pacmanengine.algorithms.agent.ghost.navigation import NavigationTable
+from pacmanengine.algorithms.agent.ghost.state import GhostState
+from pacmanengine.algorithms.maze import (
+    DEFAULT_MAZE_ALGORITHM,
+    generate_pacmanlike_maze,
+)
+from pacmanengine.algorithms.maze.types import CompactLayout, EntityWeight
+from pacmanengine.instrumentation import instrumentation
+from pacmanengine.types.maze_state import MazeState
+from pacmanengine.types.mobs import Action, GhostType
+from pacmanengine.types.mobs.ghost import ghost_type_to_agent_type
+from pacmanengine.types.position import Position
+
+COIN_SCORE: int = 50
+"""Score given for consuming a single coin."""
+
+INITIAL_HEARTS: int = 3
+"""Number of hearts Pacman starts with."""
+
+GHOST_TYPES: tuple[GhostType, ...] = (
+    GhostType.PINK,
+    GhostType.BLUE,
+    GhostType.ORANGE,
+    GhostType.RED,
+)
+"""Types of the ghosts in the order they are spawned."""
+
+ACTION_DELTAS = np.zeros((max(Action) + 1, 2), dtype=np.int64)
+"""Movement deltas in the form of (dY, dX), indexed by the Action value."""
+ACTION_DELTAS[Action.MOVE_UP] = (-1, 0)
+ACTION_DELTAS[Action.MOVE_DOWN] = (1, 0)
+ACTION_DELTAS[Action.MOVE_LEFT] = (0, -1)
+ACTION_DELTAS[Action.MOVE_RIGHT] = (0, 1)
+
+
+def unravel_layout(
+    layout: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Unravels weights of a populated layout into separate arrays.
+
+    Parameters
+    ----------
+    layout : np.ndarray
+        A numeric representation of a populated maze, as produced by
+        `generate_pacmanlike_maze`.
+
+    Returns
+    -------
+    tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]
+        Wall mask (H, W), coin mask (H, W), pacman position (2,) and ghost
+        positions (G, 2). Positions are in the format (Y, X), ghosts
+        are ordered row by row.
+    """
+    compact = CompactLayout.from_layout(layout)
+    return (
+        compact.walls.view(np.bool_),
+        compact.coin_mask(),
+        compact.pacman_spawn,
+        compact.ghost_spawns,
+    )
+
+
+def unravel_layouts(
+    layouts: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Unravels weights of a batch of populated layouts, see
+    `unravel_layout`.
+
+    Parameters
+    ----------
+    layouts : np.ndarray
+        Populated layouts of shape (N, H, W), e.g. the output of
+        `generate_pacmanlike_mazes`. Every layout must contain the same
+        number of ghosts.
+
+    Returns
+    -------
+    tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]
+        Wall masks (N, H, W), coin masks (N, H, W), pacman positions (N, 2)
+        and ghost positions (N, G, 2).
+    """
+    walls = layouts == 1
+    weights = np.where(walls, 0, layouts).astype(np.int64)
+    ghosts, weights = np.divmod(weights, EntityWeight.GHOST_WEIGHT)
+    pacman, weights = np.divmod(weights, EntityWeight.PACMAN_WEIGHT)
+    coins = weights // EntityWeight.COIN_WEIGHT > 0
+
+    n_layouts = len(layouts)
+    n_pacmans = np.count_nonzero(pacman.reshape(n_layouts, -1), axis=1)
+    if (n_pacmans != 1).any():
+        raise ValueError(
+            f"Every layout must contain exactly one pacman: provided {n_pacmans}"
+        )
+    n_ghosts = ghosts.reshape(n_layouts, -1).sum(axis=1)
+    if n_layouts and (n_ghosts != n_ghosts[0]).any():
+        raise ValueError(
+            f"Every layout must contain the same number of ghosts: "
+            f"provided {n_ghosts}"
+        )
+
+    pacman_positions = np.argwhere(pacman)[:, 1:]
+    ghost_cells = np.argwhere(ghosts)
+    ghost_positions = np.repeat(ghost_cells[:, 1:], ghosts[ghosts > 0], axis=0)
+    return (
+        walls,
+        coins,
+        pacman_positions,
+        ghost_positions.reshape(n_layouts, -1, 2),
+    )
+
+
+@dataclass(frozen=True)
+class Collisions:
+    """Collisions resolved at the end of a step, see `Simulation.collide`.
+
+    Attributes
+    ----------
+    ghosts : tuple[int, ...]
+        Indices of the ghosts that caught pacman, each costing a heart.
+    swaps : tuple[int, ...]
+        Indices of the ghosts among `ghosts` that caught pacman by
+        swapping cells with it, i.e. passing through each other.
+    coin : bool
+        Whether pacman picked up a coin.
+    """
+
+    ghosts: tuple[int, ...] = ()
+    swaps: tuple[int, ...] = ()
+    coin: bool = False
+
+
+@dataclass(frozen=True)
+class SimulationSnapshot:
+    """Immutable copy of the dynamic state of a simulation, see
+    `Simulation.snapshot`.
+
+    Attributes
+    ----------
+    layout : np.ndarray | CompactLayout
+        Layout the simulation was created from. Shared, not copied.
+    level : int
+        Level of the maze.
+    navigation : NavigationTable | None
+        Navigation table of the simulation, if it has been built.
+    positions : np.ndarray
+        Read-only positions of mobs, shape (G + 1, 2).
+    coins : np.ndarray
+        Read-only mask of cells that still contain a coin, shape (H, W).
+    remaining_coins : int
+        Number of coins left.
+    score : int
+        Score of the game.
+    hearts : int
+        Hearts left.
+    ghost_counters : tuple[int, ...]
+        Step counters of the ghost agents.
+    ghost_states : tuple[GhostState, ...]
+        States of the ghost agents.
+    """
+
+    layout: np.ndarray | CompactLayout
+    level: int
+    navigation: NavigationTable | None
+    positions: np.ndarray
+    coins: np.ndarray
+    remaining_coins: int
+    score: int
+    hearts: int
+    ghost_counters: tuple[int, ...]
+    ghost_states: tuple[GhostState, ...]
+
+
+class Simulation:
+    """Headless core of the game. Holds the state of a single maze in
+    flat NumPy arrays and implements rules of the game on top of them.
+
+    Parameters
+    ----------
+    layout : np.ndarray | CompactLayout
+        A numeric representation of a populated maze, or the same maze
+        already decoded into planes.
+    level : int, default=1
+        Level of the maze.
+    navigation : NavigationTable, optional
+        Precomputed shortest paths of the layout. Built on the first access
+        if not provided.
+
+    Attributes
+    ----------
+    compact : CompactLayout
+        Planes of the layout. Walls are shared with `walls`.
+    walls : np.ndarray
+        Wall mask of shape (H, W).
+    coins : np.ndarray
+        Mask of cells that still contain a coin, shape (H, W).
+    remaining_coins : int
+        Number of coins left, kept in sync with `coins` by `consume_coin`
+        so it never has to be counted.
+    positions : np.ndarray
+        Positions of mobs in the format (Y, X), shape (G + 1, 2). Ghosts
+        come first, in the order of `ghost_types`, pacman is the last one.
+    pacman : int
+        Index of pacman in `positions`.
+    ghost_agents : list[GhostAgent]
+        Agents that control ghosts.
+    navigation : NavigationTable
+        Shortest paths of the maze shared by all ghosts, built on the
+        first access. Larger mazes get a compact table, see
+        `NavigationTable`.
+    previous_positions : np.ndarray
+        Positions of mobs at the start of the last step, shape (G + 1, 2).
+    collisions : Collisions
+        Collisions resolved at the end of the last step.
+
+    Notes
+    -----
+    Mobs can not go through walls or leave the maze. During a `step` all
+    mobs move first, then collisions of the whole step are resolved at
+    once, see `collide`. Pacman loses a heart per ghost it meets and
+    consumes the coin of the cell it enters.
+
+    A single `move` is resolved by the same rule right away, as a step in
+    which only that mob has moved. `Maze` groups moves of its mobs into
+    frames the same way, so the UI and the headless environments play the
+    same game.
+    """
+
+    def __init__(
+        self,
+        layout: np.ndarray | CompactLayout,
+        level: int = 1,
+        navigation: NavigationTable | None = None,
+    ) -> None:
+        if isinstance(layout, CompactLayout):
+            compact = layout
+        else:
+            compact = CompactLayout.from_layout(layout)
+        pacman_position, ghost_positions = compact.pacman_spawn, compact.ghost_spawns
+        if len(ghost_positions) > len(GHOST_TYPES):
+            raise ValueError(
+                f"Layout must contain at most {len(GHOST_TYPES)} ghosts: "
+                f"provided {len(ghost_positions)}"
+            )
+
+        self.layout = layout
+        self.compact = compact
+        self._weighted_layout: np.ndarray | None = (
+            None if isinstance(layout, CompactLayout) else layout
+        )
+        self.level = level
+        self.nrows, self.ncols = compact.shape
+        self.score: int = 0
+        self.hearts: int = INITIAL_HEARTS
+
+        self.walls = compact.walls.view(np.bool_)
+        self.coins = compact.coin_mask()
+        self.remaining_coins = int(np.count_nonzero(self.coins))
+        # Previous and current positions share a buffer, so collisions encode
+        # both into cells with a single array operation.
+        self._trail = np.empty((2, len(ghost_positions) + 1, 2), dtype=np.int64)
+        self.previous_positions, self.positions = self._trail
+        self.positions[:] = np.vstack([ghost_positions, pacman_position[None, :]])
+        self.previous_positions[:] = self.positions
+        self.pacman = len(ghost_positions)
+        self.collisions = Collisions()
+        self._cell_strides = np.array([self.ncols, 1], dtype=np.int64)
+
+        self.ghost_types = GHOST_TYPES[: len(ghost_positions)]
+        self.ghost_agents: list[GhostAgent] = [
+            ghost_type_to_agent_type[ghost_type]() for ghost_type in self.ghost_types
+        ]
+        self._navigation = navigation
+        self._tables: tuple[list[list[int]], list[int], list[list[bool]]] | None = None
+
+    @property
+    def navigation(self) -> NavigationTable:
+        """Shortest paths between all floor cells of the maze."""
+        if self._navigation is None:
+            self._navigation = NavigationTable(layout=self.compact.walls)
+        return self._navigation
+
+    @property
+    def weighted_layout(self) -> np.ndarray:
+        """Layout the simulation was created from, encoded the same way as
+        the output of `generate_pacmanlike_maze`. Decoded once if the
+        simulation was created from planes."""
+        if self._weighted_layout is None:
+            self._weighted_layout = self.compact.to_layout()
+        return self._weighted_layout
+
+    @classmethod
+    def generate(
+        cls,
+        shape: tuple[int, int],
+        level: int = 1,
+        rng: np.random.Generator | None = None,
+        algorithm: str = DEFAULT_MAZE_ALGORITHM,
+    ) -> Simulation:
+        """Generates a new pacman-like maze and creates a simulation of it.
+
+        Parameters
+        ----------
+        shape : tuple[int, int]
+            Shape of the maze, see `generate_pacmanlike_maze`.
+        level : int, default=1
+            Level of the maze.
+        rng : np.random.Generator, optional
+            Random generator of the maze.
+        algorithm : str, default="aldous_broder"
+            Name of the maze generation algorithm, see `MAZE_ALGORITHMS`.
+
+        Returns
+        -------
+        Simulation
+            Simulation of the freshly generated maze.
+        """
+        layout = generate_pacmanlike_maze(shape=shape, rng=rng, algorithm=algorithm)
+        return cls(layout=layout, level=level)
+
+    @property
+    def done(self) -> bool:
+        """Whether the game is over, i.e. pacman has no hearts or no coins
+        are left."""
+        return self.hearts == 0 or self.remaining_coins == 0
+
+    @property
+    def ghosts(self) -> range:
+        """Indices of ghosts in `positions`."""
+        return range(self.pacman)
+
+    def position(self, mob: int) -> Position:
+        """Position of the mob.
+
+        Parameters
+        ----------
+        mob : int
+            Index of the mob in `positions`.
+
+        Returns
+        -------
+        Position
+            Current position of the mob.
+        """
+        pos_y, pos_x = self.positions[mob].tolist()
+        return Position(pos_x=pos_x, pos_y=pos_y)
+
+    def ghosts_at(self, x: int, y: int) -> int:
+        """Counts ghosts placed in the cell.
+
+        Parameters
+        ----------
+        x : int
+            Column of the cell.
+        y : int
+            Row of the cell.
+
+        Returns
+        -------
+        int
+            Number of ghosts in the cell (x, y).
+        """
+        ghost_positions = self.positions[: self.pacman]
+        return int(
+            np.count_nonzero(
+                (ghost_positions[:, 0] == y) & (ghost_positions[:, 1] == x)
+            )
+        )
+
+    def consume_coin(self, x: int, y: int) -> bool:
+        """Consumes coin placed in the cell, which means it will be deleted
+        from map and score will be increased by `COIN_SCORE` points.
+
+        Parameters
+        ----------
+        x : int
+            Column of the cell.
+        y : int
+            Row of the cell.
+
+        Returns
+        -------
+        bool
+            True if there was a coin to consume, otherwise False.
+        """
+        if not self.coins[y, x]:
+            return False
+        self.coins[y, x] = False
+        self.remaining_coins -= 1
+        self.score += COIN_SCORE
+        return True
+
+    def move(self, mob: int, delta_x: int, delta_y: int, resolve: bool = True) -> bool:
+        """Moves the mob and resolves collisions of the move, see `collide`.
+
+        Parameters
+        ----------
+        mob : int
+            Index of the mob in `positions`.
+        delta_x : int
+            Shift along the columns.
+        delta_y : int
+            Shift along the rows.
+        resolve : bool, default=True
+            Whether to resolve collisions of the move right away. Steps
+            and frames of `Maze` move all mobs without it and resolve
+            collisions of the whole step with `collide`.
+
+        Returns
+        -------
+        bool
+            True if the mob has moved, otherwise False.
+        """
+        new_y = int(self.positions[mob, 0]) + delta_y
+        new_x = int(self.positions[mob, 1]) + delta_x
+
+        if new_x < 0 or new_x >= self.ncols:
+            return False
+
+        if new_y < 0 or new_y >= self.nrows:
+            return False
+
+        if self.walls[new_y, new_x]:
+            return False
+
+        if resolve:
+            np.copyto(self.previous_positions, self.positions)
+        self.positions[mob] = new_y, new_x
+        if resolve:
+            self.collide()
+        return True
+
+    def act(self, mob: int, action: Action, resolve: bool = True) -> bool:
+        """Moves the mob according to the action.
+
+        Parameters
+        ----------
+        mob : int
+            Index of the mob in `positions`.
+        action : Action
+            Action to be taken by the mob.
+        resolve : bool, default=True
+            Whether to resolve collisions of the move right away, see
+            `move`.
+
+        Returns
+        -------
+        bool
+            True if the mob has moved, otherwise False.
+        """
+        if action == Action.STAY:
+            return False
+        delta_y, delta_x = ACTION_DELTAS[action]
+        return self.move(
+            mob, delta_x=int(delta_x), delta_y=int(delta_y), resolve=resolve
+        )
+
+    def collide(self) -> Collisions:
+        """Resolves collisions of all mobs between `previous_positions` and
+        `positions` in a single pass.
+
+        A ghost catches pacman if they end up in the same cell and at least
+        one of them has moved, or if they have swapped cells, i.e. passed
+        through each other. Pacman loses a heart per ghost that caught it,
+        and consumes the coin of the cell it has entered.
+
+        Returns
+        -------
+        Collisions
+            Collisions of the step, also kept in `collisions`.
+        """
+        previous, cells = (self._trail @ self._cell_strides).tolist()
+        pacman, previous_pacman = cells[self.pacman], previous[self.pacman]
+        pacman_moved = pacman != previous_pacman
+
+        # Cells of all mobs are encoded at once, the handful of ghosts is
+        # then cheaper to compare as plain integers than with more arrays.
+        hits, swaps = [], []
+        for ghost in self.ghosts:
+            cell, previous_cell = cells[ghost], previous[ghost]
+            if pacman_moved and cell == previous_pacman and previous_cell == pacman:
+                swaps.append(ghost)
+                hits.append(ghost)
+            elif cell == pacman and (pacman_moved or cell != previous_cell):
+                hits.append(ghost)
+
+        self.hearts = max(self.hearts - len(hits), 0)
+        pos_y, pos_x = divmod(pacman, self.ncols)
+        coin = pacman_moved and self.consume_coin(x=pos_x, y=pos_y)
+        self.collisions = Collisions(ghosts=tuple(hits), swaps=tuple(swaps), coin=coin)
+        return self.collisions
+
+    def step(self, action: Action) -> Collisions:
+        """Makes a step of the game: ghosts move following their agents,
+        after that pacman takes the action, and collisions of the step are
+        resolved, see `collide`.
+
+        Parameters
+        ----------
+        action : Action
+            Action of the pacman.
+
+        Returns
+        -------
+        Collisions
+            Collisions of the step.
+        """
+        with instrumentation.phase("simulation.step"):
+            np.copyto(self.previous_positions, self.positions)
+            maze_state = self.state()
+            # Ghosts only move themselves, so their positions in the state
+            # stay current until their turn.
+            for ghost, agent, cell in zip(
+                self.ghosts, self.ghost_agents, maze_state.ghost_cells
+            ):
+                ghost_action = agent.action(
+                    starting_position=cell, maze_state=maze_state
+                )
+                with instrumentation.phase("simulation.move"):
+                    self.act(ghost, ghost_action, resolve=False)
+            with instrumentation.phase("simulation.move"):
+                self.act(self.pacman, action, resolve=False)
+            with instrumentation.phase("simulation.collide"):
+                return self.collide()
+
+    def _run_tables(self) -> tuple[list[list[int]], list[int], list[list[bool]]]:
+        """Tables of `run`, built once per simulation.
+
+        Returns
+        -------
+        tuple[list[list[int]], list[int], list[list[bool]]]
+            Cell pacman ends up in after taking every action from every
+            cell, indexed by the action value and the flat index of the
+            cell. Home cells of the ghosts. Whether every ghost scatters at
+            every value of its counter below the end of its last scatter
+            interval.
+        """
+        if self._tables is not None:
+            return self._tables
+        rows, columns = np.divmod(np.arange(self.walls.size), self.ncols)
+        cells = np.arange(self.walls.size)
+        moves = [cells.tolist()] * len(ACTION_DELTAS)
+        for action in (
+            Action.MOVE_UP,
+            Action.MOVE_DOWN,
+            Action.MOVE_LEFT,
+            Action.MOVE_RIGHT,
+        ):
+            delta_y, delta_x = ACTION_DELTAS[action]
+            new_rows, new_columns = rows + delta_y, columns + delta_x
+            inside = (
+                (new_rows >= 0)
+                & (new_rows < self.nrows)
+                & (new_columns >= 0)
+                & (new_columns < self.ncols)
+            )
+            new_cells = np.where(inside, new_rows * self.ncols + new_columns, cells)
+            moves[action] = np.where(
+                self.walls.ravel()[new_cells], cells, new_cells
+            ).tolist()
+
+        homes = [agent.home_position.cell(self.ncols) for agent in self.ghost_agents]
+        scatters = [
+            [
+                any(start <= counter < stop for start, stop in agent.scatter_intervals)
+                for counter in range(
+                    max((stop for _, stop in agent.scatter_intervals), default=0)
+                )
+            ]
+            for agent in self.ghost_agents
+        ]
+        self._tables = moves, homes, scatters
+        return self._tables
+
+    def _default_ghosts(self) -> bool:
+        """Whether all ghosts follow the default targeting and pathfinding
+        of `GhostAgent` over the navigation table."""
+        return all(
+            type(agent).action is GhostAgent.action
+            and type(agent).choose_ending_position is GhostAgent.choose_ending_position
+            and type(agent).choose_next_position is GhostAgent.choose_next_position
+            for agent in self.ghost_agents
+        )
+
+    def run(self, actions: Sequence[Action]) -> int:
+        """Plays the actions of pacman one step after another until the game
+        is over, the same way as calling `step` with each of them.
+
+        Parameters
+        ----------
+        actions : Sequence[Action]
+            Actions of pacman, one per step.
+
+        Returns
+        -------
+        int
+            Number of steps played, less than the number of actions if the
+            game is over before they run out, see `done`.
+
+        Notes
+        -----
+        Steps are played on plain integers: ghosts look their next cell up
+        in the navigation table, pacman in a table of moves, and collisions
+        are resolved on flat cells by the rule of `collide`. Neither states
+        of the maze nor instrumentation phases are produced on the way, and
+        the arrays of the simulation are only updated once the actions are
+        played, which makes a step about 6 times cheaper than `step`.
+
+        Ghosts whose agents override the default behaviour of `GhostAgent`,
+        or mazes without the navigation table, are played with `step`.
+        """
+        if not self._default_ghosts():
+            played = 0
+            for action in actions:
+                if self.done:
+                    break
+                self.step(action)
+                played += 1
+            return played
+
+        ncols, pacman, agents = self.ncols, self.pacman, self.ghost_agents
+        next_cell = self.navigation.next_cell
+        moves, homes, scatters = self._run_tables()
+        counters = [agent.counter for agent in agents]
+        scattering = [agent.state == GhostState.SCATTER for agent in agents]
+        coins = self.coins.ravel().tolist()
+        score, hearts, remaining_coins = self.score, self.hearts, self.remaining_coins
+
+        cells = (self.positions @ self._cell_strides).tolist()
+        played = 0
+        for action in actions:
+            if hearts == 0 or remaining_coins == 0:
+                break
+            previous = cells[:]
+            previous_pacman = cells[pacman]
+            for ghost in range(pacman):
+                counter, scatter = counters[ghost], scatters[ghost]
+                scattering[ghost] = counter < len(scatter) and scatter[counter]
+                target = homes[ghost] if scattering[ghost] else previous_pacman
+                cells[ghost] = next_cell(cells[ghost], target)
+                counters[ghost] = counter + 1
+            cell = cells[pacman] = moves[action][previous_pacman]
+
+            pacman_moved = cell != previous_pacman
+            hits, swaps = [], []
+            for ghost in range(pacman):
+                ghost_cell, previous_cell = cells[ghost], previous[ghost]
+                if (
+                    pacman_moved
+                    and ghost_cell == previous_pacman
+                    and previous_cell == cell
+                ):
+                    swaps.append(ghost)
+                    hits.append(ghost)
+                elif ghost_cell == cell and (
+                    pacman_moved or ghost_cell != previous_cell
+                ):
+                    hits.append(ghost)
+            hearts = max(hearts - len(hits), 0)
+            coin = pacman_moved and coins[cell]
+            if coin:
+                coins[cell] = False
+                remaining_coins -= 1
+                score += COIN_SCORE
+            played += 1
+
+        if not played:
+            return 0
+        self._trail[:] = np.stack(np.divmod([previous, cells], ncols), axis=-1)
+        self.coins[:] = np.reshape(coins, self.coins.shape)
+        self.score, self.hearts, self.remaining_coins = score, hearts, remaining_coins
+        self.collisions = Collisions(ghosts=tuple(hits), swaps=tuple(swaps), coin=coin)
+        for agent, counter, scatter in zip(agents, counters, scattering):
+            agent.counter = counter
+            agent.state = GhostState.SCATTER if scatter else GhostState.CHASE
+        return played
+
+    def snapshot(self) -> SimulationSnapshot:
+        """Captures the dynamic state of the game, so it can be restored
+        later with `restore`.
+
+        Returns
+        -------
+        SimulationSnapshot
+            Immutable copy of positions, coins, score, hearts and the
+            state of the ghost agents.
+        """
+        positions = self.positions.copy()
+        positions.flags.writeable = False
+        coins = self.coins.copy()
+        coins.flags.writeable = False
+        return SimulationSnapshot(
+            layout=self.layout,
+            level=self.level,
+            navigation=self._navigation,
+            positions=positions,
+            coins=coins,
+            remaining_coins=self.remaining_coins,
+            score=self.score,
+            hearts=self.hearts,
+            ghost_counters=tuple(agent.counter for agent in self.ghost_agents),
+            ghost_states=tuple(agent.state for agent in self.ghost_agents),
+        )
+
+    def restore(self, snapshot: SimulationSnapshot) -> None:
+        """Brings the game back to the captured state. Arrays of the
+        simulation are overwritten in place.
+
+        Parameters
+        ----------
+        snapshot : SimulationSnapshot
+            Snapshot taken from a simulation of the same layout.
+        """
+        if snapshot.layout is not self.layout:
+            raise ValueError("Snapshot was taken from a simulation of another layout.")
+        np.copyto(self.positions, snapshot.positions)
+        np.copyto(self.coins, snapshot.coins)
+        self.remaining_coins = snapshot.remaining_coins
+        self.score = snapshot.score
+        self.hearts = snapshot.hearts
+        for agent, counter, state in zip(
+            self.ghost_agents, snapshot.ghost_counters, snapshot.ghost_states
+        ):
+            agent.counter = counter
+            agent.state = state
+
+    @classmethod
+    def from_snapshot(cls, snapshot: SimulationSnapshot) -> Simulation:
+        """Creates a new simulation in the captured state.
+
+        Parameters
+        ----------
+        snapshot : SimulationSnapshot
+            Snapshot of the game.
+
+        Returns
+        -------
+        Simulation
+            Simulation of the snapshot layout restored to its state.
+        """
+        simulation = cls(
+            layout=snapshot.layout,
+            level=snapshot.level,
+            navigation=snapshot.navigation,
+        )
+        simulation.restore(snapshot)
+        return simulation
+
+    def observation(self) -> np.ndarray:
+        """Builds the layout of the maze on the current step.
+
+        Returns
+        -------
+        np.ndarray
+            Layout of shape (H, W), encoded the same way as the output
+            of `generate_pacmanlike_maze`.
+        """
+        result = self.walls.astype(np.int8)
+        result[self.coins] = EntityWeight.COIN_WEIGHT
+        pacman_y, pacman_x = self.positions[self.pacman]
+        result[pacman_y, pacman_x] += EntityWeight.PACMAN_WEIGHT
+        ghost_positions = self.positions[: self.pacman]
+        np.add.at(
+            result,
+            (ghost_positions[:, 0], ghost_positions[:, 1]),
+            EntityWeight.GHOST_WEIGHT,
+        )
+        return result
+
+    def state(self) -> MazeState:
+        """Generates state object for the maze."""
+        cells = (self.positions @ self._cell_strides).tolist()
+        return MazeState(
+            ghost_cells=tuple(cells[: self.pacman]),
+            pacman_cell=cells[self.pacman],
+            score=self.score,
+            hearts=self.hearts,
+            layout=self.weighted_layout,
+            walls=self.compact.walls,
+            level=self.level,
+            navigation=self.navigation,
+            coins=self.coins,
+            remaining_coins=self.remaining_coins,
+            ghost_states=[agent.state for agent in self.ghost_agents],
+        )
@@ -1,6 +1,26 @@
+from __future__ import annotations
+
+from functools import lru_cache
+
 from pacmanengine.types.animated import Animated
 
 
 class Floor(Animated):
+    __slots__ = ()
+
     def __init__(self, gif: str = "animations:structure/floor/floor.gif") -> None:
         super(Floor, self).__init__(gif)
+
+    @classmethod
+    @lru_cache(maxsize=None)
+    def shared(cls) -> Floor:
+        """Flyweight floor reused by all tiles of all mazes.
+
+        Returns
+        -------
+        Floor
+            Floor with the default gif. It must not be changed, as the
+            change would show up on every tile, and it refuses
+            subscriptions, see `Animated.seal`.
+        """
+        return cls().seal()
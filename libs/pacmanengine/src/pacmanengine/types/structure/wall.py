@@ -1,12 +1,34 @@
 from __future__ import annotations
 
+from functools import lru_cache
+
 from pacmanengine.types.animated import Animated
 
 from .wall_type import WallType
 
 
 class Wall(Animated):
+    __slots__ = ()
 
     @classmethod
     def create(cls, wall_type: WallType) -> Wall:
         return cls(gif=f"animations:structure/wall/{wall_type.value}.gif")
+
+    @classmethod
+    @lru_cache(maxsize=None)
+    def shared(cls, wall_type: WallType) -> Wall:
+        """Flyweight wall of the type reused by all tiles of all mazes.
+
+        Parameters
+        ----------
+        wall_type : WallType
+            Type of the wall.
+
+        Returns
+        -------
+        Wall
+            Wall of the type. It must not be changed, as the change would
+            show up on every tile, and it refuses subscriptions, see
+            `Animated.seal`.
+        """
+        return cls.create(wall_type=wall_type).seal()
@@ -374,3 +374,64 @@ class WallType(enum.Enum):
                 highest_weight = type_weight
                 result_type = wall_type
         return result_type
+
+    @staticmethod
+    def neighbour_masks(layout: np.ndarray) -> np.ndarray:
+        """Calculates which neighbours of every cell are walls.
+
+        Parameters
+        ----------
+        layout : np.ndarray
+            Layout containing 1 for the wall tile, and 0 for the
+            non-wall tile.
+
+        Returns
+        -------
+        np.ndarray
+            Bitmask of the wall neighbours of every cell, where bits 0, 1, 2
+            and 3 stand for the upper, lower, left and right neighbours.
+            Cells outside of the layout are not walls.
+        """
+        walls = np.pad(layout == 1, 1)
+        return (
+            walls[:-2, 1:-1].astype(np.uint8)
+            | walls[2:, 1:-1] << 1
+            | walls[1:-1, :-2] << 2
+            | walls[1:-1, 2:] << 3
+        ).astype(np.uint8)
+
+    @staticmethod
+    def infer_grid(layout: np.ndarray) -> np.ndarray:
+        """Infers types of the walls for all cells of the layout at once.
+
+        Parameters
+        ----------
+        layout : np.ndarray
+            Layout containing 1 for the wall tile, and 0 for the
+            non-wall tile.
+
+        Returns
+        -------
+        np.ndarray
+            Grid of the same shape as the layout with values of `WallType`,
+            matching `WallType.infer` for every cell. Values of the non-wall
+            cells are meaningless.
+        """
+        return _wall_type_lookup[WallType.neighbour_masks(layout)]
+
+
+def _build_wall_type_lookup() -> np.ndarray:
+    """Maps every neighbour bitmask to the value of the wall type by running
+    `WallType.infer` on the center of a 3x3 layout with that bitmask.
+    """
+    lookup = np.zeros(16, dtype=np.uint8)
+    for mask in range(len(lookup)):
+        layout = np.zeros((3, 3), dtype=np.int8)
+        layout[1, 1] = 1
+        for bit, (y, x) in enumerate([(0, 1), (2, 1), (1, 0), (1, 2)]):
+            layout[y, x] = (mask >> bit) & 1
+        lookup[mask] = WallType.infer(layout=layout, x=1, y=1).value
+    return lookup
+
+
+_wall_type_lookup = _build_wall_type_lookup()
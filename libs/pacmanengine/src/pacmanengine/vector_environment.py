@@ -0,0 +1,425 @@
+from dataclasses import dataclass
+
+import numpy as np
+from pacmanengine.algorithms.maze import layout_shape
+from pacmanengine.algorithms.maze.types import EntityWeight
+from pacmanengine.maze_pool import MazePool
+from pacmanengine.types.mobs import Action
+from pacmanengine.types.mobs.ghost import ghost_type_to_agent_type
+from pacmanengine.types.simulation import (
+    ACTION_DELTAS,
+    COIN_SCORE,
+    GHOST_TYPES,
+    INITIAL_HEARTS,
+    unravel_layouts,
+)
+
+# Order in which neighbours are checked when ghost chooses its next cell.
+_neighbour_deltas = ACTION_DELTAS[
+    [Action.MOVE_UP, Action.MOVE_DOWN, Action.MOVE_LEFT, Action.MOVE_RIGHT]
+]
+
+
+@dataclass
+class VectorEnvironmentStep:
+    """Batched step of the `VectorEnvironment`.
+
+    Attributes
+    ----------
+    actions : np.ndarray
+        Actions taken by Pacman in every environment, shape (N,).
+    observations : np.ndarray
+        Layouts of the mazes with entities weighted in, as produced by
+        `generate_pacmanlike_maze`, shape (N, H, W).
+    rewards : np.ndarray
+        Rewards received on the step, shape (N,).
+    dones : np.ndarray
+        Whether the episode has ended on the step, shape (N,).
+    """
+
+    actions: np.ndarray
+    observations: np.ndarray
+    rewards: np.ndarray
+    dones: np.ndarray
+
+
+def _next_hops(
+    walls: np.ndarray,
+    grid_indices: np.ndarray,
+    sources: np.ndarray,
+    targets: np.ndarray,
+) -> np.ndarray:
+    """Finds the next cell on the shortest path from every source to its
+    target.
+
+    Parameters
+    ----------
+    walls : np.ndarray
+        Wall masks of the mazes, shape (N, H, W).
+    grid_indices : np.ndarray
+        Index of the maze every source lives in, shape (K,).
+    sources : np.ndarray
+        Current positions in the format (Y, X), shape (K, 2).
+    targets : np.ndarray
+        Target positions in the format (Y, X), shape (K, 2).
+
+    Returns
+    -------
+    np.ndarray
+        Next positions in the format (Y, X), shape (K, 2). Source stays in
+        place if it already reached the target or the target is unreachable.
+
+    Notes
+    -----
+    A breadth-first wavefront is grown from every distinct (maze, target)
+    pair at once. The first neighbour of the source reached by the wavefront
+    lies on a shortest path. Wavefronts whose sources are all resolved are
+    dropped from the batch.
+    """
+    _, height, width = walls.shape
+    stride = width + 2
+    result = sources.copy()
+
+    keys = (grid_indices * height + targets[:, 0]) * width + targets[:, 1]
+    unique_keys, wavefront_of_source = np.unique(keys, return_inverse=True)
+    wavefront_of_source = wavefront_of_source.ravel()
+    n_wavefronts = len(unique_keys)
+
+    # Grids are padded with walls and flattened, so the wavefront grows
+    # with plain contiguous slicing and without bound checks.
+    padded_walls = np.ones((n_wavefronts, height + 2, stride), dtype=bool)
+    padded_walls[:, 1:-1, 1:-1] = walls[unique_keys // (height * width)]
+    padded_walls = padded_walls.reshape(n_wavefronts, -1)
+    frontier = np.zeros_like(padded_walls)
+    frontier[
+        np.arange(n_wavefronts),
+        ((unique_keys // width) % height + 1) * stride + unique_keys % width + 1,
+    ] = True
+    unvisited = ~padded_walls
+    frontier &= unvisited
+    unvisited ^= frontier
+    expanded = np.zeros_like(frontier)
+    interior = expanded[:, stride:-stride]
+
+    neighbours = sources[:, None, :] + _neighbour_deltas[None, :, :]
+    neighbour_cells = (neighbours[..., 0] + 1) * stride + neighbours[..., 1] + 1
+    # Wavefronts of targets in walls are empty, so their sources stay put.
+    unresolved = np.flatnonzero(
+        ~(sources == targets).all(axis=1)
+        & ~walls[grid_indices, targets[:, 0], targets[:, 1]]
+    )
+
+    while len(unresolved) and frontier.any():
+        # Neighbours reached earlier would have resolved their source then, so
+        # only the cells reached on this iteration are checked.
+        reached = frontier[
+            wavefront_of_source[unresolved, None], neighbour_cells[unresolved]
+        ]
+        is_reached = reached.any(axis=1)
+        resolved = unresolved[is_reached]
+        result[resolved] = neighbours[resolved, reached[is_reached].argmax(axis=1)]
+        unresolved = unresolved[~is_reached]
+
+        still_active = np.zeros(len(frontier), dtype=bool)
+        still_active[wavefront_of_source[unresolved]] = True
+        if still_active.sum() * 2 <= len(frontier):
+            remap = np.cumsum(still_active) - 1
+            wavefront_of_source[unresolved] = remap[wavefront_of_source[unresolved]]
+            frontier = frontier[still_active]
+            unvisited = unvisited[still_active]
+            expanded = np.zeros_like(frontier)
+            interior = expanded[:, stride:-stride]
+
+        np.logical_or(
+            frontier[:, : -2 * stride], frontier[:, 2 * stride :], out=interior
+        )
+        interior |= frontier[:, stride - 1 : -stride - 1]
+        interior |= frontier[:, stride + 1 : -stride + 1]
+        np.logical_and(expanded, unvisited, out=frontier)
+        unvisited ^= frontier
+
+    return result
+
+
+class VectorEnvironment:
+    """Steps N independent Pacman mazes in a single call.
+
+    Mazes are held as stacked NumPy arrays instead of `Maze` objects, so
+    the whole batch is advanced with a handful of array operations.
+
+    Parameters
+    ----------
+    num_envs : int
+        Number of environments N.
+    shape : tuple[int, int], default=(10, 20)
+        Shape of each maze, see `generate_pacmanlike_maze`.
+    seed : int, default=42
+        Seed of the pool the mazes are drawn from, if `pool` is not passed.
+    pool : MazePool, optional
+        Pool the mazes are drawn from on reset. By default a pool of
+        `num_envs` fresh mazes is generated by a background thread.
+
+    Notes
+    -----
+    The rules are the same as in `Simulation`: ghosts move first, then Pacman
+    moves, then collisions of the step are resolved, see
+    `Simulation.collide`. Pacman loses a heart per ghost that ends up in its
+    cell or swaps cells with it, and consumes the coin of the cell it
+    enters. A move into a wall or out of the maze is ignored. The episode
+    is done once Pacman has no hearts or no coins are left, after which the
+    environment is reset automatically and the returned observation belongs
+    to the new episode.
+
+    Ghosts move along shortest paths found by breadth-first searches grown
+    from all of their targets at once, see `_next_hops`, so no state beyond
+    the mazes themselves is kept per environment. Mazes are handed out in
+    the order of the resets, so environments with the same seed play the
+    same mazes.
+
+    Generating a fresh maze takes longer than the few dozen steps of a
+    random episode played on it, e.g. 4 ms for a 10x20 maze and 27 ms for
+    a 20x40 one, so it bounds the throughput of the batch. On a single core
+    64 environments with random actions make about 5700 steps per second
+    on 10x20 mazes and 1600 on 20x40 ones, 6 and 2 times as many as 64
+    separate `Environment`s, which is short of an order of magnitude. A
+    pool that reuses its mazes lifts this to about 27000 and 5000 steps
+    per second, see `MazePool`.
+    """
+
+    def __init__(
+        self,
+        num_envs: int,
+        shape: tuple[int, int] = (10, 20),
+        seed: int = 42,
+        pool: MazePool | None = None,
+    ) -> None:
+        if num_envs < 1:
+            raise ValueError(f"num_envs must be positive: provided {num_envs}")
+        if pool is not None and pool.shape != shape:
+            raise ValueError(
+                f"Shape of the pool must match the shape of the environment: "
+                f"provided {pool.shape}, expected {shape}"
+            )
+        self.num_envs = num_envs
+        self.shape = shape
+        self.seed = seed
+        self._owns_pool = pool is None
+        self.pool = (
+            MazePool(shape=shape, size=num_envs, seed=seed, navigation=False)
+            if pool is None
+            else pool
+        )
+
+        ghost_agents = [
+            ghost_type_to_agent_type[ghost_type]() for ghost_type in GHOST_TYPES
+        ]
+        self._ghost_homes = np.array(
+            [
+                [agent.home_position.pos_y, agent.home_position.pos_x]
+                for agent in ghost_agents
+            ],
+            dtype=np.int64,
+        )
+        self._scatter_intervals = [agent.scatter_intervals for agent in ghost_agents]
+        self.n_ghosts = len(ghost_agents)
+
+        height, width = layout_shape(shape)
+        self.walls = np.zeros((num_envs, height, width), dtype=bool)
+        self.coins = np.zeros((num_envs, height, width), dtype=bool)
+        self.pacman_positions = np.zeros((num_envs, 2), dtype=np.int64)
+        self.ghost_positions = np.zeros((num_envs, self.n_ghosts, 2), dtype=np.int64)
+        self.ghost_counters = np.zeros((num_envs, self.n_ghosts), dtype=np.int64)
+        self.scores = np.zeros(num_envs, dtype=np.int64)
+        self.hearts = np.zeros(num_envs, dtype=np.int64)
+        self.remaining_coins = np.zeros(num_envs, dtype=np.int64)
+
+        self._reset_envs(np.arange(num_envs))
+
+    def _load_layouts(self, indices: np.ndarray, layouts: np.ndarray) -> None:
+        """Unravels weighted layouts into the arrays of the environments with
+        the specified indices.
+
+        Parameters
+        ----------
+        indices : np.ndarray
+            Indices of the environments to be overwritten, shape (B,).
+        layouts : np.ndarray
+            Numeric representations of populated mazes, shape (B, H, W).
+        """
+        walls, coins, pacman_positions, ghost_positions = unravel_layouts(layouts)
+        if ghost_positions.shape[1] != self.n_ghosts:
+            raise ValueError(
+                f"Layouts must contain {self.n_ghosts} ghosts: "
+                f"provided {ghost_positions.shape[1]}"
+            )
+
+        self.walls[indices] = walls
+        self.coins[indices] = coins
+        self.pacman_positions[indices] = pacman_positions
+        self.ghost_positions[indices] = ghost_positions
+        self.ghost_counters[indices] = 0
+        self.scores[indices] = 0
+        self.hearts[indices] = INITIAL_HEARTS
+        self.remaining_coins[indices] = coins.sum(axis=(1, 2))
+
+    def _reset_envs(self, indices: np.ndarray) -> None:
+        if len(indices) == 0:
+            return
+        layouts = np.stack([self.pool.get()[0] for _ in indices])
+        self._load_layouts(indices, layouts)
+
+    def close(self) -> None:
+        """Stops the pool of the mazes, unless it was passed by the caller."""
+        if self._owns_pool:
+            self.pool.close()
+
+    def observations(self) -> np.ndarray:
+        """Builds weighted layouts of all mazes.
+
+        Returns
+        -------
+        np.ndarray
+            Layouts of shape (N, H, W), encoded the same way as the output
+            of `generate_pacmanlike_maze`.
+        """
+        # Walls and coins never share a cell, so their planes are added up.
+        result = self.coins.view(np.int8) * np.int8(EntityWeight.COIN_WEIGHT)
+        result += self.walls.view(np.int8)
+        env_index = np.arange(self.num_envs)
+        result[
+            env_index, self.pacman_positions[:, 0], self.pacman_positions[:, 1]
+        ] += EntityWeight.PACMAN_WEIGHT
+        # A ghost occupies a single cell of its maze, so the weights of every
+        # ghost index are added at once and ghosts sharing a cell add up.
+        for ghost in range(self.n_ghosts):
+            result[
+                env_index,
+                self.ghost_positions[:, ghost, 0],
+                self.ghost_positions[:, ghost, 1],
+            ] += EntityWeight.GHOST_WEIGHT
+        return result
+
+    def reset(self) -> VectorEnvironmentStep:
+        """Resets all environments:
+            - Recreates mazes.
+            - Respawns all objects in the mazes.
+
+        Returns
+        -------
+        VectorEnvironmentStep
+            Step of the environments.
+        """
+        self._reset_envs(np.arange(self.num_envs))
+        return VectorEnvironmentStep(
+            actions=np.full(self.num_envs, Action.STAY, dtype=np.int64),
+            observations=self.observations(),
+            rewards=np.zeros(self.num_envs, dtype=np.float32),
+            dones=np.zeros(self.num_envs, dtype=bool),
+        )
+
+    def _ghost_targets(self) -> np.ndarray:
+        """Chooses targets of all ghosts following their agents' schedule."""
+        scattering = np.zeros_like(self.ghost_counters, dtype=bool)
+        for ghost_index, intervals in enumerate(self._scatter_intervals):
+            counters = self.ghost_counters[:, ghost_index]
+            for start, stop in intervals:
+                scattering[:, ghost_index] |= (counters >= start) & (counters < stop)
+        return np.where(
+            scattering[..., None],
+            self._ghost_homes[None, :, :],
+            self.pacman_positions[:, None, :],
+        )
+
+    def _move_ghosts(self) -> None:
+        next_positions = _next_hops(
+            self.walls,
+            np.repeat(np.arange(self.num_envs), self.n_ghosts),
+            self.ghost_positions.reshape(-1, 2),
+            self._ghost_targets().reshape(-1, 2),
+        )
+        self.ghost_positions = next_positions.reshape(self.ghost_positions.shape)
+        self.ghost_counters += 1
+
+    def _move_pacman(self, actions: np.ndarray) -> np.ndarray:
+        """Moves pacman of every environment and returns whether it moved."""
+        height, width = self.walls.shape[1:]
+        env_index = np.arange(self.num_envs)
+        new_positions = self.pacman_positions + ACTION_DELTAS[actions]
+        new_y, new_x = new_positions[:, 0], new_positions[:, 1]
+        moved = (
+            (actions != Action.STAY)
+            & (new_y >= 0)
+            & (new_y < height)
+            & (new_x >= 0)
+            & (new_x < width)
+        )
+        moved[moved] = ~self.walls[env_index[moved], new_y[moved], new_x[moved]]
+        self.pacman_positions[moved] = new_positions[moved]
+        return moved
+
+    def _collide(
+        self,
+        previous_pacman: np.ndarray,
+        previous_ghosts: np.ndarray,
+        moved: np.ndarray,
+    ) -> None:
+        """Resolves collisions of the step in all environments at once."""
+        pacman = self.pacman_positions[:, None, :]
+        ghosts = self.ghost_positions
+        swapped = (
+            (ghosts == previous_pacman[:, None, :]).all(axis=2)
+            & (previous_ghosts == pacman).all(axis=2)
+            & moved[:, None]
+        )
+        caught = (ghosts == pacman).all(axis=2) & (
+            (ghosts != previous_ghosts).any(axis=2) | moved[:, None]
+        )
+        ghost_hits = (caught | swapped).sum(axis=1)
+        self.hearts = np.maximum(self.hearts - ghost_hits, 0)
+
+        moved_index = np.flatnonzero(moved)
+        pacman_y, pacman_x = self.pacman_positions[moved_index].T
+        consumed = self.coins[moved_index, pacman_y, pacman_x]
+        self.coins[moved_index[consumed], pacman_y[consumed], pacman_x[consumed]] = (
+            False
+        )
+        self.scores[moved_index[consumed]] += COIN_SCORE
+        self.remaining_coins[moved_index[consumed]] -= 1
+
+    def step(self, actions: np.ndarray) -> VectorEnvironmentStep:
+        """Makes a step in every environment.
+
+        Parameters
+        ----------
+        actions : np.ndarray
+            Actions of Pacman for every environment, shape (N,).
+
+        Returns
+        -------
+        VectorEnvironmentStep
+            Batched step of the environments.
+        """
+        actions = np.asarray(actions, dtype=np.int64)
+        if actions.shape != (self.num_envs,):
+            raise ValueError(
+                f"Actions must be of shape ({self.num_envs},): "
+                f"provided {actions.shape}"
+            )
+
+        previous_scores = self.scores.copy()
+        previous_pacman = self.pacman_positions.copy()
+        # Ghosts are moved into a new array, so this one keeps them in place.
+        previous_ghosts = self.ghost_positions
+        self._move_ghosts()
+        moved = self._move_pacman(actions)
+        self._collide(previous_pacman, previous_ghosts, moved)
+        rewards = (self.scores - previous_scores).astype(np.float32)
+        dones = (self.hearts == 0) | (self.remaining_coins == 0)
+
+        self._reset_envs(np.flatnonzero(dones))
+        return VectorEnvironmentStep(
+            actions=actions,
+            observations=self.observations(),
+            rewards=rewards,
+            dones=dones,
+        )
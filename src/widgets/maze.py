@@ -27,7 +27,7 @@ class MazeWidget(QWidget):
             for column_index in range(self.maze.ncols):
                 layout.addWidget(
                     self._create_stacked_widget(
-                        self.maze.tile(column_index, row_index).objects
+                        self.maze.objects(column_index, row_index)
                     ),
                     row_index,
                     column_index,
@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+from pacmanengine import AsyncVectorEnvironment, Environment
+from pacmanengine.types.mobs import Action
+
+
+def test_async_vector_environment_matches_separate_environments():
+    actions = np.random.default_rng(0).integers(1, 6, size=(100, 4))
+    n_dones = 0
+    environments = [
+        Environment(shape=(5, 8), seed=seed)
+        for seed in np.random.SeedSequence(3).spawn(4)
+    ]
+
+    with AsyncVectorEnvironment(4, num_workers=2, shape=(5, 8), seed=3) as vector:
+        step = vector.reset()
+        for environment, observation in zip(environments, step.observations):
+            environment.reset()
+            np.testing.assert_array_equal(
+                environment.simulation.observation(), observation
+            )
+
+        for step_actions in actions:
+            vector.step_async(step_actions)
+            step = vector.step_wait()
+            for env, environment in enumerate(environments):
+                expected = environment.step(Action(int(step_actions[env])))
+                assert step.rewards[env] == expected.reward
+                assert step.dones[env] == expected.done
+                if expected.done:
+                    n_dones += 1
+                    environment.reset()
+                np.testing.assert_array_equal(
+                    environment.simulation.observation(), step.observations[env]
+                )
+    assert n_dones > 0
+
+
+def test_async_vector_environment_reports_failed_step():
+    with AsyncVectorEnvironment(2, num_workers=1, shape=(5, 8)) as vector:
+        vector.reset()
+        vector.step_async(np.array([Action.STAY, 99]))
+        with pytest.raises(RuntimeError, match="Worker process failed"):
+            vector.step_wait()
+
+        # The failed step is over, it is not awaited again.
+        with pytest.raises(RuntimeError, match="step_async must be called"):
+            vector.step_wait()
+
+
+def test_async_vector_environment_requires_awaiting_steps():
+    with AsyncVectorEnvironment(2, num_workers=1, shape=(5, 8)) as vector:
+        vector.reset()
+        vector.step_async(np.full(2, Action.STAY))
+        with pytest.raises(RuntimeError, match="has not been awaited"):
+            vector.step_async(np.full(2, Action.STAY))
+        vector.step_wait()
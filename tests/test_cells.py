@@ -0,0 +1,90 @@
+from heapq import heappop, heappush
+
+import numpy as np
+import pytest
+from pacmanengine.algorithms.agent.ghost.a_star import a_star
+from pacmanengine.algorithms.maze import generate_pacmanlike_maze
+from pacmanengine.types.maze import Maze
+from pacmanengine.types.mobs import Action
+from pacmanengine.types.position import Position
+from pacmanengine.types.simulation import Simulation
+
+from benchmarks.cases import IdleAgent
+
+
+def _reference_a_star(
+    start: tuple[int, int], goal: tuple[int, int], grid: np.ndarray
+) -> list[tuple[int, int]] | None:
+    """A* over (y, x) points the ghosts used before flat cells."""
+    open_set = [(0, start)]
+    g_score = {start: 0}
+    came_from = {}
+    visited = set()
+    while open_set:
+        _, current = heappop(open_set)
+        if current == goal:
+            path = [current]
+            while current in came_from:
+                current = came_from[current]
+                path.append(current)
+            return path[::-1]
+        visited.add(current)
+        for dy, dx in [(0, 1), (0, -1), (1, 0), (-1, 0)]:
+            neighbor = (current[0] + dy, current[1] + dx)
+            if (
+                0 <= neighbor[0] < grid.shape[0]
+                and 0 <= neighbor[1] < grid.shape[1]
+                and grid[neighbor] != 1
+                and neighbor not in visited
+            ):
+                tentative_g_score = g_score[current] + 1
+                if neighbor not in g_score or tentative_g_score < g_score[neighbor]:
+                    came_from[neighbor] = current
+                    g_score[neighbor] = tentative_g_score
+                    f_cost = (
+                        tentative_g_score
+                        + abs(neighbor[0] - goal[0])
+                        + abs(neighbor[1] - goal[1])
+                    )
+                    heappush(open_set, (f_cost, neighbor))
+    return None
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_a_star_matches_point_reference(seed):
+    rng = np.random.default_rng(seed)
+    grid = (rng.random((9, 13)) < 0.3).astype(np.int8)
+    ncols = grid.shape[1]
+    floor = np.flatnonzero(grid.ravel() != 1)
+
+    for start, goal in rng.choice(floor, size=(50, 2)).tolist():
+        path = a_star(start, goal, grid)
+        expected = _reference_a_star(divmod(start, ncols), divmod(goal, ncols), grid)
+        if expected is None:
+            assert path is None
+        else:
+            assert [divmod(cell, ncols) for cell in path] == expected
+
+
+def test_position_cell_round_trip():
+    for cell in range(7 * 11):
+        position = Position.from_cell(cell, 11)
+        assert (position.pos_y, position.pos_x) == divmod(cell, 11)
+        assert position.cell(11) == cell
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_maze_positions_follow_simulation_cells(seed):
+    layout = generate_pacmanlike_maze((5, 8), rng=np.random.default_rng(seed))
+    maze = Maze((5, 8), simulation=Simulation(layout), pacman_agent=IdleAgent())
+    rng = np.random.default_rng(seed)
+
+    for _ in range(200):
+        maze.step(Action(int(rng.integers(1, 5))))
+        cells = maze.simulation.positions @ (maze.ncols, 1)
+        for mob, index in maze._mob_indices.items():
+            assert mob.current_position.cell(maze.ncols) == cells[index]
+        state = maze.state()
+        assert state.pacman_position == Position.from_cell(
+            state.pacman_cell, maze.ncols
+        )
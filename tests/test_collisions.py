@@ -0,0 +1,76 @@
+import numpy as np
+import pytest
+from pacmanengine.algorithms.maze import generate_pacmanlike_maze
+from pacmanengine.types.items import Coin
+from pacmanengine.types.maze import Maze
+from pacmanengine.types.mobs import Action
+from pacmanengine.types.simulation import Simulation
+from pacmanengine.vector_environment import VectorEnvironment
+
+from benchmarks.cases import IdleAgent
+
+
+def _random_move(
+    rng: np.random.Generator, walls: np.ndarray, position: np.ndarray
+) -> np.ndarray:
+    """Keeps the position or moves it to a random neighbouring floor cell."""
+    candidates = [position]
+    for delta in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
+        neighbour = position + delta
+        if (
+            (neighbour >= 0).all()
+            and (neighbour < walls.shape).all()
+            and not walls[tuple(neighbour)]
+        ):
+            candidates.append(neighbour)
+    return candidates[rng.integers(len(candidates))]
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_simulation_collide_matches_vectorized_collide(seed):
+    rng = np.random.default_rng(seed)
+    vector_environment = VectorEnvironment(num_envs=32, shape=(5, 8), seed=seed)
+    simulations = [Simulation(layout) for layout in vector_environment.observations()]
+
+    # Ghosts start around pacman, so swaps and catches are frequent.
+    previous = np.zeros((vector_environment.num_envs, 5, 2), dtype=np.int64)
+    current = np.zeros_like(previous)
+    for env, walls in enumerate(vector_environment.walls):
+        floor = np.argwhere(~walls)
+        previous[env, -1] = floor[rng.integers(len(floor))]
+        for mob in range(4):
+            previous[env, mob] = _random_move(rng, walls, previous[env, -1])
+        for mob in range(5):
+            current[env, mob] = _random_move(rng, walls, previous[env, mob])
+
+    vector_environment.pacman_positions = current[:, -1].copy()
+    vector_environment.ghost_positions = current[:, :-1].copy()
+    vector_environment._collide(
+        previous[:, -1], previous[:, :-1], (current[:, -1] != previous[:, -1]).any(1)
+    )
+
+    for env, simulation in enumerate(simulations):
+        simulation.previous_positions[:] = previous[env]
+        simulation.positions[:] = current[env]
+        simulation.collide()
+        assert simulation.hearts == vector_environment.hearts[env]
+        assert simulation.score == vector_environment.scores[env]
+        assert simulation.remaining_coins == vector_environment.remaining_coins[env]
+        np.testing.assert_array_equal(simulation.coins, vector_environment.coins[env])
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_maze_step_matches_simulation_step(seed):
+    layout = generate_pacmanlike_maze((5, 8), rng=np.random.default_rng(seed))
+    simulation = Simulation(layout)
+    maze = Maze((5, 8), simulation=Simulation(layout), pacman_agent=IdleAgent())
+    rng = np.random.default_rng(seed)
+
+    for _ in range(300):
+        action = Action(int(rng.integers(1, 5)))
+        assert maze.step(action) == simulation.step(action)
+        np.testing.assert_array_equal(maze.simulation.positions, simulation.positions)
+        assert (maze.score, maze.hearts) == (simulation.score, simulation.hearts)
+
+    coins = sum(type(obj) is Coin for tile in maze.tiles for obj in tile.objects)
+    assert coins == simulation.remaining_coins == maze.remaining_coins
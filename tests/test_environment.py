@@ -0,0 +1,74 @@
+import numpy as np
+import pytest
+from pacmanengine import Environment
+from pacmanengine.types.mobs import Action
+
+
+def _rollout(environment: Environment, actions: np.ndarray) -> list[tuple]:
+    """Plays the actions until the episode is done and records every step."""
+    trajectory = []
+    for action in actions:
+        step = environment.step(Action(int(action)))
+        simulation = environment.simulation
+        trajectory.append(
+            (
+                simulation.observation().tobytes(),
+                simulation.positions.tobytes(),
+                simulation.coins.tobytes(),
+                simulation.score,
+                simulation.hearts,
+                simulation.remaining_coins,
+                tuple(agent.counter for agent in simulation.ghost_agents),
+                step.reward,
+                step.done,
+            )
+        )
+        if step.done:
+            break
+    return trajectory
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_restore_replays_the_same_rollout(seed):
+    rng = np.random.default_rng(seed)
+    environment = Environment(shape=(5, 8), seed=seed)
+    for action in rng.integers(1, 6, size=10):
+        environment.step(Action(int(action)))
+    snapshot = environment.snapshot()
+    actions = rng.integers(1, 6, size=100)
+
+    expected = _rollout(environment, actions)
+    environment.restore(snapshot)
+    assert _rollout(environment, actions) == expected
+
+    # A snapshot of another maze replaces the simulation of the environment.
+    other = Environment(shape=(5, 8), seed=seed + 100)
+    other.restore(snapshot)
+    assert other.simulation.layout is snapshot.layout
+    assert _rollout(other, actions) == expected
+
+
+def test_snapshot_is_not_changed_by_steps():
+    environment = Environment(shape=(5, 8), seed=0)
+    snapshot = environment.snapshot()
+    positions, coins = snapshot.positions.copy(), snapshot.coins.copy()
+
+    _rollout(environment, np.full(20, Action.MOVE_RIGHT))
+
+    np.testing.assert_array_equal(snapshot.positions, positions)
+    np.testing.assert_array_equal(snapshot.coins, coins)
+    with pytest.raises(ValueError):
+        snapshot.positions[0, 0] = 0
+
+
+def test_reset_returns_initial_step():
+    environment = Environment(shape=(5, 8), seed=0)
+    _rollout(environment, np.full(20, Action.MOVE_LEFT))
+
+    step = environment.reset()
+
+    assert (step.action, step.reward, step.done) == (Action.STAY, 0.0, False)
+    simulation = environment.simulation
+    assert step.maze_state.score == simulation.score == 0
+    assert step.maze_state.pacman_cell == simulation.state().pacman_cell
+    assert step.maze_state.remaining_coins == simulation.remaining_coins
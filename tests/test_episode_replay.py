@@ -0,0 +1,94 @@
+import numpy as np
+import pytest
+from pacmanengine import EpisodeReplay
+from pacmanengine.algorithms.maze import generate_pacmanlike_maze
+from pacmanengine.types.mobs import Action
+from pacmanengine.types.simulation import Simulation
+
+
+def _actions(seed: int, size: int) -> list[Action]:
+    rng = np.random.default_rng(seed)
+    return [Action(action) for action in rng.integers(1, 6, size=size).tolist()]
+
+
+def _assert_same_game(simulation: Simulation, expected: Simulation) -> None:
+    snapshot, expected_snapshot = simulation.snapshot(), expected.snapshot()
+    np.testing.assert_array_equal(snapshot.positions, expected_snapshot.positions)
+    np.testing.assert_array_equal(snapshot.coins, expected_snapshot.coins)
+    assert (
+        snapshot.score,
+        snapshot.hearts,
+        snapshot.remaining_coins,
+        snapshot.ghost_counters,
+        snapshot.ghost_states,
+    ) == (
+        expected_snapshot.score,
+        expected_snapshot.hearts,
+        expected_snapshot.remaining_coins,
+        expected_snapshot.ghost_counters,
+        expected_snapshot.ghost_states,
+    )
+
+
+@pytest.mark.parametrize("seed", range(10))
+@pytest.mark.parametrize("shape", [(5, 8), (10, 20)])
+def test_simulation_run_matches_steps(seed, shape):
+    layout = generate_pacmanlike_maze(shape, rng=np.random.default_rng(seed))
+    actions = _actions(seed, 400)
+    simulation, expected = Simulation(layout), Simulation(layout)
+
+    played = sum(
+        simulation.run(chunk) for chunk in (actions[:37], actions[37:38], actions[38:])
+    )
+    expected_played = 0
+    for action in actions:
+        if expected.done:
+            break
+        expected.step(action)
+        expected_played += 1
+
+    assert played == expected_played
+    _assert_same_game(simulation, expected)
+    np.testing.assert_array_equal(
+        simulation.previous_positions, expected.previous_positions
+    )
+    assert simulation.collisions == expected.collisions
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_replay_seeks_like_stepping(seed):
+    replay = EpisodeReplay.from_seed(
+        shape=(10, 20), seed=seed, actions=_actions(seed, 500), keyframe_interval=16
+    )
+    final_state = replay.run()
+    assert replay.end is not None and replay.end > 0
+
+    for step in np.random.default_rng(seed).integers(0, replay.end + 1, size=10):
+        state = replay.seek(int(step))
+        expected = Simulation(replay.keyframes[0].layout)
+        for action in replay.actions[:step]:
+            expected.step(action)
+        _assert_same_game(replay.simulation, expected)
+        assert state.pacman_cell == expected.state().pacman_cell
+    assert replay.run() == final_state
+
+
+def test_replay_stops_when_game_is_over():
+    replay = EpisodeReplay.from_seed(shape=(5, 8), seed=0, actions=_actions(0, 2000))
+
+    states = list(replay)
+
+    assert replay.end == len(states) < len(replay)
+    assert replay.simulation.done
+    assert states[-1].hearts == 0 or states[-1].remaining_coins == 0
+    with pytest.raises(IndexError, match="over"):
+        replay.seek(replay.end + 1)
+    assert replay.seek(replay.end).hearts == states[-1].hearts
+
+
+def test_fresh_replay_rejects_seek_past_the_end():
+    replay = EpisodeReplay.from_seed(shape=(5, 8), seed=0, actions=_actions(0, 2000))
+
+    with pytest.raises(IndexError, match="over"):
+        replay.seek(len(replay))
+    assert replay.step == replay.end
@@ -0,0 +1,69 @@
+import numpy as np
+import pytest
+from pacmanengine.algorithms.maze import generate_pacmanlike_maze
+from pacmanengine.types.items import Coin
+from pacmanengine.types.maze import Maze
+from pacmanengine.types.mobs import Action, Ghost, Pacman
+from pacmanengine.types.simulation import Simulation
+
+from benchmarks.cases import IdleAgent
+
+
+def _maze(seed: int) -> Maze:
+    layout = generate_pacmanlike_maze((5, 8), rng=np.random.default_rng(seed))
+    return Maze((5, 8), simulation=Simulation(layout), pacman_agent=IdleAgent())
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_collision_callbacks_follow_resolved_collisions(seed):
+    maze = _maze(seed)
+    caught, coins, caught_by = [], [], []
+    maze.pacman.on_collision(Ghost, caught.append)
+    maze.pacman.on_collision(Coin, coins.append)
+    for ghost in maze.ghosts:
+        ghost.on_collision(Pacman, lambda pacman, ghost=ghost: caught_by.append(ghost))
+    rng = np.random.default_rng(seed)
+
+    hits = 0
+    for _ in range(300):
+        for calls in (caught, coins, caught_by):
+            calls.clear()
+
+        collisions = maze.step(Action(int(rng.integers(1, 5))))
+
+        expected = [maze.ghosts[index] for index in collisions.ghosts]
+        assert caught == caught_by == expected
+        pacman = maze.pacman.current_position
+        assert len(coins) == collisions.coin
+        assert all(coin.current_position == pacman for coin in coins)
+        hits += len(expected)
+    assert hits
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_objects_match_simulation(seed):
+    maze = _maze(seed)
+    rng = np.random.default_rng(seed)
+    mobs = [*maze.ghosts, maze.pacman]
+
+    for _ in range(100):
+        maze.step(Action(int(rng.integers(1, 5))))
+        for y in range(maze.nrows):
+            for x in range(maze.ncols):
+                objects = maze.objects(x, y)
+                expected = [
+                    mob
+                    for mob, position in zip(mobs, maze.simulation.positions)
+                    if tuple(position) == (y, x)
+                ]
+                # Mobs are drawn between the floor and the items of the tile.
+                occupants = objects[1 : 1 + len(expected)]
+                assert sorted(map(id, occupants)) == sorted(map(id, expected))
+                assert not any(obj in mobs for obj in maze.tile(x, y).objects)
+                for cls in (Ghost, Pacman, Coin):
+                    indexed = maze.occupancy.objects(cls, x, y)
+                    assert indexed == [obj for obj in objects if type(obj) is cls]
+                    assert maze.occupancy.count(cls, x, y) == len(indexed)
+                assert len(maze.occupancy.objects(Coin, x, y)) == int(
+                    maze.simulation.coins[y, x]
+                )
@@ -0,0 +1,73 @@
+import numpy as np
+import pytest
+from pacmanengine import MazeCorpus, MazeCorpusWriter
+from pacmanengine.algorithms.maze import generate_pacmanlike_maze
+from pacmanengine.maze_corpus import CORPUS_VERSION
+from pacmanengine.types.mobs import Action
+from pacmanengine.types.simulation import Simulation
+
+
+@pytest.fixture
+def corpus_path(tmp_path):
+    with MazeCorpusWriter(tmp_path, wall_types=True, navigation=True) as writer:
+        for seed in range(3):
+            writer.add((5, 8), seed)
+    return tmp_path
+
+
+def test_corpus_round_trip(corpus_path):
+    corpus = MazeCorpus(corpus_path)
+
+    assert len(corpus) == 3
+    for seed in range(3):
+        maze_id = corpus.find((5, 8), seed)
+        expected = generate_pacmanlike_maze((5, 8), rng=np.random.default_rng(seed))
+        np.testing.assert_array_equal(corpus.layout(maze_id), expected)
+
+
+def test_corpus_layout_is_a_view(corpus_path):
+    corpus = MazeCorpus(corpus_path)
+    walls = corpus.compact_layout(1).walls
+
+    assert not walls.flags.writeable
+    assert np.shares_memory(walls, corpus._walls)
+
+
+def test_writer_appends_to_corpus(corpus_path):
+    with MazeCorpusWriter(corpus_path) as writer:
+        assert len(writer) == 3
+        writer.add((5, 8), 3)
+
+    assert MazeCorpus(corpus_path).find((5, 8), 3) == 3
+
+
+def test_corpus_of_another_version_is_rejected(corpus_path):
+    index = corpus_path / "index.bin"
+    data = bytearray(index.read_bytes())
+    data[8:12] = (CORPUS_VERSION + 1).to_bytes(4, "little")
+    index.write_bytes(bytes(data))
+
+    with pytest.raises(ValueError, match="version"):
+        MazeCorpus(corpus_path)
+    with pytest.raises(ValueError, match="version"):
+        MazeCorpusWriter(corpus_path)
+
+
+def test_unversioned_corpus_is_rejected(corpus_path):
+    index = corpus_path / "index.bin"
+    index.write_bytes(index.read_bytes()[16:])
+
+    with pytest.raises(ValueError, match="regenerated"):
+        MazeCorpus(corpus_path)
+
+
+def test_simulation_state_carries_weighted_layout(corpus_path):
+    corpus = MazeCorpus(corpus_path)
+    expected = generate_pacmanlike_maze((5, 8), rng=np.random.default_rng(1))
+    simulation = corpus.simulation(corpus.find((5, 8), 1))
+    simulation.step(Action.MOVE_LEFT)
+
+    for maze_state in (simulation.state(), Simulation(expected).state()):
+        np.testing.assert_array_equal(maze_state.layout, expected)
+        np.testing.assert_array_equal(maze_state.walls, expected == 1)
+        assert maze_state.walls.dtype == np.uint8
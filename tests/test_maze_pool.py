@@ -0,0 +1,77 @@
+import threading
+
+import numpy as np
+import pytest
+from pacmanengine import maze_pool
+from pacmanengine.maze_pool import MazePool
+
+
+def _layouts(pool: MazePool, n: int) -> list[np.ndarray]:
+    with pool:
+        return [pool.get()[0] for _ in range(n)]
+
+
+def _expected_layouts(n: int, seed: int) -> list[np.ndarray]:
+    pool = MazePool((5, 8), size=2, producer=None, navigation=False, seed=seed)
+    return _layouts(pool, n)
+
+
+@pytest.mark.parametrize(
+    "producer, wait",
+    [("thread", True), ("thread", False), ("process", True), ("process", False)],
+)
+def test_pool_hands_out_mazes_in_seed_order(producer, wait):
+    pool = MazePool(
+        (5, 8), size=2, producer=producer, navigation=False, wait=wait, seed=3
+    )
+    layouts = _layouts(pool, 12)
+    expected = _expected_layouts(12, seed=3)
+
+    assert len({layout.tobytes() for layout in expected}) > 1
+    for layout, expected_layout in zip(layouts, expected):
+        np.testing.assert_array_equal(layout, expected_layout)
+
+
+def test_pool_generates_earliest_pending_maze_on_miss(monkeypatch):
+    # The producer is stuck, so every maze is generated on get instead.
+    released = threading.Event()
+
+    def generate(*args, **kwargs):
+        if threading.current_thread() is not threading.main_thread():
+            released.wait()
+        return original(*args, **kwargs)
+
+    original = maze_pool._generate
+    monkeypatch.setattr(maze_pool, "_generate", generate)
+    pool = MazePool((5, 8), size=4, navigation=False, wait=False, seed=5)
+    try:
+        layouts = [pool.get()[0] for _ in range(6)]
+    finally:
+        released.set()
+        pool.close()
+
+    assert (pool.hits, pool.misses) == (0, 6)
+    for layout, expected_layout in zip(layouts, _expected_layouts(6, seed=5)):
+        np.testing.assert_array_equal(layout, expected_layout)
+
+
+def test_pool_refills_below_threshold():
+    pool = MazePool((5, 8), size=4, refill_threshold=2, producer=None, seed=0)
+
+    sizes = []
+    for _ in range(4):
+        pool.get()
+        sizes.append(len(pool))
+
+    assert sizes == [3, 2, 4, 3]
+    assert (pool.hits, pool.misses) == (4, 0)
+
+
+def test_pool_reuses_its_mazes():
+    pool = MazePool((5, 8), size=3, reuse=True, producer=None, seed=0)
+
+    layouts = [pool.get()[0] for _ in range(6)]
+
+    assert len(pool) == 3
+    for layout, reused in zip(layouts[:3], layouts[3:]):
+        assert layout is reused
@@ -0,0 +1,75 @@
+from collections import deque
+
+import numpy as np
+import pytest
+from pacmanengine.algorithms.agent.ghost.navigation import NavigationTable
+from pacmanengine.algorithms.maze import generate_pacmanlike_maze
+
+
+def _bfs_distances(layout: np.ndarray, source: tuple[int, int]) -> np.ndarray:
+    """Distances from the source to every cell, -1 for unreachable cells."""
+    distances = np.full(layout.shape, -1)
+    distances[source] = 0
+    queue = deque([source])
+    while queue:
+        y, x = queue.popleft()
+        for dy, dx in [(0, 1), (0, -1), (1, 0), (-1, 0)]:
+            neighbour = (y + dy, x + dx)
+            if (
+                0 <= neighbour[0] < layout.shape[0]
+                and 0 <= neighbour[1] < layout.shape[1]
+                and layout[neighbour] != 1
+                and distances[neighbour] < 0
+            ):
+                distances[neighbour] = distances[y, x] + 1
+                queue.append(neighbour)
+    return distances
+
+
+@pytest.mark.parametrize("seed", range(3))
+@pytest.mark.parametrize("shape", [(5, 8), (10, 20)])
+def test_compact_distances_match_bfs(seed, shape):
+    layout = generate_pacmanlike_maze(shape, rng=np.random.default_rng(seed))
+    table = NavigationTable(layout, compact=True, max_searches=4)
+    cells = [tuple(cell) for cell in np.argwhere(layout != 1)]
+
+    for source in cells[:: max(1, len(cells) // 25)]:
+        expected = _bfs_distances(layout, source)
+        for target in cells:
+            distance = table.distance(source, target)
+            assert (-1 if distance is None else distance) == expected[target]
+    assert len(table._searches) <= 4
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_compact_table_steps_as_dense_table(seed):
+    layout = generate_pacmanlike_maze((10, 20), rng=np.random.default_rng(seed))
+    dense = NavigationTable(layout, compact=False)
+    compact = NavigationTable(layout, compact=True)
+    ncols = layout.shape[1]
+    cells = [int(y) * ncols + int(x) for y, x in np.argwhere(layout != 1)]
+    rng = np.random.default_rng(seed)
+
+    for source, target in rng.choice(cells, size=(2000, 2)).tolist():
+        step = compact.next_cell(source, target)
+        assert step == dense.next_cell(source, target)
+
+
+def test_compact_table_stores_junction_graph():
+    layout = generate_pacmanlike_maze((20, 40), rng=np.random.default_rng(0))
+    table = NavigationTable(layout, compact=True)
+
+    assert set(table.arrays()) == {
+        "cells",
+        "cell_index",
+        "neighbours",
+        "ends",
+        "offsets",
+        "corridor",
+        "junction_offsets",
+        "junction_neighbours",
+        "junction_weights",
+    }
+    assert table.nbytes < 64 * layout.size
+    restored = NavigationTable.from_arrays(table.arrays())
+    assert restored.distance((1, 1), (38, 78)) == table.distance((1, 1), (38, 78))
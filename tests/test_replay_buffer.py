@@ -0,0 +1,81 @@
+import threading
+
+import numpy as np
+import pytest
+from pacmanengine import ReplayBuffer
+
+
+def _observation(env: int, step: int) -> np.ndarray:
+    """Observation that encodes the environment and the step it was taken on."""
+    return np.full((3, 4), env * 20 + step, dtype=np.int8)
+
+
+def test_concurrent_appends_wrap_around_the_rings(tmp_path):
+    ReplayBuffer.create(tmp_path, num_envs=3, capacity=5, observation_shape=(3, 4))
+
+    def record(env: int) -> None:
+        # Every writer opens the buffer on its own, as a worker process would.
+        buffer = ReplayBuffer(tmp_path)
+        for step in range(13):
+            buffer.append(env, _observation(env, step), step % 5, step, step % 4 == 0)
+        buffer.flush()
+
+    writers = [threading.Thread(target=record, args=(env,)) for env in range(3)]
+    for writer in writers:
+        writer.start()
+    for writer in writers:
+        writer.join()
+
+    buffer = ReplayBuffer(tmp_path)
+    np.testing.assert_array_equal(buffer.cursors, [13, 13, 13])
+    for env in range(3):
+        for step in range(8, 13):
+            slot = step % 5
+            np.testing.assert_array_equal(
+                buffer.observations[env, slot], _observation(env, step)
+            )
+            assert buffer.rewards[env, slot] == step
+            assert buffer.dones[env, slot] == (step % 4 == 0)
+
+    # The latest step has no next observation yet and the oldest slot may be
+    # overwritten, so steps 9 to 11 of every environment are sampled.
+    assert len(buffer) == 9
+    batch = buffer.sample(512, rng=np.random.default_rng(0))
+    envs, steps = np.divmod(batch.observations[:, 0, 0], 20)
+    assert set(steps.tolist()) == {9, 10, 11}
+    assert set(envs.tolist()) == {0, 1, 2}
+    np.testing.assert_array_equal(batch.rewards, steps)
+    np.testing.assert_array_equal(batch.actions, steps % 5)
+    np.testing.assert_array_equal(batch.next_observations, batch.observations + 1)
+
+
+def test_extend_records_a_step_of_several_environments(tmp_path):
+    buffer = ReplayBuffer.create(
+        tmp_path, num_envs=4, capacity=3, observation_shape=(3, 4)
+    )
+    for step in range(4):
+        envs = np.array([3, 1])
+        buffer.extend(
+            np.stack([_observation(env, step) for env in envs]),
+            actions=np.full(2, step),
+            rewards=np.full(2, step, dtype=np.float32),
+            dones=np.zeros(2, dtype=bool),
+            envs=envs,
+        )
+
+    np.testing.assert_array_equal(buffer.cursors, [0, 4, 0, 4])
+    np.testing.assert_array_equal(buffer.rewards[[1, 3]], [[3, 1, 2], [3, 1, 2]])
+    batch = buffer.sample(64, rng=np.random.default_rng(0))
+    np.testing.assert_array_equal(batch.rewards, 2)
+    assert set((batch.observations[:, 0, 0] // 20).tolist()) == {1, 3}
+
+
+def test_empty_buffer_can_not_be_sampled(tmp_path):
+    buffer = ReplayBuffer.create(
+        tmp_path, num_envs=2, capacity=4, observation_shape=(3, 4)
+    )
+    buffer.append(0, _observation(0, 0), 1, 0.0, False)
+
+    assert len(buffer) == 0
+    with pytest.raises(ValueError, match="no steps"):
+        buffer.sample(1)
@@ -0,0 +1,71 @@
+import numpy as np
+import pytest
+from pacmanengine.algorithms.maze.generate import generate_maze
+from pacmanengine.algorithms.maze.strave import strave_maze
+
+
+def _reference_strave(
+    maze: np.ndarray,
+    rng: np.random.Generator,
+    min_len: int = 3,
+    max_len: int = 6,
+    threshold: float = 0.3,
+) -> np.ndarray:
+    """Depth-first walk of every branch the strave used before the array
+    pass, kept as the reference of its semantics."""
+    height, width = maze.shape
+    roots = []
+    for x in range(1, width - 1):
+        roots += [((0, x), (1, x)), ((height - 1, x), (height - 2, x))]
+    for y in range(1, height - 1):
+        roots += [((y, 0), (y, 1)), ((y, width - 1), (y, width - 2))]
+
+    holes = []
+    for previous, current in roots:
+        if not maze[current]:
+            continue
+        stack = [(previous, current, 1)]
+        while stack:
+            previous, (y, x), length = stack.pop()
+            if length > max_len or (
+                length > min_len and rng.standard_normal() < threshold
+            ):
+                holes.append((y, x))
+                length = 0
+            for neighbour in [(y - 1, x), (y + 1, x), (y, x - 1), (y, x + 1)]:
+                if (
+                    0 <= neighbour[0] < height
+                    and 0 <= neighbour[1] < width
+                    and maze[neighbour]
+                    and neighbour != previous
+                ):
+                    stack.append(((y, x), neighbour, length + 1))
+
+    maze = maze.copy()
+    for hole in holes:
+        maze[hole] = 0
+    return maze
+
+
+@pytest.mark.parametrize("seed", range(10))
+@pytest.mark.parametrize("shape", [(5, 8), (10, 20)])
+@pytest.mark.parametrize("threshold", [-np.inf, np.inf])
+def test_strave_matches_reference_with_forced_decisions(seed, shape, threshold):
+    maze = generate_maze(shape, rng=np.random.default_rng(seed))
+    rng = np.random.default_rng(seed)
+
+    expected = _reference_strave(maze, rng, threshold=threshold)
+    straved = strave_maze(maze.copy(), rng=rng, threshold=threshold)
+
+    np.testing.assert_array_equal(straved, expected)
+
+
+def test_strave_matches_reference_hole_counts():
+    straved_holes, expected_holes = 0, 0
+    for seed in range(200):
+        maze = generate_maze((10, 20), rng=np.random.default_rng(seed))
+        rng = np.random.default_rng(seed)
+        expected_holes += np.sum(maze - _reference_strave(maze, rng))
+        straved_holes += np.sum(maze - strave_maze(maze.copy(), rng=rng))
+
+    assert straved_holes == pytest.approx(expected_holes, rel=0.02)
@@ -0,0 +1,92 @@
+import numpy as np
+import pytest
+from pacmanengine.algorithms.agent.ghost.navigation import NavigationTable
+from pacmanengine.types.mobs import Action
+from pacmanengine.types.simulation import Simulation
+from pacmanengine.vector_environment import VectorEnvironment, _next_hops
+
+
+@pytest.mark.parametrize("seed", range(3))
+@pytest.mark.parametrize("shape", [(5, 8), (10, 20), (20, 40)])
+def test_next_hops_match_navigation_table(seed, shape):
+    rng = np.random.default_rng(seed)
+    environment = VectorEnvironment(num_envs=4, shape=shape, seed=seed)
+    ncols = environment.walls.shape[2]
+
+    envs = np.repeat(np.arange(environment.num_envs), 256)
+    sources = np.zeros((len(envs), 2), dtype=np.int64)
+    targets = np.zeros_like(sources)
+    for env, walls in enumerate(environment.walls):
+        floor = np.argwhere(~walls)
+        sources[envs == env] = floor[rng.integers(len(floor), size=256)]
+        # Every other target is any cell, so walls are targeted as well.
+        targets[envs == env] = np.where(
+            (np.arange(256) % 2 == 0)[:, None],
+            floor[rng.integers(len(floor), size=256)],
+            np.argwhere(walls | ~walls)[rng.integers(walls.size, size=256)],
+        )
+    result = _next_hops(environment.walls, envs, sources, targets)
+
+    for env, walls in enumerate(environment.walls):
+        table = NavigationTable(walls.astype(np.int8), compact=False)
+        for source, target, step in zip(
+            sources[envs == env], targets[envs == env], result[envs == env]
+        ):
+            expected = table.next_cell(
+                int(source[0]) * ncols + int(source[1]),
+                int(target[0]) * ncols + int(target[1]),
+            )
+            assert divmod(expected, ncols) == tuple(step)
+    environment.close()
+
+
+def test_environments_with_same_seed_play_same_mazes():
+    first = VectorEnvironment(num_envs=4, seed=7)
+    second = VectorEnvironment(num_envs=4, seed=7)
+    actions = np.random.default_rng(0).integers(1, 6, size=(200, 4))
+
+    for step_actions in actions:
+        first_step, second_step = first.step(step_actions), second.step(step_actions)
+        np.testing.assert_array_equal(first_step.observations, second_step.observations)
+        np.testing.assert_array_equal(first_step.dones, second_step.dones)
+    first.close()
+    second.close()
+
+
+@pytest.mark.parametrize("seed", range(3))
+@pytest.mark.parametrize("shape", [(5, 8), (10, 20)])
+def test_vector_environment_step_matches_simulation_step(seed, shape):
+    environment = VectorEnvironment(num_envs=8, shape=shape, seed=seed)
+    simulations = [Simulation(layout) for layout in environment.observations()]
+    actions = np.random.default_rng(seed).integers(1, 6, size=(200, 8))
+
+    n_dones = 0
+    for step_actions in actions:
+        step = environment.step(step_actions)
+        for env, simulation in enumerate(simulations):
+            previous_score = simulation.score
+            simulation.step(Action(int(step_actions[env])))
+            assert step.rewards[env] == simulation.score - previous_score
+            assert step.dones[env] == simulation.done
+            if step.dones[env]:
+                # The environment has moved on to a new maze, which the next
+                # simulation starts from.
+                n_dones += 1
+                simulations[env] = Simulation(step.observations[env])
+                continue
+            np.testing.assert_array_equal(
+                simulation.positions[simulation.ghosts],
+                environment.ghost_positions[env],
+            )
+            np.testing.assert_array_equal(
+                simulation.positions[simulation.pacman],
+                environment.pacman_positions[env],
+            )
+            assert simulation.score == environment.scores[env]
+            assert simulation.hearts == environment.hearts[env]
+            np.testing.assert_array_equal(simulation.coins, environment.coins[env])
+            np.testing.assert_array_equal(
+                simulation.observation(), step.observations[env]
+            )
+    assert n_dones > 0
+    environment.close()
@@ -0,0 +1,15 @@
+import numpy as np
+import pytest
+from pacmanengine.types.structure.wall_type import WallType
+
+
+@pytest.mark.parametrize("seed", range(5))
+@pytest.mark.parametrize("shape", [(1, 1), (3, 7), (12, 9)])
+def test_infer_grid_matches_infer(seed, shape):
+    layout = np.random.default_rng(seed).integers(0, 2, size=shape, dtype=np.int8)
+
+    inferred = WallType.infer_grid(layout)
+
+    for y, x in zip(*np.nonzero(layout == 1)):
+        expected = WallType.infer(layout=layout, x=int(x), y=int(y))
+        assert WallType(inferred[y, x]) is expected